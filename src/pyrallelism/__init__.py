@@ -1,4 +1,6 @@
-from .evaluator import evaluate_bipartite_parallelism_metric
+from .evaluator import evaluate_bipartite_parallelism_metric, sweep_bipartite_parallelism_metric
 from .pyrallelism import _use_pyrallelism_cli
+from .sampling import estimate_bipartite_parallelism_metric
+from .streaming import StreamingEvaluator
 
 __all__ = ["primitives", "structures", "utils"]
@@ -1,17 +1,24 @@
-from typing import Any, Optional
+from typing import Any, Optional, Sequence, Type, Union
 
+from numpy import argsort, array, float64, full, int64, unique, zeros
 from numpy.typing import NDArray
+from scipy.sparse import sparray
 
+from .primitives.assignment.incremental import IncrementalAssigner
 from .primitives.assignment.lsa import LinearSumAssigner
 from .primitives.evaluation_metric import EvaluationMetric
 from .primitives.typing import LSAComponents, ParallelismDirectory
+from .structures.alignment import Alignment
 from .structures.confusion_matrix import ReducedConfusionMatrix
+from .structures.confusion_matrix_batch import ConfusionMatrixBatch
 
 
 def evaluate_bipartite_parallelism_metric(hypotheses: ParallelismDirectory, references: ParallelismDirectory,
                                           metric: EvaluationMetric,
                                           scoring_kwargs: Optional[dict[str, Any]] = None,
-                                          size_kwargs: Optional[dict[str, Any]] = None) -> \
+                                          size_kwargs: Optional[dict[str, Any]] = None,
+                                          assigner: Type[LinearSumAssigner] = LinearSumAssigner,
+                                          keep_scoring_matrix: bool = True) -> \
         tuple[ReducedConfusionMatrix, LSAComponents]:
     """
     A function which mediates the process of computing central values for the family of bipartite parallelism metrics.
@@ -21,22 +28,108 @@ def evaluate_bipartite_parallelism_metric(hypotheses: ParallelismDirectory, refe
     a `ScoringFunction` class and a `SizeFunction` class.
     :param scoring_kwargs: a collection of keyword arguments meant to modify the scoring calculations.
     :param size_kwargs: a collection of keyword arguments meant to modify the size calculations.
+    :param assigner: the `LinearSumAssigner` class (or subclass) used to compute the bipartite matching.
+    By default, the matching is exact; approximate assigners (such as `GreedyAssigner`) trade accuracy for speed.
+    If the assigner accepts sparse matrices, only the nonzero scores are computed and stored.
+    :param keep_scoring_matrix: a `bool` indicating whether the scoring matrix should be returned.
+    If `False`, it is omitted from the returned components, so that it can be freed as soon as the matching is done.
     :return: a 2-tuple of values, including: (1) `new_confusion_matrix`, the overall matching score obtained through
     the bipartite maximal matching algorithm and the two total sizes derived from supplied parallelism directories;
     (2) `computation_components`, a `dict` containing steps of the bipartite parallelism metric computation:
-    an `NDArray` filled with matching scores generated by `scoring_function` from `hypotheses` and `references`, and
-    a `list` of coordinates to that matrix which pertain to the maximum matching generated  by the LSA algorithm.
+    an `NDArray` (or sparse array) filled with matching scores generated by `scoring_function`
+    from `hypotheses` and `references`, a `list` of coordinates to that matrix which pertain to the maximum matching
+    generated by the LSA algorithm, an `Alignment` mapping that matching back to the keys of
+    `hypotheses` and `references`, and an `int` upper bound on the maximal matching score
+    (which equals the score itself when the matching is exact).
     """
     scoring_kwargs = {} if scoring_kwargs is None else scoring_kwargs
     size_kwargs = {} if size_kwargs is None else size_kwargs
 
-    scoring_matrix: NDArray[int] = metric.score.create_score_matrix(hypotheses, references, **scoring_kwargs)
-    entries: list[tuple[int, int]] = LinearSumAssigner.get_lsa_entries(scoring_matrix)
-    computation_components: LSAComponents = {"scoring_matrix": scoring_matrix, "entries": entries}
+    if assigner.accepts_sparse_matrix is True:
+        scoring_matrix: Union[NDArray[int], sparray] = \
+            metric.score.create_sparse_score_matrix(hypotheses, references, **scoring_kwargs)
+    else:
+        scoring_matrix = metric.score.create_score_matrix(hypotheses, references, **scoring_kwargs)
+    entries: list[tuple[int, int]] = assigner.get_lsa_entries(scoring_matrix)
+    terms: list[int] = assigner.get_lsa_terms(scoring_matrix, entries)
 
     new_confusion_matrix: ReducedConfusionMatrix = ReducedConfusionMatrix()
-    new_confusion_matrix.score = LinearSumAssigner.get_lsa_score(scoring_matrix, entries)
+    new_confusion_matrix.score = assigner.get_lsa_score(scoring_matrix, entries)
     new_confusion_matrix.hypothesis_count = metric.size.compute_directory_size(hypotheses, **size_kwargs)
     new_confusion_matrix.reference_count = metric.size.compute_directory_size(references, **size_kwargs)
 
+    computation_components: LSAComponents = {
+        "scoring_matrix": scoring_matrix,
+        "entries": entries,
+        "alignment": Alignment.from_entries(hypotheses, references, entries, terms),
+        "score_upper_bound": assigner.get_score_upper_bound(scoring_matrix, new_confusion_matrix.score)
+    }
+    if keep_scoring_matrix is False:
+        del computation_components["scoring_matrix"]
+
     return new_confusion_matrix, computation_components
+
+
+def sweep_bipartite_parallelism_metric(hypotheses: ParallelismDirectory, references: ParallelismDirectory,
+                                       metric: EvaluationMetric, confidences: dict[int, float],
+                                       thresholds: Sequence[float],
+                                       scoring_kwargs: Optional[dict[str, Any]] = None,
+                                       size_kwargs: Optional[dict[str, Any]] = None) -> \
+        tuple[NDArray[float], ConfusionMatrixBatch]:
+    """
+    A function which computes a bipartite parallelism metric at many confidence thresholds at once,
+    as for a precision-recall curve. At each threshold, only the hypotheses whose confidence is at least
+    that threshold are evaluated. The score matrix is computed once, and thresholds are visited from highest to lowest;
+    as each threshold admits further hypotheses, they are added to the maximal matching incrementally
+    by an `IncrementalAssigner`, so the whole sweep costs about as much as a single evaluation.
+    :param hypotheses: a collection of hypothesized parallelisms in the form of a `ParallelismDirectory` object.
+    :param references: a collection of ground truth parallelisms in the form of a `ParallelismDirectory` object.
+    :param metric: an `EvaluationMetric` containing a coordinated combination of
+    a `ScoringFunction` class and a `SizeFunction` class.
+    :param confidences: a `dict` mapping the key of every parallelism in *hypotheses* to its `float` confidence.
+    :param thresholds: a collection of `float` confidence thresholds at which the metric will be computed.
+    :param scoring_kwargs: a collection of keyword arguments meant to modify the scoring calculations.
+    :param size_kwargs: a collection of keyword arguments meant to modify the size calculations.
+    :return: a 2-tuple of values, including: (1) an `NDArray` of the distinct thresholds in ascending order and
+    (2) a `ConfusionMatrixBatch` holding the result at each of those thresholds, in the same order.
+    """
+    scoring_kwargs = {} if scoring_kwargs is None else scoring_kwargs
+    size_kwargs = {} if size_kwargs is None else size_kwargs
+
+    missing_confidences: list[int] = \
+        [parallelism_id for parallelism_id in hypotheses if parallelism_id not in confidences]
+    if len(missing_confidences) > 0:
+        raise ValueError(f"No confidences were given for the hypotheses <{missing_confidences}>.")
+
+    hypothesis_count: int = len(hypotheses)
+    score_matrix: NDArray[int] = metric.score.create_score_matrix(hypotheses, references, **scoring_kwargs)
+    assigner: IncrementalAssigner = IncrementalAssigner(score_matrix[:hypothesis_count])
+
+    hypothesis_sizes: list[int] = [
+        metric.size.compute_directory_size({parallelism_id: parallelism}, **size_kwargs)
+        for parallelism_id, parallelism in hypotheses.items()
+    ]
+    reference_size: int = metric.size.compute_directory_size(references, **size_kwargs)
+    hypothesis_confidences: NDArray[float] = \
+        array([confidences[parallelism_id] for parallelism_id in hypotheses], dtype=float64)
+    hypothesis_order: list[int] = argsort(-hypothesis_confidences, kind="stable").tolist()
+
+    sorted_thresholds: NDArray[float] = unique(array(thresholds, dtype=float64))
+    scores: NDArray[int] = zeros(len(sorted_thresholds), dtype=int64)
+    hypothesis_totals: NDArray[int] = zeros(len(sorted_thresholds), dtype=int64)
+    added_count: int = 0
+    added_size: int = 0
+    for threshold_index in reversed(range(0, len(sorted_thresholds))):
+        while added_count < hypothesis_count and \
+                hypothesis_confidences[hypothesis_order[added_count]] >= sorted_thresholds[threshold_index]:
+            assigner.add_row(hypothesis_order[added_count])
+            added_size += hypothesis_sizes[hypothesis_order[added_count]]
+            added_count += 1
+
+        scores[threshold_index] = assigner.score
+        hypothesis_totals[threshold_index] = added_size
+
+    sweep_results: ConfusionMatrixBatch = ConfusionMatrixBatch(
+        scores, hypothesis_totals, full(len(sorted_thresholds), reference_size, dtype=int64)
+    )
+    return sorted_thresholds, sweep_results
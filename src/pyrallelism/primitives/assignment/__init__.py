@@ -1 +1,4 @@
+from .greedy import GreedyAssigner
+from .incremental import IncrementalAssigner
+from .interface import DefinedMatching, get_matching
 from .lsa import LinearSumAssigner
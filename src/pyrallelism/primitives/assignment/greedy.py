@@ -0,0 +1,82 @@
+from typing import Union
+
+from numpy import argsort, asarray, int64, maximum, zeros
+from numpy.typing import NDArray
+from scipy.sparse import coo_array, csr_array, sparray
+
+from .lsa import LinearSumAssigner
+
+
+class GreedyAssigner(LinearSumAssigner):
+    """
+    .. py:class:: GreedyAssigner
+    Subclass of `LinearSumAssigner` which computes an approximately maximal bipartite matching.
+    Nonzero entries are visited in descending order of score, and each is kept if neither its row nor its column
+    has been matched yet. This runs in `O(k log k)` time for `k` nonzero entries (rather than cubic time in the
+    size of the matrix) and accepts sparse matrices, so the full score matrix never needs to be materialized.
+    The resulting score is guaranteed to be at least half of the maximal score.
+    """
+    approximation_ratio: float = 0.5
+    accepts_sparse_matrix: bool = True
+
+    @staticmethod
+    def get_lsa_entries(scoring_matrix: Union[NDArray[int], sparray]) -> list[tuple[int, int]]:
+        """
+        Computes a greedy maximal matching over the nonzero entries of a two-dimensional matrix.
+        Ties between equal scores are broken by row and then column index, so the result is deterministic.
+        :param scoring_matrix: a two-dimensional ``NDArray`` or sparse array containing nonnegative ``int`` scores.
+        :return: a ``list`` of indices to the input matrix indicating values that are part of the greedy matching.
+        """
+        nonzero_entries: coo_array = coo_array(scoring_matrix)
+        nonzero_entries.sum_duplicates()
+        rows, columns = nonzero_entries.coords
+        descending_order: NDArray[int] = argsort(-nonzero_entries.data, kind="stable")
+
+        row_count, column_count = nonzero_entries.shape
+        matched_rows: list[bool] = [False] * row_count
+        matched_columns: list[bool] = [False] * column_count
+        maximum_entry_count: int = min(row_count, column_count)
+        entries: list[tuple[int, int]] = []
+        for row_index, column_index in zip(rows[descending_order].tolist(), columns[descending_order].tolist()):
+            if matched_rows[row_index] is False and matched_columns[column_index] is False:
+                matched_rows[row_index] = True
+                matched_columns[column_index] = True
+                entries.append((row_index, column_index))
+                if len(entries) == maximum_entry_count:
+                    break
+
+        return entries
+
+    @staticmethod
+    def get_lsa_terms(scoring_matrix: Union[NDArray[int], sparray], entries: list[tuple[int, int]]) -> list[int]:
+        if len(entries) == 0:
+            return []
+
+        rows, columns = zip(*entries)
+        indexable_matrix: Union[NDArray[int], csr_array] = \
+            csr_array(scoring_matrix) if isinstance(scoring_matrix, sparray) else scoring_matrix
+        lsa_terms: list[int] = asarray(indexable_matrix[list(rows), list(columns)]).ravel().tolist()
+        return lsa_terms
+
+    @classmethod
+    def get_score_upper_bound(cls, scoring_matrix: Union[NDArray[int], sparray], lsa_score: int) -> int:
+        """
+        Computes an upper bound on the maximal matching score, given the score of the greedy matching.
+        The bound is the smallest of three quantities, each of which cannot be exceeded by any matching:
+        twice the greedy score, the sum of each row's largest entry, and the sum of each column's largest entry.
+        :param scoring_matrix: a two-dimensional ``NDArray`` or sparse array containing nonnegative ``int`` scores.
+        :param lsa_score: the score obtained by the greedy matching computed for *scoring_matrix*.
+        :return: a nonnegative ``int`` which no matching over *scoring_matrix* can exceed.
+        """
+        nonzero_entries: coo_array = coo_array(scoring_matrix)
+        nonzero_entries.sum_duplicates()
+        rows, columns = nonzero_entries.coords
+        row_count, column_count = nonzero_entries.shape
+
+        row_maxima: NDArray[int] = zeros(row_count, dtype=int64)
+        maximum.at(row_maxima, rows, nonzero_entries.data)
+        column_maxima: NDArray[int] = zeros(column_count, dtype=int64)
+        maximum.at(column_maxima, columns, nonzero_entries.data)
+
+        score_upper_bound: int = int(min(lsa_score // cls.approximation_ratio, row_maxima.sum(), column_maxima.sum()))
+        return score_upper_bound
@@ -0,0 +1,95 @@
+from numpy import argmin, full, iinfo, int64, where, zeros
+from numpy.typing import NDArray
+
+
+class IncrementalAssigner:
+    """
+    .. py:class:: IncrementalAssigner
+    Maintains a maximal bipartite matching over a two-dimensional `NDArray` of scores as its rows are added one by one.
+    It follows the shortest augmenting path formulation of the Hungarian algorithm:
+    each added row is matched by a single augmenting path, found with the help of dual potentials which
+    are carried over from previous rows, rather than by solving the whole assignment problem again.
+    After every addition, the matching is maximal among the rows added so far, and its score is read from the duals.
+    Adding all `n` rows of an `n`-by-`m` matrix takes `O(n^2 m)` time, the same as a single solution from scratch.
+    The matrix must have at least as many columns as rows; zero-scoring columns may be used as padding,
+    since a row assigned to a zero score is effectively unmatched.
+    """
+    def __init__(self, scoring_matrix: NDArray[int]):
+        """
+        :param scoring_matrix: a two-dimensional `NDArray` containing nonnegative `int` score values,
+        with no more rows than columns.
+        """
+        row_count, column_count = scoring_matrix.shape
+        if row_count > column_count:
+            raise ValueError(f"The scoring matrix has {row_count} rows but only {column_count} columns; "
+                             f"it must have at least as many columns as rows.")
+
+        # Row and column 0 are sentinels; row i and column j of the input correspond to row i + 1 and column j + 1.
+        self.costs: NDArray[int] = zeros((row_count + 1, column_count + 1), dtype=int64)
+        self.costs[1:, 1:] = -scoring_matrix
+        self.row_potentials: NDArray[int] = zeros(row_count + 1, dtype=int64)
+        self.column_potentials: NDArray[int] = zeros(column_count + 1, dtype=int64)
+        self.column_assignments: NDArray[int] = zeros(column_count + 1, dtype=int64)
+        self.added_rows: set[int] = set()
+
+    @property
+    def score(self) -> int:
+        """
+        :return: the `int` score of the maximal matching among the rows added so far.
+        """
+        # The cost of an optimal assignment is the negated potential of the sentinel column.
+        return int(self.column_potentials[0])
+
+    def add_row(self, row_index: int):
+        """
+        Adds a row to the matching and restores its maximality with one augmenting path.
+        :param row_index: the index of the row to be added.
+        """
+        if row_index in self.added_rows:
+            raise ValueError(f"The row <{row_index}> has already been added.")
+        self.added_rows.add(row_index)
+
+        infinity: int = iinfo(int64).max // 4
+        column_count: int = len(self.column_potentials)
+        minimum_slacks: NDArray[int] = full(column_count, infinity, dtype=int64)
+        is_visited: NDArray[bool] = zeros(column_count, dtype=bool)
+        predecessors: NDArray[int] = zeros(column_count, dtype=int64)
+
+        self.column_assignments[0] = row_index + 1
+        current_column: int = 0
+        while True:
+            is_visited[current_column] = True
+            current_row: int = int(self.column_assignments[current_column])
+            slacks: NDArray[int] = \
+                self.costs[current_row] - self.row_potentials[current_row] - self.column_potentials
+            is_improved: NDArray[bool] = ~is_visited & (slacks < minimum_slacks)
+            minimum_slacks[is_improved] = slacks[is_improved]
+            predecessors[is_improved] = current_column
+
+            candidate_slacks: NDArray[int] = where(is_visited, infinity, minimum_slacks)
+            next_column: int = int(argmin(candidate_slacks))
+            delta: int = int(candidate_slacks[next_column])
+
+            self.row_potentials[self.column_assignments[is_visited]] += delta
+            self.column_potentials[is_visited] -= delta
+            minimum_slacks[~is_visited] -= delta
+
+            current_column = next_column
+            if self.column_assignments[current_column] == 0:
+                break
+
+        # The augmenting path is traced back to the sentinel column, shifting each assignment along it.
+        while current_column != 0:
+            previous_column: int = int(predecessors[current_column])
+            self.column_assignments[current_column] = self.column_assignments[previous_column]
+            current_column = previous_column
+
+    def get_entries(self) -> list[tuple[int, int]]:
+        """
+        :return: a `list` of (row, column) indices to the scoring matrix which form the current matching.
+        """
+        entries: list[tuple[int, int]] = sorted([
+            (row - 1, column - 1) for column, row in enumerate(self.column_assignments.tolist())
+            if column > 0 and row > 0
+        ])
+        return entries
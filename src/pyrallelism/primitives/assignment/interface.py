@@ -0,0 +1,28 @@
+from enum import StrEnum
+from typing import Type
+
+from .greedy import GreedyAssigner
+from .lsa import LinearSumAssigner
+
+
+class DefinedMatching(StrEnum):
+    """
+    .. py:class:: DefinedMatching
+    Enumeration class for the names of predefined bipartite matching procedures.
+    """
+    EXACT: str = "exact"
+    APPROXIMATE: str = "approximate"
+
+
+MATCHING_TABLE: dict[str, Type[LinearSumAssigner]] = {
+    DefinedMatching.EXACT: LinearSumAssigner,
+    DefinedMatching.APPROXIMATE: GreedyAssigner
+}
+
+
+def get_matching(matching_name: str) -> Type[LinearSumAssigner]:
+    try:
+        assigner: Type[LinearSumAssigner] = MATCHING_TABLE[matching_name]
+    except KeyError:
+        raise ValueError(f"The matching <{matching_name}> is not recognized.")
+    return assigner
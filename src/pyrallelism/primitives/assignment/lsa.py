@@ -6,7 +6,12 @@ class LinearSumAssigner:
     """
     .. py:class:: LinearSumAssigner
     Maintains all functions related to computing the maximal bipartite matching from a two-dimensional `NDArray`.
+    The matching it computes is exact; subclasses which approximate it record their guarantee in
+    `approximation_ratio`, the smallest possible fraction of the maximal score that they obtain.
     """
+    approximation_ratio: float = 1.0
+    accepts_sparse_matrix: bool = False
+
     @staticmethod
     def get_lsa_entries(scoring_matrix: NDArray[int]) -> list[tuple[int, int]]:
         """
@@ -16,7 +21,7 @@ class LinearSumAssigner:
         :return: a ``list`` of indices to the input matrix indicating values that are part of the maximal score.
         """
         rows, columns = linear_sum_assignment(scoring_matrix, maximize=True)   # type: ignore
-        entries: list[tuple[int, int]] = zip(rows, columns)
+        entries: list[tuple[int, int]] = list(zip(rows.tolist(), columns.tolist()))
         return entries
 
     @classmethod
@@ -28,7 +33,7 @@ class LinearSumAssigner:
         :param entries: a ``list`` of indices to the input matrix indicating values that are part of the maximal score.
         :return: a nonnegative ``int`` representing the maximal linear sum assignment score.
         """
-        lsa_score: int = sum(cls.get_lsa_terms(scoring_matrix, entries))
+        lsa_score: int = int(sum(cls.get_lsa_terms(scoring_matrix, entries)))
         return lsa_score
 
     @staticmethod
@@ -42,3 +47,14 @@ class LinearSumAssigner:
         """
         lsa_terms: list[int] = [scoring_matrix[row_index][column_index] for (row_index, column_index) in entries]
         return lsa_terms
+
+    @classmethod
+    def get_score_upper_bound(cls, scoring_matrix: NDArray[int], lsa_score: int) -> int:
+        """
+        Computes an upper bound on the maximal score of a two-dimensional ``NDArray``,
+        given the score of the assignment computed for it. As this class's assignment is exact, this is its score.
+        :param scoring_matrix: a two-dimensional ``NDArray`` containing nonnegative ``int`` score values.
+        :param lsa_score: the score obtained by the assignment computed for *scoring_matrix*.
+        :return: a nonnegative ``int`` which no matching over *scoring_matrix* can exceed.
+        """
+        return lsa_score
@@ -1,2 +1,2 @@
 from .base import BaseConverter
-from .instantiations import BranchedWordConverter
+from .instantiations import BranchedWordConverter, TokenIncidenceConverter
@@ -1,5 +1,9 @@
+from numpy import arange, array, cumsum, int64, ones, repeat
+from numpy.typing import NDArray
+from scipy.sparse import csr_array
+
 from ..conversion.base import BaseConverter
-from ..typing import BranchedWordSet, Parallelism
+from ..typing import BranchedWordSet, Parallelism, ParallelismDirectory
 
 
 class BranchedWordConverter(BaseConverter):
@@ -16,3 +20,53 @@ class BranchedWordConverter(BaseConverter):
             converted_parallelism.append(branched_word_representation)
 
         return converted_parallelism
+
+
+class TokenIncidenceConverter(BaseConverter):
+    """
+    .. py:class:: TokenIncidenceConverter
+    Subclass of `BaseConverter` which converts a `Parallelism` to the sorted indices of the tokens it covers.
+    It can also convert a whole `ParallelismDirectory` at once into a sparse incidence matrix,
+    with one row per parallelism (in the directory's order) and one column per token index,
+    whose entries are `1` where a parallelism covers a token. Products of such matrices count shared tokens,
+    so they allow word-level scores and sizes to be computed with array operations.
+    """
+    @classmethod
+    def convert_parallelism(cls, parallelism: Parallelism, **kwargs) -> NDArray[int]:
+        incidence_matrix: csr_array = cls.convert_directory({0: parallelism})
+        return incidence_matrix.indices.copy()
+
+    @classmethod
+    def convert_directory(cls, directory: ParallelismDirectory, **kwargs) -> csr_array:
+        """
+        :param directory: a `ParallelismDirectory` to be converted.
+        :param kwargs: a collection of keyword arguments meant to modify the conversion of parallelisms.
+        :return: a sparse incidence matrix of shape `(len(directory), t)`, where `t` is the index after the last token
+        covered by any parallelism in *directory*.
+        """
+        branch_rows: list[int] = []
+        branch_starts: list[int] = []
+        branch_ends: list[int] = []
+        for row_index, parallelism in enumerate(directory.values()):
+            for branch_start, branch_end in parallelism:
+                branch_rows.append(row_index)
+                branch_starts.append(branch_start)
+                branch_ends.append(branch_end)
+
+        starts: NDArray[int] = array(branch_starts, dtype=int64)
+        ends: NDArray[int] = array(branch_ends, dtype=int64)
+        branch_lengths: NDArray[int] = ends - starts
+        # Each branch is expanded into its tokens: the k-th token of a branch lies k tokens after its start.
+        token_positions: NDArray[int] = \
+            arange(branch_lengths.sum(), dtype=int64) - repeat(cumsum(branch_lengths) - branch_lengths, branch_lengths)
+        token_rows: NDArray[int] = repeat(array(branch_rows, dtype=int64), branch_lengths)
+        token_columns: NDArray[int] = repeat(starts, branch_lengths) + token_positions
+
+        incidence_matrix: csr_array = csr_array(
+            (ones(len(token_columns), dtype=int64), (token_rows, token_columns)),
+            shape=(len(directory), int(ends.max(initial=0)))
+        )
+        # Tokens covered by more than one branch of a parallelism are only counted once.
+        incidence_matrix.sum_duplicates()
+        incidence_matrix.data[:] = 1
+        return incidence_matrix
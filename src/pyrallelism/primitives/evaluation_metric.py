@@ -1,6 +1,7 @@
 from enum import StrEnum
 from typing import NamedTuple, Sequence, Type
 
+from .plugins import load_plugin, PluginGroup
 from .score.base import ScoringFunction
 from .score.instantiations import ExactScorer, MaximumParallelBranchScorer, \
     MaximumBranchAwareWordOverlapScorer, MaximumWordOverlapScorer
@@ -48,5 +49,9 @@ def get_metric(metric_name: str) -> EvaluationMetric:
     try:
         metric: EvaluationMetric = METRIC_TABLE[metric_name]
     except KeyError:
-        raise ValueError(f"The metric <{metric_name}> is not recognized.")
+        metric = load_plugin(PluginGroup.METRICS, metric_name)
+        if metric is None:
+            raise ValueError(f"The metric <{metric_name}> is not recognized.")
+        elif not isinstance(metric, EvaluationMetric):
+            raise TypeError(f"The metric plugin <{metric_name}> is not an EvaluationMetric.")
     return metric
@@ -0,0 +1,67 @@
+from typing import Iterable, TypeAlias
+
+from .typing import Branch, Parallelism, ParallelismDirectory
+
+CanonicalParallelism: TypeAlias = frozenset[Branch]
+CanonicalForm: TypeAlias = tuple[int, CanonicalParallelism]
+
+
+class ParallelismInterner:
+    """
+    .. py:class:: ParallelismInterner
+    Stores each distinct `Branch` and `Parallelism` once, so that repeated parallelisms--
+    whether across strata, documents, or hypotheses and references--share a single object.
+    Interned parallelisms are `frozenset` objects: they compare equal to the original `set` objects,
+    and, as they are immutable, their hashes are computed only once.
+    Interned values are kept until the interner is cleared or discarded.
+    """
+    def __init__(self):
+        self.branches: dict[Branch, Branch] = {}
+        self.parallelisms: dict[CanonicalParallelism, CanonicalParallelism] = {}
+
+    def __len__(self) -> int:
+        return len(self.parallelisms)
+
+    def intern_branch(self, branch: Branch) -> Branch:
+        """
+        :param branch: a `Branch` to be interned.
+        :return: the stored `Branch` equal to *branch*, which is *branch* itself if it was not yet stored.
+        """
+        return self.branches.setdefault(branch, branch)
+
+    def intern_parallelism(self, parallelism: Iterable[Branch]) -> CanonicalParallelism:
+        """
+        :param parallelism: a `Parallelism` (or other collection of branches) to be interned.
+        :return: the stored `frozenset` equal to *parallelism*.
+        """
+        interned_parallelism: CanonicalParallelism = frozenset([self.intern_branch(branch) for branch in parallelism])
+        return self.parallelisms.setdefault(interned_parallelism, interned_parallelism)
+
+    def intern_directory(self, directory: ParallelismDirectory) -> ParallelismDirectory:
+        """
+        :param directory: a `ParallelismDirectory` whose parallelisms are to be interned.
+        :return: a new `ParallelismDirectory` with the same keys, whose values are interned parallelisms.
+        """
+        interned_directory: ParallelismDirectory = {
+            parallelism_id: self.intern_parallelism(parallelism) for parallelism_id, parallelism in directory.items()
+        }
+        return interned_directory
+
+    def clear(self):
+        self.branches.clear()
+        self.parallelisms.clear()
+
+
+def get_canonical_form(parallelism: Parallelism) -> CanonicalForm:
+    """
+    Separates a parallelism into its position and its shape: the index of its first token and
+    the layout of its branches relative to that token. Parallelisms with the same shape at different positions
+    share a canonical shape, so results which depend only on relative positions can be reused between them.
+    :param parallelism: a `Parallelism` to be canonicalized.
+    :return: a 2-tuple containing the `int` offset of *parallelism* and its shape as a `frozenset` of branches.
+    An empty parallelism has an offset of `0`.
+    """
+    offset: int = min([branch_start for branch_start, _ in parallelism], default=0)
+    shape: CanonicalParallelism = \
+        frozenset([(branch_start - offset, branch_end - offset) for branch_start, branch_end in parallelism])
+    return offset, shape
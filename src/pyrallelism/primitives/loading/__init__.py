@@ -1,3 +1,4 @@
 from .base import BaseParallelismLoader
-from .instantiations import TSVLoader, XMLLoader
+from .compression import CompressionFormat, detect_compression, open_input
+from .instantiations import ArrayLoader, NPZLoader, TSVLoader, XMLLoader
 from .interface import DefinedLoader, get_loader
@@ -1,4 +1,9 @@
 from abc import abstractmethod
+from os import path
+from typing import Iterator, Optional, Sequence
+
+from numpy import arange, concatenate, full, nonzero
+from numpy.typing import NDArray
 
 from ..typing import Branch, ParallelismDirectory, TokenIdentifiers
 
@@ -19,18 +24,54 @@ class BaseParallelismLoader:
         One such example is a pre-specified *stratum_count*, or number of strata to consider during evaluation.
         :return: a `ParallelismDirectory` derived from the provided file.
         """
-        parallelism_directory: ParallelismDirectory = {}
-        stratum_rows: list[list[tuple[int, int]]] = cls._read_file(filepath, **kwargs)
-        for stratum_row in stratum_rows:
-            cls._handle_stratum(parallelism_directory, stratum_row)
-
+        stratum_rows: list[TokenIdentifiers] = cls._read_file(filepath, **kwargs)
+        parallelism_directory: ParallelismDirectory = cls._build_directory(stratum_rows)
         return parallelism_directory
 
+    @classmethod
+    def stream_parallelism_directories(cls, filepath: str, **kwargs) -> Iterator[tuple[str, ParallelismDirectory]]:
+        """
+        Lazily loads each document stored in a file into its own `ParallelismDirectory`.
+        Only one document is held in memory at a time, so arbitrarily large multi-document files can be traversed.
+        :param filepath: the path to a file from which one or more `ParallelismDirectory` objects will be generated.
+        The type of the file should correspond to the loader subclass used.
+        :param kwargs: a collection of keyword arguments meant to modify the creation of a `ParallelismDirectory`.
+        :return: an iterator over 2-tuples containing a `str` name for each document and
+        the `ParallelismDirectory` derived from that document, in the order in which the documents appear.
+        """
+        for document_name, stratum_rows in cls._stream_documents(filepath, **kwargs):
+            yield document_name, cls._build_directory(stratum_rows)
+
     @staticmethod
     @abstractmethod
     def _read_file(filepath: str, **kwargs) -> list[TokenIdentifiers]:
         raise NotImplementedError
 
+    @classmethod
+    def _stream_documents(cls, filepath: str, **kwargs) -> Iterator[tuple[str, list[TokenIdentifiers]]]:
+        """
+        Yields the per-stratum token identifiers of each document in a file.
+        By default, a file is treated as a single document named after the file itself;
+        subclasses supporting multi-document files should override this method.
+        :param filepath: the path to a file from which documents will be read.
+        :param kwargs: a collection of keyword arguments meant to modify the reading of documents.
+        :return: an iterator over 2-tuples containing a `str` name for each document and its stratum rows.
+        """
+        yield path.basename(filepath), cls._read_file(filepath, **kwargs)
+
+    @classmethod
+    def _build_directory(cls, stratum_rows: list[TokenIdentifiers]) -> ParallelismDirectory:
+        """
+        Assembles a `ParallelismDirectory` from the token identifiers of each stratum of a single document.
+        :param stratum_rows: a `list` containing, for each stratum, the `parallelism_id` and `branch_id` of each token.
+        :return: a `ParallelismDirectory` containing the branches found across all strata.
+        """
+        parallelism_directory: ParallelismDirectory = {}
+        for stratum_row in stratum_rows:
+            cls._handle_stratum(parallelism_directory, stratum_row)
+
+        return parallelism_directory
+
     @staticmethod
     def _handle_stratum(directory: ParallelismDirectory, stratum_row: list[tuple[int, int]]):
         """
@@ -60,3 +101,60 @@ class BaseParallelismLoader:
                 token_index = branch_end
             else:
                 token_index += 1
+
+    @classmethod
+    def _handle_stratum_array(cls, directory: ParallelismDirectory, parallelism_ids: NDArray[int],
+                              branch_ids: NDArray[int]):
+        """
+        Derives branches from an individual stratum given as two aligned one-dimensional integer arrays.
+        This follows the same semantics as `_handle_stratum`: a branch is a maximal run of tokens sharing
+        a `parallelism_id` (other than `-1`) and a `branch_id`. Run boundaries are located with array operations,
+        so no per-token objects are created; only the resulting branches are handled individually.
+        :param directory: the `ParallelismDirectory` to be filled with branches from the given stratum.
+        :param parallelism_ids: a one-dimensional array containing the `parallelism_id` of each token.
+        :param branch_ids: a one-dimensional array containing the `branch_id` of each token.
+        """
+        cls._handle_stratum_batch([directory], parallelism_ids[None, :], branch_ids[None, :])
+
+    @staticmethod
+    def _handle_stratum_batch(directories: Sequence[ParallelismDirectory], parallelism_ids: NDArray[int],
+                              branch_ids: NDArray[int], lengths: Optional[NDArray[int]] = None):
+        """
+        Derives branches from one stratum of many documents at once, as `_handle_stratum_array` does for one.
+        The documents are given as the rows of two aligned two-dimensional integer arrays,
+        which may be padded past the end of each document; runs are located across all rows at once.
+        :param directories: the `ParallelismDirectory` objects to be filled, one per document.
+        :param parallelism_ids: an array of shape `(documents, tokens)` containing the `parallelism_id` of each token.
+        :param branch_ids: an array of the same shape containing the `branch_id` of each token.
+        :param lengths: a one-dimensional array containing the number of tokens in each document.
+        If it is not given, every document spans the full width of the arrays.
+        """
+        document_count, token_count = parallelism_ids.shape
+        if document_count == 0 or token_count == 0:
+            return
+        lengths = full(document_count, token_count) if lengths is None else lengths
+
+        is_valid: NDArray[bool] = arange(token_count)[None, :] < lengths[:, None]
+        is_run_start: NDArray[bool] = is_valid.copy()
+        is_run_start[:, 1:] &= \
+            (parallelism_ids[:, 1:] != parallelism_ids[:, :-1]) | (branch_ids[:, 1:] != branch_ids[:, :-1])
+        run_documents, run_starts = nonzero(is_run_start)
+
+        # Each run ends where the next one starts, unless the next one belongs to another document.
+        next_documents: NDArray[int] = concatenate((run_documents[1:], [-1]))
+        run_ends: NDArray[int] = concatenate((run_starts[1:], [0]))
+        is_final_run: NDArray[bool] = next_documents != run_documents
+        run_ends[is_final_run] = lengths[run_documents[is_final_run]]
+
+        run_parallelism_ids: NDArray[int] = parallelism_ids[run_documents, run_starts]
+        is_parallel: NDArray[bool] = run_parallelism_ids != -1
+        branch_quadruples: zip = zip(
+            run_documents[is_parallel].tolist(), run_parallelism_ids[is_parallel].tolist(),
+            run_starts[is_parallel].tolist(), run_ends[is_parallel].tolist()
+        )
+        for document_index, parallelism_id, branch_start, branch_end in branch_quadruples:
+            new_branch: Branch = (branch_start, branch_end)
+            directory: ParallelismDirectory = directories[document_index]
+            if parallelism_id not in directory:
+                directory[parallelism_id] = set()
+            directory[parallelism_id].add(new_branch)
@@ -0,0 +1,116 @@
+from bz2 import BZ2File
+from enum import StrEnum
+from gzip import GzipFile
+from io import BufferedReader
+from lzma import LZMAFile
+from os import path
+from typing import BinaryIO, Callable, Optional
+
+INPUT_BUFFER_SIZE: int = 2 ** 20
+
+
+class CompressionFormat(StrEnum):
+    """
+    .. py:class:: CompressionFormat
+    Enumeration class for the names of compression formats which loaders decompress transparently.
+    """
+    GZIP: str = "gzip"
+    BZIP2: str = "bzip2"
+    XZ: str = "xz"
+    ZSTANDARD: str = "zstandard"
+
+
+MAGIC_NUMBER_TABLE: dict[bytes, str] = {
+    b"\x1f\x8b": CompressionFormat.GZIP,
+    b"BZh": CompressionFormat.BZIP2,
+    b"\xfd7zXZ\x00": CompressionFormat.XZ,
+    b"\x28\xb5\x2f\xfd": CompressionFormat.ZSTANDARD
+}
+
+EXTENSION_TABLE: dict[str, str] = {
+    ".gz": CompressionFormat.GZIP,
+    ".bz2": CompressionFormat.BZIP2,
+    ".xz": CompressionFormat.XZ,
+    ".zst": CompressionFormat.ZSTANDARD
+}
+
+
+class DecompressedReader(BufferedReader):
+    """
+    .. py:class:: DecompressedReader
+    Buffered reader over a decompressing stream which also closes the compressed file beneath it,
+    as decompressing streams given an open file leave that file open.
+    """
+    def __init__(self, decompressed_file: BinaryIO, input_file: BinaryIO):
+        super().__init__(decompressed_file, buffer_size=INPUT_BUFFER_SIZE)
+        self.input_file: BinaryIO = input_file
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            self.input_file.close()
+
+
+def _open_zstandard(input_file: BinaryIO) -> BinaryIO:
+    # Zstandard is only supported by the standard library from Python 3.14 onward; otherwise, *zstandard* is used.
+    try:
+        from compression.zstd import ZstdFile
+        return ZstdFile(input_file, mode="rb")
+    except ImportError:
+        pass
+
+    try:
+        from zstandard import ZstdDecompressor
+    except ImportError:
+        raise ImportError("Reading Zstandard-compressed files requires Python 3.14 or the *zstandard* package, "
+                          "which can be installed with the *zstd* extra (pip install pyrallelism[zstd]).")
+    return ZstdDecompressor().stream_reader(input_file, read_size=INPUT_BUFFER_SIZE, closefd=False)
+
+
+DECOMPRESSOR_TABLE: dict[str, Callable[[BinaryIO], BinaryIO]] = {
+    CompressionFormat.GZIP: lambda input_file: GzipFile(fileobj=input_file, mode="rb"),
+    CompressionFormat.BZIP2: lambda input_file: BZ2File(input_file, mode="rb"),
+    CompressionFormat.XZ: lambda input_file: LZMAFile(input_file, mode="rb"),
+    CompressionFormat.ZSTANDARD: _open_zstandard
+}
+
+
+def detect_compression(filepath: str) -> Optional[str]:
+    """
+    Determines how a file is compressed, chiefly by its leading magic number.
+    A file whose contents are not recognized is identified by its extension instead.
+    :param filepath: the path to a file which may be compressed.
+    :return: the `CompressionFormat` of the file, or `None` if it is not compressed.
+    """
+    with open(filepath, mode="rb") as input_file:
+        leading_bytes: bytes = input_file.read(max([len(magic_number) for magic_number in MAGIC_NUMBER_TABLE]))
+
+    for magic_number, compression_format in MAGIC_NUMBER_TABLE.items():
+        if leading_bytes.startswith(magic_number):
+            return compression_format
+
+    _, extension = path.splitext(filepath)
+    return EXTENSION_TABLE.get(extension.lower(), None)
+
+
+def open_input(filepath: str, compression_format: Optional[str] = None) -> BinaryIO:
+    """
+    Opens a file for binary reading, decompressing it as it is read if it is compressed.
+    Both the underlying file and the decompressed stream are read in large blocks,
+    so line-by-line reading does not incur a call to the decompressor per line.
+    :param filepath: the path to a file which may be compressed.
+    :param compression_format: the `CompressionFormat` of the file, if known; otherwise, it is detected.
+    :return: a readable binary file object yielding the file's (decompressed) contents.
+    """
+    compression_format = detect_compression(filepath) if compression_format is None else compression_format
+    input_file: BinaryIO = open(filepath, mode="rb", buffering=INPUT_BUFFER_SIZE)
+    if compression_format is None:
+        return input_file
+
+    try:
+        decompressed_file: BinaryIO = DECOMPRESSOR_TABLE[compression_format](input_file)
+    except BaseException:
+        input_file.close()
+        raise
+    return DecompressedReader(decompressed_file, input_file)
@@ -1,46 +1,134 @@
+from io import BytesIO
+from mmap import ACCESS_READ, mmap
+from os import fstat, path
+from struct import unpack
+from typing import BinaryIO, Iterable, Iterator, Optional, Type
 from xml.etree import ElementTree as ETModule
 from xml.etree.ElementTree import Element, ElementTree
+from zipfile import ZipFile, ZipInfo, ZIP_STORED
+
+from numpy import array, ascontiguousarray, asarray, concatenate, cumsum, empty, int64, load as npy_load, memmap, \
+    prod, savez
+from numpy.lib import format as npy_format
+from numpy.typing import ArrayLike, NDArray
 
 from .base import BaseParallelismLoader
-from ..typing import TokenIdentifiers
+from .compression import detect_compression, open_input
+from ..typing import ParallelismDirectory, TokenIdentifiers
+
+DOCUMENT_ID_HEADER: str = "Document ID"
 
 
 class TSVLoader(BaseParallelismLoader):
+    """
+    .. py:class:: TSVLoader
+    Subclass of `BaseParallelismLoader` which loads tab-separated files.
+    After a header row, each row contains a token followed by a `parallelism_id` and a `branch_id` for each stratum.
+    A file may hold multiple documents. These are separated by blank rows or, if the first header column is
+    named by `DOCUMENT_ID_HEADER`, by changes in that column's value.
+    Files are memory-mapped and scanned row by row, so only the document currently being built is held in memory;
+    compressed files are instead decompressed as they are scanned, with large buffered reads.
+    """
+    @classmethod
+    def _read_file(cls, filepath: str, **kwargs) -> list[TokenIdentifiers]:
+        documents: list[tuple[str, list[TokenIdentifiers]]] = list(cls._stream_documents(filepath, **kwargs))
+        if len(documents) > 1:
+            raise ValueError(f"The file <{filepath}> contains {len(documents)} documents. "
+                             f"Multi-document files must be loaded with *stream_parallelism_directories*.")
+        elif len(documents) == 0:
+            stratum_rows: list[TokenIdentifiers] = []
+        else:
+            _, stratum_rows = documents[0]
+        return stratum_rows
+
+    @classmethod
+    def _stream_documents(cls, filepath: str, **kwargs) -> Iterator[tuple[str, list[TokenIdentifiers]]]:
+        compression_format: Optional[str] = detect_compression(filepath)
+        with open_input(filepath, compression_format) as input_file:
+            if compression_format is not None:
+                if input_file.peek(1) == b"":
+                    raise ValueError(f"The file <{filepath}> is empty, but it should at least contain a header row.")
+                yield from cls._scan_documents(input_file, path.basename(filepath), **kwargs)
+            elif fstat(input_file.fileno()).st_size == 0:
+                raise ValueError(f"The file <{filepath}> is empty, but it should at least contain a header row.")
+            else:
+                with mmap(input_file.fileno(), 0, access=ACCESS_READ) as input_map:
+                    yield from cls._scan_documents(input_map, path.basename(filepath), **kwargs)
+
     @staticmethod
-    def _read_file(filepath: str, **kwargs) -> list[TokenIdentifiers]:
-        with open(filepath, encoding="utf-8", mode="r") as input_file:
-            rows: list[str] = input_file.readlines()
-            header_row, *table_rows = rows
-            header_items = header_row.strip().split("\t")
+    def _scan_documents(input_source: BinaryIO, filename: str, **kwargs) -> \
+            Iterator[tuple[str, list[TokenIdentifiers]]]:
+        """
+        Scans a line-readable binary source for document boundaries,
+        yielding the stratum rows of each document as soon as it ends.
+        :param input_source: a binary object supporting *readline*, positioned at the start of a TSV file.
+        :param filename: the name of the file being scanned, used to name documents without explicit IDs.
+        :param kwargs: a collection of keyword arguments meant to modify the reading of documents.
+        :return: an iterator over 2-tuples containing a `str` name for each document and its stratum rows.
+        """
+        header_items: list[str] = input_source.readline().decode("utf-8").strip().split("\t")
+        has_document_ids: bool = header_items[0].strip() == DOCUMENT_ID_HEADER
+        id_start: int = 2 if has_document_ids is True else 1
 
-            if (len(header_items) - 1) % 2 != 0:
-                raise ValueError("The number of ID lines (sans the token) must be divisible by 2, "
-                                 "with 2 IDs (for a parallelism and branch) being required per stratum.")
+        if (len(header_items) - id_start) % 2 != 0:
+            raise ValueError("The number of ID lines (sans the token) must be divisible by 2, "
+                             "with 2 IDs (for a parallelism and branch) being required per stratum.")
 
-            stratum_count: int = (len(header_items) - 1) // 2 if kwargs["stratum_count"] is None \
-                else kwargs["stratum_count"]
+        stratum_count: int = (len(header_items) - id_start) // 2 if kwargs.get("stratum_count", None) is None \
+            else kwargs["stratum_count"]
 
-            data_rows: list[list[tuple[int, int]]] = []
-            for row in table_rows:
-                _, *ids = row.strip().split("\t")
+        document_count: int = 0
+        document_name: Optional[str] = None
+        completed_document: Optional[tuple[str, list[TokenIdentifiers]]] = None
+        data_rows: list[list[tuple[int, int]]] = []
+        for row in iter(input_source.readline, b""):
+            row_items: list[bytes] = row.rstrip(b"\r\n").split(b"\t")
+            if row.strip() == b"" or (has_document_ids is True and row_items[0].decode("utf-8") != document_name):
+                if len(data_rows) > 0:
+                    if completed_document is not None:
+                        yield completed_document
+                    completed_document = (document_name, list(zip(*data_rows)))
+                    data_rows = []
 
-                stratum_ids: list[tuple[int, int]] = []
-                for index in range(0, len(ids), 2):
-                    parallelism_id, branch_id = ids[index:index + 2]
-                    current_ids: tuple[int, int] = (int(parallelism_id), int(branch_id))
-                    stratum_ids.append(current_ids)
+                if row.strip() == b"":
+                    document_name = None
+                    continue
 
-                assert len(stratum_ids) == stratum_count
-                data_rows.append(stratum_ids)
+            if len(data_rows) == 0:
+                document_count += 1
+                document_name = row_items[0].decode("utf-8") if has_document_ids is True \
+                    else f"{filename}:{document_count}"
 
-        stratum_rows: list[TokenIdentifiers] = list(zip(*data_rows))
-        return stratum_rows
+            ids: list[bytes] = row_items[id_start:]
+            stratum_ids: list[tuple[int, int]] = []
+            for index in range(0, len(ids), 2):
+                parallelism_id, branch_id = ids[index:index + 2]
+                current_ids: tuple[int, int] = (int(parallelism_id), int(branch_id))
+                stratum_ids.append(current_ids)
+
+            if len(stratum_ids) != stratum_count:
+                raise ValueError(f"A row in <{filename}> contains {len(stratum_ids)} strata, "
+                                 f"but {stratum_count} strata were expected.")
+            data_rows.append(stratum_ids)
+
+        if len(data_rows) > 0:
+            if completed_document is not None:
+                yield completed_document
+            completed_document = (document_name, list(zip(*data_rows)))
+
+        # Documents are held back by one so that a file with only one unidentified document is named after the file.
+        if completed_document is not None:
+            final_name, final_rows = completed_document
+            if has_document_ids is False and document_count == 1:
+                final_name = filename
+            yield final_name, final_rows
 
 
 class XMLLoader(BaseParallelismLoader):
     @staticmethod
     def _read_file(filepath: str, **kwargs) -> list[TokenIdentifiers]:
-        xml_file: ElementTree = ETModule.parse(filepath)
+        with open_input(filepath) as input_file:
+            xml_file: ElementTree = ETModule.parse(input_file)
         root: Element = xml_file.getroot()
 
         words: list[Element] = root.findall(".//word")
@@ -62,3 +150,293 @@ class XMLLoader(BaseParallelismLoader):
                 stratum_rows[-1].append(stratum_token_ids)
 
         return stratum_rows
+
+
+class NPZLoader(BaseParallelismLoader):
+    """
+    .. py:class:: NPZLoader
+    Subclass of `BaseParallelismLoader` which loads columnar binary bundles stored in NumPy's `.npz` format.
+    A bundle holds a whole corpus and contains the following arrays:
+
+    - `parallelism_ids`: an integer array of shape `(stratum_count, token_count)` holding the `parallelism_id` of
+      each token in each stratum, with the tokens of all documents laid end to end.
+    - `branch_ids`: an integer array of the same shape holding the `branch_id` of each token in each stratum.
+    - `document_offsets`: an integer array of shape `(document_count + 1,)` such that the tokens of document `i`
+      occupy the columns from `document_offsets[i]` up to (but not including) `document_offsets[i + 1]`.
+    - `document_names`: a string array of shape `(document_count,)` naming each document.
+
+    As with TSV and XML files, a `parallelism_id` of `-1` marks a token which belongs to no parallelism.
+    Bundles written without compression (as by `write_bundle`) are memory-mapped rather than read,
+    and branches are derived from the ID columns without any token-level parsing.
+    Bundles which have themselves been compressed (e.g., as `.npz.gz` files) are decompressed into memory first.
+    """
+    @classmethod
+    def load_parallelism_directory(cls, filepath: str, **kwargs) -> ParallelismDirectory:
+        documents: list[tuple[str, ParallelismDirectory]] = list(cls.stream_parallelism_directories(filepath, **kwargs))
+        if len(documents) != 1:
+            raise ValueError(f"The file <{filepath}> contains {len(documents)} documents. "
+                             f"Multi-document files must be loaded with *stream_parallelism_directories*.")
+
+        _, parallelism_directory = documents[0]
+        return parallelism_directory
+
+    @classmethod
+    def stream_parallelism_directories(cls, filepath: str, **kwargs) -> Iterator[tuple[str, ParallelismDirectory]]:
+        for document_name, parallelism_ids, branch_ids in cls._stream_arrays(filepath, **kwargs):
+            parallelism_directory: ParallelismDirectory = {}
+            for stratum_parallelism_ids, stratum_branch_ids in zip(parallelism_ids, branch_ids):
+                cls._handle_stratum_array(parallelism_directory, stratum_parallelism_ids, stratum_branch_ids)
+            yield document_name, parallelism_directory
+
+    @classmethod
+    def _read_file(cls, filepath: str, **kwargs) -> list[TokenIdentifiers]:
+        documents: list[tuple[str, list[TokenIdentifiers]]] = list(cls._stream_documents(filepath, **kwargs))
+        if len(documents) != 1:
+            raise ValueError(f"The file <{filepath}> contains {len(documents)} documents, but one was expected.")
+
+        _, stratum_rows = documents[0]
+        return stratum_rows
+
+    @classmethod
+    def _stream_documents(cls, filepath: str, **kwargs) -> Iterator[tuple[str, list[TokenIdentifiers]]]:
+        for document_name, parallelism_ids, branch_ids in cls._stream_arrays(filepath, **kwargs):
+            stratum_rows: list[TokenIdentifiers] = [
+                list(zip(stratum_parallelism_ids.tolist(), stratum_branch_ids.tolist()))
+                for stratum_parallelism_ids, stratum_branch_ids in zip(parallelism_ids, branch_ids)
+            ]
+            yield document_name, stratum_rows
+
+    @classmethod
+    def _stream_arrays(cls, filepath: str, **kwargs) -> Iterator[tuple[str, NDArray[int], NDArray[int]]]:
+        """
+        Yields each document of a bundle as a pair of two-dimensional views into the bundle's ID columns.
+        :param filepath: the path to an `.npz` bundle.
+        :param kwargs: a collection of keyword arguments meant to modify the reading of documents.
+        If a *stratum_count* is supplied, only that many strata (counting from the first) are yielded.
+        :return: an iterator over 3-tuples containing a `str` name for each document,
+        its `parallelism_ids` of shape `(stratum_count, document_length)`, and its `branch_ids` of the same shape.
+        """
+        member_names: tuple[str, ...] = ("parallelism_ids", "branch_ids", "document_offsets", "document_names")
+        if detect_compression(filepath) is not None:
+            # A compressed bundle cannot be memory-mapped, so it is decompressed into memory and read from there.
+            with open_input(filepath) as input_file:
+                bundle_buffer: BytesIO = BytesIO(input_file.read())
+            with npy_load(bundle_buffer, allow_pickle=False) as bundle:
+                members: list[NDArray] = [bundle[member_name] for member_name in member_names]
+        else:
+            members = [cls._map_member(filepath, member_name) for member_name in member_names]
+        parallelism_ids, branch_ids, document_offsets, document_names = members
+
+        if parallelism_ids.shape != branch_ids.shape or parallelism_ids.ndim != 2:
+            raise ValueError(f"The ID columns of <{filepath}> must be two-dimensional and share the same shape.")
+        elif len(document_offsets) != len(document_names) + 1:
+            raise ValueError(f"The file <{filepath}> must contain exactly one more document offset than document name.")
+
+        stratum_count: int = parallelism_ids.shape[0] if kwargs.get("stratum_count", None) is None \
+            else kwargs["stratum_count"]
+        if stratum_count > parallelism_ids.shape[0]:
+            raise ValueError(f"The file <{filepath}> contains {parallelism_ids.shape[0]} strata, "
+                             f"but {stratum_count} strata were requested.")
+
+        for document_index, document_name in enumerate(document_names.tolist()):
+            document_start, document_end = document_offsets[document_index:document_index + 2].tolist()
+            yield document_name, \
+                parallelism_ids[:stratum_count, document_start:document_end], \
+                branch_ids[:stratum_count, document_start:document_end]
+
+    @classmethod
+    def _map_member(cls, filepath: str, member_name: str) -> NDArray:
+        """
+        Accesses one array of an `.npz` bundle without copying it into memory, if possible.
+        Arrays stored without compression are memory-mapped directly from the archive;
+        compressed arrays, as well as arrays whose headers NumPy only parses internally (format version 3.0 and later),
+        are read in full.
+        :param filepath: the path to an `.npz` bundle.
+        :param member_name: the name of the array to access.
+        :return: an `NDArray` (or a read-only `memmap`) containing the requested array.
+        """
+        with ZipFile(filepath, mode="r") as archive:
+            member_info: ZipInfo = archive.getinfo(f"{member_name}.npy")
+            if member_info.compress_type != ZIP_STORED:
+                return cls._read_member(archive, member_info)
+
+        with open(filepath, mode="rb") as input_file:
+            # The local file header is 30 bytes, followed by a variable-length filename and extra field.
+            input_file.seek(member_info.header_offset)
+            local_header: bytes = input_file.read(30)
+            filename_length, extra_length = unpack("<HH", local_header[26:30])
+            input_file.seek(member_info.header_offset + 30 + filename_length + extra_length)
+
+            major_version, _ = npy_format.read_magic(input_file)
+            if major_version == 1:
+                shape, is_fortran_order, dtype = npy_format.read_array_header_1_0(input_file)
+            elif major_version == 2:
+                shape, is_fortran_order, dtype = npy_format.read_array_header_2_0(input_file)
+            else:
+                with ZipFile(filepath, mode="r") as archive:
+                    return cls._read_member(archive, member_info)
+            data_offset: int = input_file.tell()
+
+        if dtype.hasobject is True:
+            raise ValueError(f"The array <{member_name}> in <{filepath}> holds Python objects, "
+                             "which are not supported.")
+        elif prod(shape) == 0:
+            return empty(shape, dtype=dtype)
+
+        member_array: NDArray = memmap(filepath, dtype=dtype, mode="r", offset=data_offset, shape=shape,
+                                       order="F" if is_fortran_order is True else "C")
+        return member_array
+
+    @staticmethod
+    def _read_member(archive: ZipFile, member_info: ZipInfo) -> NDArray:
+        with archive.open(member_info, mode="r") as member_file:
+            return npy_format.read_array(member_file, allow_pickle=False)
+
+    @staticmethod
+    def write_bundle(output_filepath: str, input_filepaths: Iterable[str],
+                     input_loader: Type[BaseParallelismLoader], **kwargs):
+        """
+        Transcodes the documents of one or more files into a single `.npz` bundle readable by `NPZLoader`.
+        :param output_filepath: the path at which the bundle will be written.
+        :param input_filepaths: the paths of the files to be transcoded; every document of each file is included,
+        in order of appearance.
+        :param input_loader: the loader class used to read each file in *input_filepaths*.
+        :param kwargs: a collection of keyword arguments meant to modify the reading of documents.
+        """
+        document_names: list[str] = []
+        document_lengths: list[int] = []
+        document_columns: list[NDArray[int]] = []
+        stratum_count: Optional[int] = kwargs.get("stratum_count", None)
+        for input_filepath in input_filepaths:
+            for document_name, stratum_rows in input_loader._stream_documents(input_filepath, **kwargs):
+                if stratum_count is None:
+                    stratum_count = len(stratum_rows)
+                elif len(stratum_rows) != stratum_count:
+                    raise ValueError(f"The document <{document_name}> contains {len(stratum_rows)} strata, "
+                                     f"but {stratum_count} strata were expected.")
+
+                document_length: int = len(stratum_rows[0]) if len(stratum_rows) > 0 else 0
+                stratum_columns: NDArray[int] = \
+                    asarray(stratum_rows, dtype=int64).reshape((len(stratum_rows), document_length, 2))
+                document_names.append(document_name)
+                document_lengths.append(stratum_columns.shape[1])
+                document_columns.append(stratum_columns)
+
+        stratum_count = 0 if stratum_count is None else stratum_count
+        corpus_columns: NDArray[int] = concatenate(document_columns, axis=1) if len(document_columns) > 0 \
+            else empty((stratum_count, 0, 2), dtype=int64)
+        document_offsets: NDArray[int] = concatenate(([0], cumsum(document_lengths, dtype=int64)))
+
+        savez(
+            output_filepath,
+            parallelism_ids=ascontiguousarray(corpus_columns[:, :, 0]),
+            branch_ids=ascontiguousarray(corpus_columns[:, :, 1]),
+            document_offsets=document_offsets,
+            document_names=array(document_names, dtype=str)
+        )
+
+
+class ArrayLoader(BaseParallelismLoader):
+    """
+    .. py:class:: ArrayLoader
+    Subclass of `BaseParallelismLoader` which loads token labels that are already held in memory,
+    such as the predictions of a tagger, rather than labels stored in a file.
+    A document's labels are given as an integer array of shape `(tokens, strata, 2)` (or `(tokens, 2)` for
+    a single stratum), where the last axis holds each token's `parallelism_id` (with `-1` indicating no parallelism)
+    and `branch_id`. Any NumPy array or object supporting the array or buffer protocols may be given;
+    it is viewed rather than copied, and branches are derived from it with array operations.
+    A batch of documents is given as an array of shape `(documents, tokens, strata, 2)`
+    (or `(documents, tokens, 2)`), padded to a common number of tokens, along with the length of each document.
+    """
+    @classmethod
+    def load_parallelism_directory(cls, labels: ArrayLike, **kwargs) -> ParallelismDirectory:
+        """
+        :param labels: the token labels of one document, of shape `(tokens, strata, 2)` or `(tokens, 2)`.
+        :param kwargs: a collection of keyword arguments meant to modify the creation of a `ParallelismDirectory`.
+        If a *stratum_count* is supplied, only that many strata (counting from the first) are used.
+        :return: a `ParallelismDirectory` derived from the provided labels.
+        """
+        label_array: NDArray[int] = cls._view_labels(labels, is_batched=False)
+        parallelism_directories: list[ParallelismDirectory] = \
+            cls.load_parallelism_directories(label_array[None, ...], **kwargs)
+        return parallelism_directories[0]
+
+    @classmethod
+    def load_parallelism_directories(cls, labels: ArrayLike, lengths: Optional[ArrayLike] = None,
+                                     **kwargs) -> list[ParallelismDirectory]:
+        """
+        Loads a whole batch of documents at once; runs of tokens are located across the batch with array operations.
+        :param labels: the padded token labels of a batch of documents,
+        of shape `(documents, tokens, strata, 2)` or `(documents, tokens, 2)`.
+        :param lengths: the number of tokens in each document; tokens past the end of a document are ignored.
+        If it is not given, every document spans all of its tokens, so padding must be labeled with `-1`.
+        :param kwargs: a collection of keyword arguments meant to modify the creation of each `ParallelismDirectory`.
+        If a *stratum_count* is supplied, only that many strata (counting from the first) are used.
+        :return: a `list` containing a `ParallelismDirectory` for each document, in order.
+        """
+        label_array: NDArray[int] = cls._view_labels(labels, is_batched=True)
+        document_count, token_count, stratum_count, _ = label_array.shape
+        if lengths is not None:
+            lengths = asarray(lengths)
+            if lengths.shape != (document_count,):
+                raise ValueError(f"{document_count} documents were given, but the lengths have shape {lengths.shape}.")
+            elif (lengths < 0).any() or (lengths > token_count).any():
+                raise ValueError(f"Every document length must be between 0 and the padded length, {token_count}.")
+
+        if kwargs.get("stratum_count", None) is not None:
+            if kwargs["stratum_count"] > stratum_count:
+                raise ValueError(f"The labels contain {stratum_count} strata, "
+                                 f"but {kwargs['stratum_count']} strata were requested.")
+            stratum_count = kwargs["stratum_count"]
+
+        parallelism_directories: list[ParallelismDirectory] = [{} for _ in range(0, document_count)]
+        for stratum_index in range(0, stratum_count):
+            cls._handle_stratum_batch(
+                parallelism_directories, label_array[:, :, stratum_index, 0], label_array[:, :, stratum_index, 1],
+                lengths
+            )
+        return parallelism_directories
+
+    @classmethod
+    def stream_parallelism_directories(cls, labels: ArrayLike, lengths: Optional[ArrayLike] = None,
+                                       **kwargs) -> Iterator[tuple[str, ParallelismDirectory]]:
+        """
+        Loads a batch of documents as `load_parallelism_directories` does,
+        naming each document by its position in the batch.
+        """
+        for document_index, parallelism_directory in \
+                enumerate(cls.load_parallelism_directories(labels, lengths, **kwargs)):
+            yield str(document_index), parallelism_directory
+
+    @classmethod
+    def _read_file(cls, labels: ArrayLike, **kwargs) -> list[TokenIdentifiers]:
+        label_array: NDArray[int] = cls._view_labels(labels, is_batched=False)
+        stratum_count: int = label_array.shape[1] if kwargs.get("stratum_count", None) is None \
+            else kwargs["stratum_count"]
+        stratum_rows: list[TokenIdentifiers] = [
+            list(zip(label_array[:, stratum_index, 0].tolist(), label_array[:, stratum_index, 1].tolist()))
+            for stratum_index in range(0, stratum_count)
+        ]
+        return stratum_rows
+
+    @staticmethod
+    def _view_labels(labels: ArrayLike, is_batched: bool) -> NDArray[int]:
+        """
+        Views token labels as an integer array with an explicit stratum axis, without copying them.
+        :param labels: the token labels of one document or of a batch of documents.
+        :param is_batched: a `bool` indicating whether *labels* holds a batch of documents.
+        :return: an `NDArray` of shape `(tokens, strata, 2)` or, if batched, `(documents, tokens, strata, 2)`.
+        """
+        label_array: NDArray[int] = asarray(labels)
+        base_dimension: int = 3 if is_batched is True else 2
+        if label_array.ndim == base_dimension:
+            label_array = label_array[..., None, :]
+
+        if label_array.ndim != base_dimension + 1 or label_array.shape[-1] != 2:
+            expected_shape: str = "(documents, tokens, strata, 2) or (documents, tokens, 2)" if is_batched is True \
+                else "(tokens, strata, 2) or (tokens, 2)"
+            raise ValueError(f"The labels have shape <{label_array.shape}>, but a shape of {expected_shape} "
+                             f"is required.")
+        elif label_array.dtype.kind not in ("i", "u"):
+            raise ValueError(f"The labels have dtype <{label_array.dtype}>, but an integer dtype is required.")
+        return label_array
@@ -2,7 +2,8 @@ from enum import StrEnum
 from typing import Type
 
 from .base import BaseParallelismLoader
-from .instantiations import TSVLoader, XMLLoader
+from .instantiations import NPZLoader, TSVLoader, XMLLoader
+from ..plugins import load_plugin, PluginGroup
 
 
 class DefinedLoader(StrEnum):
@@ -12,11 +13,13 @@ class DefinedLoader(StrEnum):
     """
     TSV: str = "tsv"
     XML: str = "xml"
+    NPZ: str = "npz"
 
 
 LOADER_TABLE: dict[str, Type[BaseParallelismLoader]] = {
     DefinedLoader.TSV: TSVLoader,
-    DefinedLoader.XML: XMLLoader
+    DefinedLoader.XML: XMLLoader,
+    DefinedLoader.NPZ: NPZLoader
 }
 
 
@@ -24,5 +27,9 @@ def get_loader(loader_name: str) -> Type[BaseParallelismLoader]:
     try:
         loader: Type[BaseParallelismLoader] = LOADER_TABLE[loader_name]
     except KeyError:
-        raise ValueError(f"The loader <{loader_name}> is not recognized.")
+        loader = load_plugin(PluginGroup.LOADERS, loader_name)
+        if loader is None:
+            raise ValueError(f"The loader <{loader_name}> is not recognized.")
+        elif not (isinstance(loader, type) and issubclass(loader, BaseParallelismLoader)):
+            raise TypeError(f"The loader plugin <{loader_name}> is not a subclass of BaseParallelismLoader.")
     return loader
@@ -0,0 +1,32 @@
+from enum import StrEnum
+from importlib.metadata import entry_points
+from typing import Any, Optional
+
+
+class PluginGroup(StrEnum):
+    """
+    .. py:class:: PluginGroup
+    Enumeration class for the entry point groups through which other packages can add to this package's tables.
+    A package registers a plugin by declaring an entry point in one of these groups; the entry point's name
+    becomes the name by which the plugin is selected, just as with the predefined options. For example::
+
+        [project.entry-points."pyrallelism.metrics"]
+        my-metric = "my_package.metrics:MY_METRIC"
+    """
+    METRICS: str = "pyrallelism.metrics"
+    LOADERS: str = "pyrallelism.loaders"
+    OUTPUT_FORMATS: str = "pyrallelism.output_formats"
+
+
+def load_plugin(group: str, name: str) -> Optional[Any]:
+    """
+    Finds and loads a plugin by name from the installed packages. Only the named entry point is loaded,
+    so faulty plugins which are not selected cannot interfere.
+    :param group: the `PluginGroup` in which the plugin is sought.
+    :param name: the name under which the plugin was registered.
+    :return: the object referred to by the entry point, or `None` if no such entry point exists.
+    """
+    for entry_point in entry_points(group=group, name=name):
+        return entry_point.load()
+    return None
+
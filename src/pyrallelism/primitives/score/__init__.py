@@ -1,3 +1,4 @@
 from .base import ScoringFunction
 from .instantiations import ExactScorer, MaximumParallelBranchScorer, \
     MaximumBranchAwareWordOverlapScorer, MaximumWordOverlapScorer
+from .memoization import DEFAULT_CACHE_SIZE, memoize_scoring_function
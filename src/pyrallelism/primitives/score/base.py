@@ -1,7 +1,9 @@
 from abc import abstractmethod
+from typing import Any, Union
 
-from numpy import int64, zeros
+from numpy import argsort, array, full, int64, searchsorted, zeros
 from numpy.typing import NDArray
+from scipy.sparse import csr_array, issparse, sparray
 
 from ..typing import Parallelism, ParallelismDirectory
 
@@ -10,7 +12,15 @@ class ScoringFunction:
     """
     .. py:class:: ScoringFunction
     Base class for scoring the similarity between two `Parallelism` (or converted parallelism) objects.
+    A subclass is `translation_invariant` if shifting both parallelisms by the same number of tokens
+    never changes their score; this allows memoized scores to be reused across positions.
+
+    Subclasses may also implement a batch protocol, which is preferred (when implemented) over scoring each pair:
+    `prepare_directory` converts a whole `ParallelismDirectory` into any convenient form at once,
+    and `score_matrix` scores every pair of two prepared directories together, such as with array operations.
     """
+    translation_invariant: bool = False
+
     @classmethod
     def create_score_matrix(cls, hypotheses: ParallelismDirectory, references: ParallelismDirectory, **kwargs) -> \
             NDArray[int]:
@@ -25,12 +35,120 @@ class ScoringFunction:
         """
         matrix_size: int = max(len(hypotheses), len(references))
         score_matrix: NDArray[int] = zeros((matrix_size, matrix_size), dtype=int64)
-        for hypothesis_index, (hypothesis) in enumerate(hypotheses.values()):
-            for reference_index, (reference) in enumerate(references.values()):
-                score_matrix[hypothesis_index, reference_index] = cls.score_pair(hypothesis, reference, **kwargs)
+        if cls.has_batch_scoring() is True:
+            batch_scores: Union[NDArray[int], sparray] = cls._score_directories(hypotheses, references, **kwargs)
+            score_matrix[:len(hypotheses), :len(references)] = \
+                batch_scores.toarray() if issparse(batch_scores) else batch_scores
+        else:
+            for hypothesis_index, (hypothesis) in enumerate(hypotheses.values()):
+                for reference_index, (reference) in enumerate(references.values()):
+                    score_matrix[hypothesis_index, reference_index] = cls.score_pair(hypothesis, reference, **kwargs)
 
         return score_matrix
 
+    @classmethod
+    def create_sparse_score_matrix(cls, hypotheses: ParallelismDirectory, references: ParallelismDirectory,
+                                   **kwargs) -> csr_array:
+        """
+        Computes a two-dimensional sparse array containing the nonzero scores for pairs of
+        hypothesis and reference parallelisms. Only pairs whose token spans overlap are scored; all other pairs
+        are assumed to score zero, which holds for every predefined metric. Candidate pairs are found by sorting
+        references by their first token, so sparse inputs are scored in far less than quadratic time and memory.
+        Subclasses whose scores can be nonzero for disjoint parallelisms should override this method.
+        If the batch protocol is implemented, it is used instead, and its result is stored sparsely.
+        :param hypotheses: a collection of `Parallelism` objects; represents a set of guesses from a model.
+        :param references: a collection of `Parallelism` objects; represents a set of ground truth values.
+        :param kwargs: a collection of keyword arguments meant to modify the scoring of parallelism pairs.
+        :return: a two-dimensional sparse array of shape `(len(hypotheses), len(references))` containing
+        `int` scores for all pairs of hypothesis and reference parallelisms with overlapping spans.
+        """
+        if cls.has_batch_scoring() is True:
+            return csr_array(cls._score_directories(hypotheses, references, **kwargs), dtype=int64)
+
+        hypothesis_list: list[Parallelism] = list(hypotheses.values())
+        reference_list: list[Parallelism] = list(references.values())
+        hypothesis_starts, hypothesis_ends = cls._get_spans(hypothesis_list)
+        reference_starts, reference_ends = cls._get_spans(reference_list)
+
+        reference_order: NDArray[int] = argsort(reference_starts, kind="stable")
+        sorted_reference_starts: NDArray[int] = reference_starts[reference_order]
+        sorted_reference_ends: NDArray[int] = reference_ends[reference_order]
+
+        rows: list[int] = []
+        columns: list[int] = []
+        scores: list[int] = []
+        for hypothesis_index, hypothesis in enumerate(hypothesis_list):
+            preceding_count: int = int(searchsorted(sorted_reference_starts, hypothesis_ends[hypothesis_index]))
+            candidate_mask: NDArray[bool] = \
+                sorted_reference_ends[:preceding_count] > hypothesis_starts[hypothesis_index]
+            for reference_index in reference_order[:preceding_count][candidate_mask].tolist():
+                pair_score: int = cls.score_pair(hypothesis, reference_list[reference_index], **kwargs)
+                if pair_score != 0:
+                    rows.append(hypothesis_index)
+                    columns.append(reference_index)
+                    scores.append(pair_score)
+
+        score_matrix: csr_array = csr_array(
+            (array(scores, dtype=int64), (array(rows, dtype=int64), array(columns, dtype=int64))),
+            shape=(len(hypothesis_list), len(reference_list))
+        )
+        return score_matrix
+
+    @classmethod
+    def prepare_directory(cls, directory: ParallelismDirectory, **kwargs) -> Any:
+        """
+        Converts a `ParallelismDirectory` into the form expected by `score_matrix`.
+        By default, this is a `list` of its parallelisms, in the directory's order.
+        :param directory: a `ParallelismDirectory` to be prepared for batch scoring.
+        :param kwargs: a collection of keyword arguments meant to modify the scoring of parallelism pairs.
+        :return: the prepared form of *directory*, whose entries must follow the directory's order.
+        """
+        return list(directory.values())
+
+    @classmethod
+    def score_matrix(cls, prepared_hypotheses: Any, prepared_references: Any, **kwargs) -> \
+            Union[NDArray[int], sparray]:
+        """
+        Optionally computes the scores for all pairs of hypothesis and reference parallelisms at once.
+        Subclasses which implement this method are scored with it rather than with `score_pair`.
+        :param prepared_hypotheses: a collection of hypotheses, as returned by `prepare_directory`.
+        :param prepared_references: a collection of references, as returned by `prepare_directory`.
+        :param kwargs: a collection of keyword arguments meant to modify the scoring of parallelism pairs.
+        :return: a two-dimensional `NDArray` or sparse array of shape `(hypothesis count, reference count)`
+        containing the `int` score of each pair.
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def has_batch_scoring(cls) -> bool:
+        """
+        :return: a `bool` indicating whether the current class implements `score_matrix`.
+        """
+        return cls.score_matrix.__func__ is not ScoringFunction.score_matrix.__func__
+
+    @classmethod
+    def _score_directories(cls, hypotheses: ParallelismDirectory, references: ParallelismDirectory, **kwargs) -> \
+            Union[NDArray[int], sparray]:
+        prepared_hypotheses: Any = cls.prepare_directory(hypotheses, **kwargs)
+        prepared_references: Any = cls.prepare_directory(references, **kwargs)
+        return cls.score_matrix(prepared_hypotheses, prepared_references, **kwargs)
+
+    @staticmethod
+    def _get_spans(parallelisms: list[Parallelism]) -> tuple[NDArray[int], NDArray[int]]:
+        """
+        Computes the span of each parallelism: the index of its first token and the index after its last token.
+        Empty parallelisms receive an empty span, so they are never considered to overlap anything.
+        :param parallelisms: a `list` of `Parallelism` objects.
+        :return: a 2-tuple of `NDArray` objects containing the start and end of each parallelism's span.
+        """
+        span_starts: NDArray[int] = full(len(parallelisms), 0, dtype=int64)
+        span_ends: NDArray[int] = full(len(parallelisms), 0, dtype=int64)
+        for parallelism_index, parallelism in enumerate(parallelisms):
+            if len(parallelism) > 0:
+                span_starts[parallelism_index] = min(branch_start for branch_start, _ in parallelism)
+                span_ends[parallelism_index] = max(branch_end for _, branch_end in parallelism)
+        return span_starts, span_ends
+
     @classmethod
     @abstractmethod
     def score_pair(cls, hypothesis: Parallelism, reference: Parallelism, **kwargs) -> int:
@@ -1,10 +1,11 @@
-from numpy import int64, zeros
+from numpy import int64, ones, zeros
 from numpy.typing import NDArray
+from scipy.sparse import csr_array
 
 from ..assignment.lsa import LinearSumAssigner
 from .base import ScoringFunction
-from ..typing import BranchedWordSet, Parallelism
-from ..conversion.instantiations import BranchedWordConverter
+from ..typing import Branch, BranchedWordSet, Parallelism, ParallelismDirectory
+from ..conversion.instantiations import BranchedWordConverter, TokenIncidenceConverter
 
 
 class ExactScorer(ScoringFunction):
@@ -13,11 +14,33 @@ class ExactScorer(ScoringFunction):
     Subclass of `ScoringFunction` which gives a score of `1` if two `Parallelism` objects are equal;
     otherwise, it gives a score of `0`.
     """
+    translation_invariant: bool = True
+
     @classmethod
     def score_pair(cls, hypothesis: Parallelism, reference: Parallelism, **kwargs) -> int:
         score: int = 1 if hypothesis == reference else 0
         return score
 
+    @classmethod
+    def score_matrix(cls, prepared_hypotheses: list[Parallelism], prepared_references: list[Parallelism],
+                     **kwargs) -> csr_array:
+        # Equal parallelisms are found by hashing, so no pair of unequal parallelisms is ever compared.
+        reference_indices: dict[frozenset[Branch], list[int]] = {}
+        for reference_index, reference in enumerate(prepared_references):
+            reference_indices.setdefault(frozenset(reference), []).append(reference_index)
+
+        rows: list[int] = []
+        columns: list[int] = []
+        for hypothesis_index, hypothesis in enumerate(prepared_hypotheses):
+            for reference_index in reference_indices.get(frozenset(hypothesis), ()):
+                rows.append(hypothesis_index)
+                columns.append(reference_index)
+
+        score_matrix: csr_array = csr_array(
+            (ones(len(rows), dtype=int64), (rows, columns)), shape=(len(prepared_hypotheses), len(prepared_references))
+        )
+        return score_matrix
+
 
 class MaximumParallelBranchScorer(ScoringFunction):
     """
@@ -27,12 +50,43 @@ class MaximumParallelBranchScorer(ScoringFunction):
     the maximal score for this function is `min(len(hypothesis), len(reference))`,
     where the `hypothesis` and `reference` are `Parallelism` objects.
     """
+    translation_invariant: bool = True
+
     @classmethod
     def score_pair(cls, hypothesis: Parallelism, reference: Parallelism, **kwargs) -> int:
         branch_intersection: set[tuple[int, int]] = hypothesis.intersection(reference)
         score: int = len(branch_intersection) if len(branch_intersection) > 1 else 0
         return score
 
+    @classmethod
+    def score_matrix(cls, prepared_hypotheses: list[Parallelism], prepared_references: list[Parallelism],
+                     **kwargs) -> csr_array:
+        # Each distinct branch receives a column; the product of the two incidence matrices counts shared branches.
+        branch_columns: dict[Branch, int] = {}
+        hypothesis_entries: tuple[list[int], list[int]] = cls._get_branch_entries(prepared_hypotheses, branch_columns)
+        reference_entries: tuple[list[int], list[int]] = cls._get_branch_entries(prepared_references, branch_columns)
+
+        incidence_matrices: list[csr_array] = [
+            csr_array((ones(len(rows), dtype=int64), (rows, columns)), shape=(len(parallelisms), len(branch_columns)))
+            for parallelisms, (rows, columns) in
+            ((prepared_hypotheses, hypothesis_entries), (prepared_references, reference_entries))
+        ]
+        score_matrix: csr_array = csr_array(incidence_matrices[0] @ incidence_matrices[1].T)
+        score_matrix.data[score_matrix.data <= 1] = 0
+        score_matrix.eliminate_zeros()
+        return score_matrix
+
+    @staticmethod
+    def _get_branch_entries(parallelisms: list[Parallelism], branch_columns: dict[Branch, int]) -> \
+            tuple[list[int], list[int]]:
+        rows: list[int] = []
+        columns: list[int] = []
+        for row_index, parallelism in enumerate(parallelisms):
+            for branch in parallelism:
+                rows.append(row_index)
+                columns.append(branch_columns.setdefault(branch, len(branch_columns)))
+        return rows, columns
+
 
 class MaximumBranchAwareWordOverlapScorer(ScoringFunction, LinearSumAssigner):
     """
@@ -51,6 +105,8 @@ class MaximumBranchAwareWordOverlapScorer(ScoringFunction, LinearSumAssigner):
     as a match with a score of `1` is only possible if one (and only one) pair of branches match;
     this would be zeroed out in accordance with the aforementioned second condition.
     """
+    translation_invariant: bool = True
+
     @classmethod
     def score_pair(cls, hypothesis: Parallelism, reference: Parallelism, **kwargs) -> int:
         converted_hypothesis: BranchedWordSet = BranchedWordConverter.convert_parallelism(hypothesis)
@@ -87,6 +143,8 @@ class MaximumWordOverlapScorer(ScoringFunction):
     The maximum possible score is the minimum number of words present out of
     the `hypothesis` and `reference` parallelisms.
     """
+    translation_invariant: bool = True
+
     @classmethod
     def score_pair(cls, hypothesis: Parallelism, reference: Parallelism, **kwargs) -> int:
         converted_hypothesis: BranchedWordSet = BranchedWordConverter.convert_parallelism(hypothesis)
@@ -96,3 +154,18 @@ class MaximumWordOverlapScorer(ScoringFunction):
         word_overlap_set: set[int] = hypothesis_set.intersection(reference_set)
         score: int = len(word_overlap_set)
         return score
+
+    @classmethod
+    def prepare_directory(cls, directory: ParallelismDirectory, **kwargs) -> csr_array:
+        return TokenIncidenceConverter.convert_directory(directory)
+
+    @classmethod
+    def score_matrix(cls, prepared_hypotheses: csr_array, prepared_references: csr_array, **kwargs) -> csr_array:
+        # The product of two token incidence matrices counts the tokens shared by each pair of parallelisms.
+        token_count: int = max(prepared_hypotheses.shape[1], prepared_references.shape[1])
+        hypothesis_incidence, reference_incidence = [
+            csr_array((incidence.data, incidence.indices, incidence.indptr), shape=(incidence.shape[0], token_count))
+            for incidence in (prepared_hypotheses, prepared_references)
+        ]
+        score_matrix: csr_array = csr_array(hypothesis_incidence @ reference_incidence.T)
+        return score_matrix
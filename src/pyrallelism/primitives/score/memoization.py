@@ -0,0 +1,105 @@
+from functools import lru_cache
+from typing import Any, Hashable, Type
+
+from numpy.typing import NDArray
+from scipy.sparse import csr_array
+
+from .base import ScoringFunction
+from ..interning import get_canonical_form, ParallelismInterner
+from ..typing import Parallelism, ParallelismDirectory
+
+DEFAULT_CACHE_SIZE: int = 2 ** 16
+
+
+def memoize_scoring_function(scoring_function: Type[ScoringFunction], cache_size: int = DEFAULT_CACHE_SIZE) -> \
+        Type[ScoringFunction]:
+    """
+    Creates a subclass of a `ScoringFunction` which remembers the scores of recently scored pairs of parallelisms
+    in a least-recently-used cache of bounded size. Pairs are looked up by a canonical key:
+    if the scoring function is `translation_invariant`, the key consists of the shapes of both parallelisms and
+    the distance between them, so that a pair recurring at another position in the same or another document
+    reuses its score; otherwise, the key consists of both parallelisms as `frozenset` objects.
+    Since the batch protocol never calls `score_pair`, the returned class always scores pair by pair,
+    even if *scoring_function* implements `score_matrix`.
+    The returned class holds one `ParallelismInterner`, shared by every score matrix it creates:
+    the parallelisms of both directories are interned into it, so that each distinct parallelism is canonicalized
+    (and used as a cache key) as a single object. Like the caches, it is bounded by *cache_size*;
+    once it holds more distinct parallelisms than that, it is emptied before it is used again.
+    Scores computed with keyword arguments are cached separately for each set of arguments,
+    and they are not cached at all if those arguments cannot be hashed.
+    The cache belongs to the returned class, so it is shared by every evaluation in the process which uses it.
+    :param scoring_function: the `ScoringFunction` class whose scores are to be memoized.
+    :param cache_size: the largest number of pairs (and of canonical forms) to be remembered.
+    :return: a subclass of *scoring_function* which produces the same scores.
+    Its `cache_info` and `cache_clear` functions report on and reset its cache (and its interner),
+    and its `intern_directory` function interns a directory with its shared interner.
+    """
+    if cache_size <= 0:
+        raise ValueError(f"The given cache size, <{cache_size}>, is not positive.")
+
+    get_cached_canonical_form = lru_cache(maxsize=cache_size)(get_canonical_form)
+
+    @lru_cache(maxsize=cache_size)
+    def score_canonical_pair(hypothesis_key: Hashable, reference_key: Hashable, offset: int,
+                             kwargs_key: tuple[tuple[str, Any], ...]) -> int:
+        # Only a translation-invariant score can be computed on a shifted pair; otherwise, the offset is always zero.
+        shifted_reference: Parallelism = \
+            {(branch_start + offset, branch_end + offset) for branch_start, branch_end in reference_key}
+        return scoring_function.score_pair(hypothesis_key, shifted_reference, **dict(kwargs_key))
+
+    class MemoizedScoringFunction(scoring_function):
+        memoized_function: Type[ScoringFunction] = scoring_function
+        interner: ParallelismInterner = ParallelismInterner()
+        cache_info = staticmethod(score_canonical_pair.cache_info)
+
+        @classmethod
+        def cache_clear(cls):
+            score_canonical_pair.cache_clear()
+            get_cached_canonical_form.cache_clear()
+            cls.interner.clear()
+
+        @classmethod
+        def intern_directory(cls, directory: ParallelismDirectory) -> ParallelismDirectory:
+            if len(cls.interner) > cache_size:
+                cls.interner.clear()
+            return cls.interner.intern_directory(directory)
+
+        @classmethod
+        def has_batch_scoring(cls) -> bool:
+            return False
+
+        @classmethod
+        def create_score_matrix(cls, hypotheses: ParallelismDirectory, references: ParallelismDirectory,
+                                **kwargs) -> NDArray[int]:
+            return super().create_score_matrix(
+                cls.intern_directory(hypotheses), cls.intern_directory(references), **kwargs
+            )
+
+        @classmethod
+        def create_sparse_score_matrix(cls, hypotheses: ParallelismDirectory, references: ParallelismDirectory,
+                                       **kwargs) -> csr_array:
+            return super().create_sparse_score_matrix(
+                cls.intern_directory(hypotheses), cls.intern_directory(references), **kwargs
+            )
+
+        @classmethod
+        def score_pair(cls, hypothesis: Parallelism, reference: Parallelism, **kwargs) -> int:
+            kwargs_key: tuple[tuple[str, Any], ...] = tuple(sorted(kwargs.items()))
+            try:
+                hash(kwargs_key)
+            except TypeError:
+                return scoring_function.score_pair(hypothesis, reference, **kwargs)
+
+            if scoring_function.translation_invariant is True:
+                hypothesis_offset, hypothesis_shape = get_cached_canonical_form(frozenset(hypothesis))
+                reference_offset, reference_shape = get_cached_canonical_form(frozenset(reference))
+                pair_score: int = score_canonical_pair(
+                    hypothesis_shape, reference_shape, reference_offset - hypothesis_offset, kwargs_key
+                )
+            else:
+                pair_score = score_canonical_pair(frozenset(hypothesis), frozenset(reference), 0, kwargs_key)
+            return pair_score
+
+    MemoizedScoringFunction.__name__ = f"Memoized{scoring_function.__name__}"
+    MemoizedScoringFunction.__qualname__ = MemoizedScoringFunction.__name__
+    return MemoizedScoringFunction
@@ -1,4 +1,5 @@
 from abc import abstractmethod
+from typing import Any
 
 from ..typing import Parallelism, ParallelismDirectory
 
@@ -7,6 +8,9 @@ class SizeFunction:
     """
     .. py:class:: SizeFunction
     Base class for determining the size of `Parallelism` (or converted parallelism) objects.
+    As with `ScoringFunction`, subclasses may implement a batch protocol, which is preferred when implemented:
+    `prepare_directory` converts a whole `ParallelismDirectory` at once, and
+    `size_directory` computes the total size of a prepared directory.
     """
     @classmethod
     def compute_directory_size(cls, directory: ParallelismDirectory, **kwargs) -> int:
@@ -16,11 +20,43 @@ class SizeFunction:
         :param kwargs: a collection of keyword arguments meant to modify the size calculations for parallelisms.
         :return: a nonnegative `int` representing the overall size of all objects in *directory*.
         """
+        if cls.has_batch_sizing() is True:
+            return cls.size_directory(cls.prepare_directory(directory, **kwargs), **kwargs)
+
         parallelism_sizes: list[int] = \
             [cls.size_parallelism(parallelism, **kwargs) for parallelism in directory.values()]
         directory_size: int = sum(parallelism_sizes)
         return directory_size
 
+    @classmethod
+    def prepare_directory(cls, directory: ParallelismDirectory, **kwargs) -> Any:
+        """
+        Converts a `ParallelismDirectory` into the form expected by `size_directory`.
+        By default, this is a `list` of its parallelisms.
+        :param directory: a `ParallelismDirectory` to be prepared for batch sizing.
+        :param kwargs: a collection of keyword arguments meant to modify the size calculations for parallelisms.
+        :return: the prepared form of *directory*.
+        """
+        return list(directory.values())
+
+    @classmethod
+    def size_directory(cls, prepared_directory: Any, **kwargs) -> int:
+        """
+        Optionally computes the overall size of all parallelisms in a prepared directory at once.
+        Subclasses which implement this method are sized with it rather than with `size_parallelism`.
+        :param prepared_directory: a collection of parallelisms, as returned by `prepare_directory`.
+        :param kwargs: a collection of keyword arguments meant to modify the size calculations for parallelisms.
+        :return: a nonnegative `int` representing the overall size of all parallelisms in *prepared_directory*.
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def has_batch_sizing(cls) -> bool:
+        """
+        :return: a `bool` indicating whether the current class implements `size_directory`.
+        """
+        return cls.size_directory.__func__ is not SizeFunction.size_directory.__func__
+
     @classmethod
     @abstractmethod
     def size_parallelism(cls, parallelism: Parallelism, **kwargs) -> int:
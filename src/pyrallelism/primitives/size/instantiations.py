@@ -1,6 +1,8 @@
+from scipy.sparse import csr_array
+
 from .base import SizeFunction
-from ..conversion.instantiations import BranchedWordConverter
-from ..typing import BranchedWordSet, Parallelism
+from ..conversion.instantiations import BranchedWordConverter, TokenIncidenceConverter
+from ..typing import BranchedWordSet, Parallelism, ParallelismDirectory
 
 
 class ParallelismSizer(SizeFunction):
@@ -14,6 +16,11 @@ class ParallelismSizer(SizeFunction):
         parallelism_size: int = 1 if parallelism is not None else 0
         return parallelism_size
 
+    @classmethod
+    def size_directory(cls, prepared_directory: list[Parallelism], **kwargs) -> int:
+        directory_size: int = len(prepared_directory) - prepared_directory.count(None)
+        return directory_size
+
 
 class BranchSizer(SizeFunction):
     """
@@ -25,6 +32,11 @@ class BranchSizer(SizeFunction):
         parallelism_size: int = len(parallelism)
         return parallelism_size
 
+    @classmethod
+    def size_directory(cls, prepared_directory: list[Parallelism], **kwargs) -> int:
+        directory_size: int = sum(map(len, prepared_directory))
+        return directory_size
+
 
 class WordSizer(SizeFunction):
     """
@@ -39,3 +51,13 @@ class WordSizer(SizeFunction):
         token_set: set[int] = set(token for branch in converted_parallelism for token in branch)
         parallelism_size: int = len(token_set)
         return parallelism_size
+
+    @classmethod
+    def prepare_directory(cls, directory: ParallelismDirectory, **kwargs) -> csr_array:
+        return TokenIncidenceConverter.convert_directory(directory)
+
+    @classmethod
+    def size_directory(cls, prepared_directory: csr_array, **kwargs) -> int:
+        # Each stored entry of a token incidence matrix is one distinct token of one parallelism.
+        directory_size: int = prepared_directory.nnz
+        return directory_size
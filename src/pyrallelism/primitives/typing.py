@@ -1,13 +1,17 @@
-from typing import TypeAlias, Union
+from typing import TYPE_CHECKING, TypeAlias, Union
 
 from numpy.typing import NDArray
+from scipy.sparse import sparray
+
+if TYPE_CHECKING:
+    from ..structures.alignment import Alignment
 
 
 Branch: TypeAlias = tuple[int, int]
 Parallelism: TypeAlias = set[Branch]
 ParallelismDirectory: TypeAlias = dict[int, Parallelism]
 
-LSAComponents: TypeAlias = dict[str, Union[NDArray[int], list[tuple[int, int]]]]
+LSAComponents: TypeAlias = dict[str, Union[NDArray[int], sparray, list[tuple[int, int]], int, "Alignment"]]
 
 BranchedWordSet: TypeAlias = list[set[int]]
 
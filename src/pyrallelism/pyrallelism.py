@@ -1,30 +1,73 @@
 from argparse import ArgumentParser, Namespace
-from os import path
+from contextlib import ExitStack
+from enum import StrEnum
+from functools import partial
+from json import dumps
+from os import listdir, path
 from sys import argv
-from typing import Any, Sequence
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence, Type, TypeAlias
+from warnings import warn
+
+from natsort import natsorted
 
 from .evaluator import evaluate_bipartite_parallelism_metric
-from .primitives.evaluation_metric import DefinedMetric, get_metric
-from .primitives.loading import TSVLoader, XMLLoader
+from .primitives.assignment import get_matching, LinearSumAssigner
+from .primitives.evaluation_metric import DefinedMetric, EvaluationMetric, get_metric
+from .primitives.loading import BaseParallelismLoader, NPZLoader, TSVLoader, XMLLoader
 from .primitives.loading.interface import get_loader
+from .primitives.score import memoize_scoring_function
 from .primitives.typing import ParallelismDirectory
+from .sampling import estimate_bipartite_parallelism_metric, SampledEstimate
+from .structures.alignment import Alignment
 from .structures.confusion_matrix import ReducedConfusionMatrix
-from .utils.command_line_helpers import collect_directories
-from .utils.output_format import get_output_type, CSV_FORMAT
+from .utils.alignment_writer import AlignmentWriter, get_alignment_writer, JSONLinesAlignmentWriter
+from .utils.checkpointing import CheckpointJournal, create_pair_record, create_quarantine_record, \
+    PairQuarantinedError, QUARANTINED_STATUS, run_with_limits
+from .utils.command_line_helpers import stream_directory_pairs
+from .utils.result_sink import CSVResultSink, get_result_sink, ResultSink
+from .utils.sharding import CorpusFingerprint, describe_metric, fingerprint_directories, get_record_matrix, \
+    is_in_shard, merge_partial_results, parse_shard, PartialResultWriter
 from .utils.help_messages import *
 
+DirectoryPair: TypeAlias = tuple[ParallelismDirectory, ParallelismDirectory]
+
 
 def _use_pyrallelism_cli():
-    parser: ArgumentParser = ArgumentParser()
+    # A hypothesis path which happens to share a subcommand's name is still evaluated, as it was before subcommands.
+    if len(argv) > 1 and argv[1] in SUBCOMMAND_TABLE and path.exists(argv[1]) is False:
+        SUBCOMMAND_TABLE[argv[1]](argv[2:])
+    else:
+        _use_evaluation_cli(argv[1:])
+
+
+def _use_evaluation_cli(arguments: Sequence[str]):
+    parser: ArgumentParser = ArgumentParser(prog="pyrallelism")
     parser.add_argument("hypothesis_path", type=str, help=HYPOTHESIS_HELP)
     parser.add_argument("reference_path", type=str, help=REFERENCE_HELP)
+    parser.add_argument("--alignment-filepath", type=str, default=None, help=ALIGNMENT_PATH_HELP)
+    parser.add_argument("--alignment-type", type=get_alignment_writer, default=JSONLinesAlignmentWriter,
+                        help=ALIGNMENT_TYPE_HELP)
+    parser.add_argument("--anytime", action="store_true", help=ANYTIME_HELP)
     parser.add_argument("--beta", type=float, default=1.0, help=BETA_HELP)
+    parser.add_argument("--checkpoint", action="store_true", help=CHECKPOINT_HELP)
+    parser.add_argument("--confidence-level", type=float, default=0.95, help=CONFIDENCE_LEVEL_HELP)
     parser.add_argument("--loaders", type=get_loader, nargs="+", default=(TSVLoader, XMLLoader), help=LOADERS_HELP)
+    parser.add_argument("--multi-document", action="store_true", help=MULTI_DOCUMENT_HELP)
+    parser.add_argument("--matching", type=get_matching, default=LinearSumAssigner, help=MATCHING_HELP)
     parser.add_argument("--metric", type=get_metric, default=DefinedMetric.EXACT_PARALLELISM_MATCH, help=METRICS_HELP)
     parser.add_argument("--output-filepath", type=str, default="results", help=OUTPUT_PATH_HELP)
-    parser.add_argument("--output-type", type=get_output_type, nargs="+", default=(CSV_FORMAT,), help=OUTPUT_TYPE_HELP)
+    parser.add_argument("--output-type", type=get_result_sink, nargs="+", default=(CSVResultSink,),
+                        help=OUTPUT_TYPE_HELP)
+    parser.add_argument("--pair-memory-limit", type=int, default=None, help=PAIR_MEMORY_LIMIT_HELP)
+    parser.add_argument("--pair-time-limit", type=float, default=None, help=PAIR_TIME_LIMIT_HELP)
+    parser.add_argument("--resume", action="store_true", help=RESUME_HELP)
+    parser.add_argument("--score-cache-size", type=int, default=0, help=SCORE_CACHE_SIZE_HELP)
+    parser.add_argument("--seed", type=int, default=0, help=SEED_HELP)
+    parser.add_argument("--shard", type=parse_shard, default=None, help=SHARD_HELP)
     parser.add_argument("--stratum-count", type=int, default=None, help=STRATUM_COUNT_HELP)
-    args: Namespace = parser.parse_args(argv[1:])
+    parser.add_argument("--target-width", type=float, default=None, help=TARGET_WIDTH_HELP)
+    parser.add_argument("--time-budget", type=float, default=None, help=TIME_BUDGET_HELP)
+    args: Namespace = parser.parse_args(arguments)
 
     if path.exists(args.hypothesis_path) is False:
         raise ValueError(f"The filepath <{args.hypothesis_path}> is not a valid filepath.")
@@ -40,42 +83,303 @@ def _use_pyrallelism_cli():
 
     loader_kwargs: dict[str, Any] = {"stratum_count": args.stratum_count}
 
+    if args.score_cache_size > 0:
+        args.metric = EvaluationMetric(memoize_scoring_function(args.metric.score, args.score_cache_size),
+                                       args.metric.size)
+
+    directory_pairs: Iterable[tuple[dict[str, str], Callable[[], DirectoryPair]]] = \
+        _generate_directory_pairs(args, hypothesis_loader, reference_loader, loader_kwargs)
+
+    if args.anytime is True:
+        _estimate_directory_pairs(args, directory_pairs)
+        return
+
+    # Approximate matchings report an upper bound on the exact score alongside each result.
+    is_approximate: bool = args.matching.approximation_ratio < 1.0
+    annotation_names: Sequence[str] = ("score_upper_bound",) if is_approximate is True else ()
+
+    evaluation_metadata: dict[str, Any] = {
+        "metric": describe_metric(args.metric),
+        "matching": f"{args.matching.__module__}.{args.matching.__qualname__}",
+        "loaders": [f"{loader.__module__}.{loader.__qualname__}" for loader in args.loaders],
+        "multi_document": args.multi_document,
+        "stratum_count": args.stratum_count
+    }
+
+    corpus_fingerprint: CorpusFingerprint = CorpusFingerprint()
+    with ExitStack() as sink_stack:
+        result_sinks: list[ResultSink] = [
+            sink_stack.enter_context(sink_type(args.output_filepath, args.beta, annotation_names))
+            for sink_type in args.output_type
+        ]
+
+        if args.shard is not None:
+            for input_filepath in _list_input_filepaths(args):
+                corpus_fingerprint.update_contents(input_filepath)
+            shard_index, shard_count = args.shard
+            shard_metadata: dict[str, Any] = {"shard_index": shard_index, "shard_count": shard_count,
+                                              **evaluation_metadata}
+            partial_writer: Optional[PartialResultWriter] = sink_stack.enter_context(
+                PartialResultWriter(f"{args.output_filepath}.partial.jsonl", shard_metadata, annotation_names)
+            )
+        else:
+            partial_writer = None
+
+        if args.alignment_filepath is not None:
+            alignment_writer: Optional[AlignmentWriter] = \
+                sink_stack.enter_context(args.alignment_type(args.alignment_filepath))
+        else:
+            alignment_writer = None
+
+        if args.checkpoint is True or args.resume is True:
+            journal_metadata: dict[str, Any] = {
+                **evaluation_metadata, "shard": None if args.shard is None else list(args.shard),
+                "annotation_names": list(annotation_names), "alignments": alignment_writer is not None
+            }
+            journal: Optional[CheckpointJournal] = sink_stack.enter_context(
+                CheckpointJournal(f"{args.output_filepath}.journal.jsonl", journal_metadata, args.resume)
+            )
+        else:
+            journal = None
+
+        for pair_index, (filenames, load_directory_pair) in enumerate(directory_pairs):
+            corpus_fingerprint.update(filenames)
+            if args.shard is not None and is_in_shard(pair_index, *args.shard) is False:
+                continue
+
+            hypotheses, references = load_directory_pair()
+            if args.score_cache_size > 0:
+                # Each pair is held as the memoized scorer's interned parallelisms, so repeats are stored only once.
+                hypotheses, references = \
+                    [args.metric.score.intern_directory(directory) for directory in (hypotheses, references)]
+            # Fingerprints are only recorded by journals and partial results, so they are otherwise not computed.
+            fingerprint: Optional[str] = fingerprint_directories(hypotheses, references) \
+                if journal is not None or partial_writer is not None else None
+            pair_record: Optional[dict[str, Any]] = \
+                journal.get_record(pair_index, filenames, fingerprint) if journal is not None else None
+            if pair_record is None:
+                pair_record = _evaluate_pair_record(
+                    args, pair_index, filenames, fingerprint, hypotheses, references, annotation_names
+                )
+                if journal is not None:
+                    journal.write_record(pair_record)
+
+            if pair_record["status"] == QUARANTINED_STATUS:
+                warn(f"The pair <{filenames['hypothesis_filename']}, {filenames['reference_filename']}> "
+                     f"was quarantined and excluded from the results: {pair_record['reason']}", RuntimeWarning)
+                if partial_writer is not None:
+                    partial_writer.write_quarantine(pair_index, filenames, fingerprint, pair_record["reason"])
+                continue
+
+            confusion_matrix: ReducedConfusionMatrix = get_record_matrix(pair_record)
+            annotations: dict[str, Any] = pair_record["annotations"]
+            for result_sink in result_sinks:
+                result_sink.write_result(filenames, confusion_matrix, annotations)
+
+            if alignment_writer is not None:
+                alignment_writer.write_alignment(filenames, Alignment(**pair_record["alignment"]))
+
+            if partial_writer is not None:
+                partial_writer.write_result(pair_index, filenames, fingerprint, confusion_matrix, annotations)
+
+        if partial_writer is not None:
+            partial_writer.write_summary(corpus_fingerprint)
+
+
+def _estimate_directory_pairs(args: Namespace,
+                              directory_pairs: Iterable[tuple[dict[str, str], Callable[[], DirectoryPair]]]):
+    """
+    Estimates the micro-averaged statistics of the CLI's inputs from a growing random sample of file pairs,
+    writing each successive estimate to <OUTPUT_FILEPATH>.estimates.jsonl as soon as it is made.
+    File pairs are stratified by their combined file size, which requires no parsing.
+    """
+    if not (path.isdir(args.hypothesis_path) and path.isdir(args.reference_path)) or args.multi_document is True:
+        raise NotImplementedError("Anytime evaluation is currently only implemented for directories of paired files "
+                                  "which each contain a single document.")
+
+    # Anytime evaluation writes only its estimates, so options concerning other outputs or per-pair runs do not apply.
+    given_options: dict[str, bool] = {
+        "--alignment-filepath": args.alignment_filepath is not None,
+        "--checkpoint": args.checkpoint is True,
+        "--output-type": tuple(args.output_type) != (CSVResultSink,),
+        "--pair-memory-limit": args.pair_memory_limit is not None,
+        "--pair-time-limit": args.pair_time_limit is not None,
+        "--resume": args.resume is True,
+        "--shard": args.shard is not None
+    }
+    incompatible_options: list[str] = [option_name for option_name, is_given in given_options.items() if is_given]
+    if len(incompatible_options) > 0:
+        raise ValueError(f"Anytime evaluation cannot be combined with {', '.join(incompatible_options)}.")
+
+    directory_pairs = list(directory_pairs)
+    pair_sizes: list[int] = [
+        path.getsize(f"{args.hypothesis_path}/{filenames['hypothesis_filename']}") +
+        path.getsize(f"{args.reference_path}/{filenames['reference_filename']}")
+        for filenames, _ in directory_pairs
+    ]
+    estimates: Iterator[SampledEstimate] = estimate_bipartite_parallelism_metric(
+        [load_directory_pair for _, load_directory_pair in directory_pairs], pair_sizes, args.metric, args.beta,
+        args.confidence_level, args.target_width, args.time_budget, seed=args.seed, assigner=args.matching
+    )
+    with open(f"{args.output_filepath}.estimates.jsonl", encoding="utf-8", mode="w+") as estimate_file:
+        for estimate in estimates:
+            estimate_file.write(f"{dumps(estimate.to_dict())}\n")
+            estimate_file.flush()
+
+
+def _evaluate_pair_record(args: Namespace, pair_index: int, filenames: dict[str, str], fingerprint: Optional[str],
+                          hypotheses: ParallelismDirectory, references: ParallelismDirectory,
+                          annotation_names: Sequence[str]) -> dict[str, Any]:
+    """
+    Evaluates one pair of hypothesis and reference data, within the CLI's per-pair limits if any are given,
+    and describes the outcome as a journal record. Pairs which exceed their limits are quarantined.
+    """
+    arguments: tuple = (hypotheses, references, args.metric, args.matching, annotation_names,
+                        args.alignment_filepath is not None)
+    if args.pair_time_limit is None and args.pair_memory_limit is None:
+        counts, annotations, alignment = _evaluate_directory_pair(*arguments)
+    else:
+        try:
+            counts, annotations, alignment = \
+                run_with_limits(_evaluate_directory_pair, arguments, args.pair_time_limit, args.pair_memory_limit)
+        except PairQuarantinedError as error:
+            return create_quarantine_record(pair_index, filenames, fingerprint, str(error))
+    return create_pair_record(pair_index, filenames, fingerprint, counts, annotations, alignment)
+
+
+def _evaluate_directory_pair(hypotheses: ParallelismDirectory, references: ParallelismDirectory,
+                             metric: EvaluationMetric, matching: Type[LinearSumAssigner],
+                             annotation_names: Sequence[str], keep_alignment: bool) -> \
+        tuple[tuple[int, int, int], dict[str, Any], Optional[dict[str, list[int]]]]:
+    confusion_matrix, components = evaluate_bipartite_parallelism_metric(
+        hypotheses, references, metric, assigner=matching, keep_scoring_matrix=False
+    )
+    counts: tuple[int, int, int] = \
+        (confusion_matrix.score, confusion_matrix.hypothesis_count, confusion_matrix.reference_count)
+    annotations: dict[str, Any] = {annotation_name: components[annotation_name] for annotation_name in annotation_names}
+    alignment: Optional[dict[str, list[int]]] = components["alignment"].to_dict() if keep_alignment is True else None
+    return counts, annotations, alignment
+
+
+def _generate_directory_pairs(args: Namespace, hypothesis_loader: Type[BaseParallelismLoader],
+                              reference_loader: Type[BaseParallelismLoader], loader_kwargs: dict[str, Any]) -> \
+        Iterator[tuple[dict[str, str], Callable[[], DirectoryPair]]]:
+    """
+    Enumerates the pairs of hypothesis and reference data designated by the CLI's arguments.
+    Each pair is yielded with a function which loads it, so that pairs stored in separate files are only loaded
+    if they are needed; pairs streamed from multi-document files are loaded as they are scanned.
+    """
     if path.isfile(args.hypothesis_path) and path.isfile(args.reference_path):
-        hypothesis_dirs: Sequence[ParallelismDirectory] = \
-            (hypothesis_loader.load_parallelism_directory(args.hypothesis_path, **loader_kwargs),)
-        reference_dirs: Sequence[ParallelismDirectory] = \
-            (reference_loader.load_parallelism_directory(args.reference_path, **loader_kwargs),)
-        hypothesis_filename: str = args.hypothesis_path.split("/")[-1]
-        reference_filename: str = args.reference_path.split("/")[-1]
-        paired_filenames: Sequence[dict[str, str]] = (
-            {"hypothesis_filename": hypothesis_filename, "reference_filename": reference_filename},
-        )
+        if args.multi_document is True:
+            for paired_filenames, hypotheses, references in stream_directory_pairs(
+                args.hypothesis_path, args.reference_path, hypothesis_loader, reference_loader, **loader_kwargs
+            ):
+                yield paired_filenames, partial(tuple, (hypotheses, references))
+        else:
+            hypothesis_filename: str = args.hypothesis_path.split("/")[-1]
+            reference_filename: str = args.reference_path.split("/")[-1]
+            paired_filenames: dict[str, str] = \
+                {"hypothesis_filename": hypothesis_filename, "reference_filename": reference_filename}
+            yield paired_filenames, partial(_load_directory_pair, args.hypothesis_path, args.reference_path,
+                                            hypothesis_loader, reference_loader, loader_kwargs)
     elif path.isdir(args.hypothesis_path) and path.isdir(args.reference_path):
-        hypothesis_filenames, hypothesis_dirs = \
-            collect_directories(args.hypothesis_path, hypothesis_loader, **loader_kwargs)
-        reference_filenames, reference_dirs = \
-            collect_directories(args.reference_path, reference_loader, **loader_kwargs)
-        paired_filenames: Sequence[dict[str, str]] = tuple([
-            {"hypothesis_filename": hypothesis_filenames[i], "reference_filename": reference_filenames[i]}
-            for i in range(0, min(len(hypothesis_filenames), len(reference_filenames)))
-        ])
+        hypothesis_filenames: list[str] = natsorted(listdir(args.hypothesis_path))
+        reference_filenames: list[str] = natsorted(listdir(args.reference_path))
+        if len(hypothesis_filenames) != len(reference_filenames):
+            raise NotImplementedError("An unequal number of hypotheses and references were collected. "
+                                      "File matching behavior is currently not implemented under such conditions.")
+
+        for hypothesis_filename, reference_filename in zip(hypothesis_filenames, reference_filenames):
+            hypothesis_filepath: str = f"{args.hypothesis_path}/{hypothesis_filename}"
+            reference_filepath: str = f"{args.reference_path}/{reference_filename}"
+            if args.multi_document is True:
+                for paired_filenames, hypotheses, references in stream_directory_pairs(
+                    hypothesis_filepath, reference_filepath, hypothesis_loader, reference_loader, **loader_kwargs
+                ):
+                    yield paired_filenames, partial(tuple, (hypotheses, references))
+            else:
+                paired_filenames = \
+                    {"hypothesis_filename": hypothesis_filename, "reference_filename": reference_filename}
+                yield paired_filenames, partial(_load_directory_pair, hypothesis_filepath, reference_filepath,
+                                                hypothesis_loader, reference_loader, loader_kwargs)
     else:
         raise NotImplementedError("Behavior for a mixture of filepaths and directories is currently undefined.")
 
-    confusion_matrices: list[ReducedConfusionMatrix] = []
-    if len(hypothesis_dirs) != len(reference_dirs):
-        raise NotImplementedError("An unequal number of hypotheses and references were collected. "
-                                  "File matching behavior is currently not implemented under such conditions.")
+
+def _list_input_filepaths(args: Namespace) -> list[str]:
+    """
+    Lists every input file designated by the CLI's arguments: both files, or every file of both directories.
+    """
+    input_filepaths: list[str] = []
+    for input_path in (args.hypothesis_path, args.reference_path):
+        if path.isdir(input_path):
+            input_filepaths.extend([f"{input_path}/{filename}" for filename in natsorted(listdir(input_path))])
+        else:
+            input_filepaths.append(input_path)
+    return input_filepaths
+
+
+def _load_directory_pair(hypothesis_filepath: str, reference_filepath: str,
+                         hypothesis_loader: Type[BaseParallelismLoader], reference_loader: Type[BaseParallelismLoader],
+                         loader_kwargs: dict[str, Any]) -> DirectoryPair:
+    hypotheses: ParallelismDirectory = \
+        hypothesis_loader.load_parallelism_directory(hypothesis_filepath, **loader_kwargs)
+    references: ParallelismDirectory = reference_loader.load_parallelism_directory(reference_filepath, **loader_kwargs)
+    return hypotheses, references
+
+
+def _use_conversion_cli(arguments: Sequence[str]):
+    parser: ArgumentParser = ArgumentParser(prog=f"pyrallelism {DefinedSubcommand.CONVERT}")
+    parser.add_argument("input_path", type=str, help=CONVERSION_INPUT_HELP)
+    parser.add_argument("output_path", type=str, help=CONVERSION_OUTPUT_HELP)
+    parser.add_argument("--loader", type=get_loader, default=TSVLoader, help=CONVERSION_LOADER_HELP)
+    parser.add_argument("--stratum-count", type=int, default=None, help=STRATUM_COUNT_HELP)
+    args: Namespace = parser.parse_args(arguments)
+
+    if path.isfile(args.input_path):
+        input_filepaths: Sequence[str] = (args.input_path,)
+    elif path.isdir(args.input_path):
+        input_filepaths = tuple([f"{args.input_path}/{filename}" for filename in natsorted(listdir(args.input_path))])
     else:
-        directory_pairs: list[tuple[ParallelismDirectory, ParallelismDirectory]] = zip(hypothesis_dirs, reference_dirs)
-        for (hypotheses, references) in directory_pairs:
-            confusion_matrix, _ = evaluate_bipartite_parallelism_metric(hypotheses, references, args.metric)
-            confusion_matrices.append(confusion_matrix)
-
-    for filetype in args.output_type:
-        with open(f"{args.output_filepath}.{filetype.filetype}", encoding="utf-8", mode="w+") as output_file:
-            output_file.write(filetype.title)
-            for pair_index, matrix in enumerate(confusion_matrices):
-                output_file.write(filetype.header.format(**paired_filenames[pair_index]))
-                base_line_string: str = matrix.get_printable_statistics(filetype.line, beta=args.beta)
-                output_file.write(base_line_string)
+        raise ValueError(f"The filepath <{args.input_path}> is not a valid filepath.")
+
+    NPZLoader.write_bundle(args.output_path, input_filepaths, args.loader, stratum_count=args.stratum_count)
+
+
+def _use_merging_cli(arguments: Sequence[str]):
+    parser: ArgumentParser = ArgumentParser(prog=f"pyrallelism {DefinedSubcommand.MERGE}")
+    parser.add_argument("partial_paths", type=str, nargs="+", help=PARTIAL_PATHS_HELP)
+    parser.add_argument("--beta", type=float, default=1.0, help=BETA_HELP)
+    parser.add_argument("--output-filepath", type=str, default="results", help=OUTPUT_PATH_HELP)
+    parser.add_argument("--output-type", type=get_result_sink, nargs="+", default=(CSVResultSink,),
+                        help=OUTPUT_TYPE_HELP)
+    args: Namespace = parser.parse_args(arguments)
+
+    header, pair_records = merge_partial_results(args.partial_paths)
+    with ExitStack() as sink_stack:
+        result_sinks: list[ResultSink] = [
+            sink_stack.enter_context(sink_type(args.output_filepath, args.beta, header["annotation_names"]))
+            for sink_type in args.output_type
+        ]
+        for pair_record in pair_records:
+            filenames: dict[str, str] = {
+                "hypothesis_filename": pair_record["hypothesis_filename"],
+                "reference_filename": pair_record["reference_filename"]
+            }
+            for result_sink in result_sinks:
+                result_sink.write_result(filenames, get_record_matrix(pair_record), pair_record["annotations"])
+
+
+class DefinedSubcommand(StrEnum):
+    """
+    .. py:class:: DefinedSubcommand
+    Enumeration class for the names of subcommands offered by the CLI in addition to evaluation.
+    """
+    CONVERT: str = "convert"
+    MERGE: str = "merge"
+
+
+SUBCOMMAND_TABLE: dict[str, Callable[[Sequence[str]], None]] = {
+    DefinedSubcommand.CONVERT: _use_conversion_cli,
+    DefinedSubcommand.MERGE: _use_merging_cli
+}
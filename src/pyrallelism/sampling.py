@@ -0,0 +1,281 @@
+from __future__ import annotations
+
+from random import Random
+from time import perf_counter
+from typing import Any, Callable, Iterator, Optional, Sequence, Type, TypeAlias
+
+from numpy import argsort, array, asarray, float64, inf, int64, sqrt, zeros
+from numpy.typing import ArrayLike, NDArray
+from scipy.stats import norm
+
+from .evaluator import evaluate_bipartite_parallelism_metric
+from .primitives.assignment.lsa import LinearSumAssigner
+from .primitives.evaluation_metric import EvaluationMetric
+from .primitives.typing import ParallelismDirectory
+from .structures.confusion_matrix_batch import ConfusionMatrixBatch
+
+DirectoryPair: TypeAlias = tuple[ParallelismDirectory, ParallelismDirectory]
+
+DEFAULT_BATCH_SIZE: int = 16
+DEFAULT_BIN_COUNT: int = 8
+STATISTIC_NAMES: tuple[str, str, str] = ("precision", "recall", "f_score")
+
+
+class SampledEstimate:
+    """
+    .. py:class:: SampledEstimate
+    Data structure class to hold an estimate of a corpus's micro-averaged precision, recall, and F-score
+    made from a sample of its documents, along with a confidence interval for each statistic.
+    """
+    __slots__ = ("pair_count", "population_count", "elapsed_time", "estimates", "lower_bounds", "upper_bounds")
+
+    def __init__(self, pair_count: int, population_count: int, elapsed_time: float,
+                 estimates: ArrayLike, lower_bounds: ArrayLike, upper_bounds: ArrayLike):
+        """
+        :param pair_count: the number of document pairs evaluated so far.
+        :param population_count: the number of document pairs in the corpus.
+        :param elapsed_time: the number of seconds spent evaluating so far.
+        :param estimates: the estimated precision, recall, and F-score, in that order.
+        :param lower_bounds: the lower bound of the confidence interval for each statistic.
+        :param upper_bounds: the upper bound of the confidence interval for each statistic.
+        """
+        self.pair_count: int = pair_count
+        self.population_count: int = population_count
+        self.elapsed_time: float = elapsed_time
+        self.estimates: NDArray[float] = asarray(estimates, dtype=float64)
+        self.lower_bounds: NDArray[float] = asarray(lower_bounds, dtype=float64)
+        self.upper_bounds: NDArray[float] = asarray(upper_bounds, dtype=float64)
+
+    @property
+    def is_exact(self) -> bool:
+        """
+        :return: a `bool` indicating whether every document pair was evaluated,
+        in which case the estimates equal the exact micro-averaged statistics.
+        """
+        return self.pair_count == self.population_count
+
+    def get_widths(self) -> NDArray[float]:
+        """
+        :return: an `NDArray` holding the width of the confidence interval for each statistic.
+        """
+        return self.upper_bounds - self.lower_bounds
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Converts the `SampledEstimate` into a `dict`, suitable for serialization.
+        :return: a `dict` with the pair counts, the elapsed time, and, for each statistic,
+        a `dict` holding its *estimate*, *lower_bound*, and *upper_bound*.
+        """
+        estimate_dict: dict[str, Any] = {
+            "pair_count": self.pair_count, "population_count": self.population_count,
+            "elapsed_time": self.elapsed_time
+        }
+        for statistic_name, estimate, lower_bound, upper_bound in \
+                zip(STATISTIC_NAMES, self.estimates.tolist(), self.lower_bounds.tolist(), self.upper_bounds.tolist()):
+            estimate_dict[statistic_name] = \
+                {"estimate": estimate, "lower_bound": lower_bound, "upper_bound": upper_bound}
+        return estimate_dict
+
+
+class StratifiedRatioEstimator:
+    """
+    .. py:class:: StratifiedRatioEstimator
+    Estimates a corpus's micro-averaged statistics from a stratified random sample of its documents.
+    Each statistic is a ratio of corpus totals--e.g., precision is the total score over the total hypothesis size,
+    and the F-β score is `(1 + β^2)` times the total score over the sum of the total hypothesis size and
+    `β^2` times the total reference size--so each is estimated by the ratio of the estimated totals.
+    Its variance is estimated by linearization, summing the within-stratum variances of the residuals
+    `numerator - estimate * denominator` with a finite population correction, so that
+    the confidence intervals shrink to nothing once every document has been evaluated.
+    Until every stratum has been sampled twice (or exhausted), no variance can be estimated,
+    and the confidence intervals span all of `[0, 1]`.
+    """
+    def __init__(self, bin_sizes: Sequence[int], beta: float = 1, confidence_level: float = 0.95):
+        """
+        :param bin_sizes: the number of documents in each stratum of the corpus.
+        :param beta: a positive `float` weight given to precision and recall when computing F-scores.
+        :param confidence_level: the probability, between 0 and 1, with which each interval should contain
+        the exact statistic.
+        """
+        if not (0 < confidence_level < 1):
+            raise ValueError(f"The given confidence level, <{confidence_level}>, is not between 0 and 1.")
+        elif beta <= 0:
+            raise ValueError(f"The given value of beta, <{beta}> is not positive.")
+
+        self.bin_sizes: NDArray[int] = asarray(bin_sizes, dtype=int64)
+        self.beta: float = beta
+        self.critical_value: float = float(norm.ppf((1 + confidence_level) / 2))
+        self.samples: list[list[tuple[int, int, int]]] = [[] for _ in range(0, len(self.bin_sizes))]
+
+    def update(self, bin_index: int, counts: tuple[int, int, int]):
+        """
+        Adds an evaluated document to the sample.
+        :param bin_index: the index of the stratum to which the document belongs.
+        :param counts: the score, hypothesis count, and reference count computed for the document.
+        """
+        if len(self.samples[bin_index]) >= self.bin_sizes[bin_index]:
+            raise ValueError(f"The stratum <{bin_index}> has already been sampled in full.")
+        self.samples[bin_index].append(counts)
+
+    def estimate(self) -> tuple[NDArray[float], NDArray[float], NDArray[float]]:
+        """
+        Estimates the micro-averaged statistics from the documents sampled so far.
+        :return: a 3-tuple of `NDArray` objects holding, for precision, recall, and F-score, in that order:
+        the estimates, the lower bounds of their confidence intervals, and the upper bounds of those intervals.
+        """
+        squared_beta: float = self.beta ** 2
+        estimated_totals: NDArray[float] = zeros(3, dtype=float64)
+        for bin_size, bin_samples in zip(self.bin_sizes.tolist(), self.samples):
+            if len(bin_samples) > 0:
+                estimated_totals += asarray(bin_samples, dtype=float64).sum(axis=0) * (bin_size / len(bin_samples))
+
+        score_total, hypothesis_total, reference_total = estimated_totals.tolist()
+        precision: float = score_total / hypothesis_total if hypothesis_total > 0 else 0.0
+        recall: float = score_total / reference_total if reference_total > 0 else 0.0
+        f_score: float = \
+            float(ConfusionMatrixBatch.combine_f_scores(array([precision]), array([recall]), self.beta)[0])
+        estimates: NDArray[float] = array([precision, recall, f_score], dtype=float64)
+
+        # Each statistic is a ratio of a numerator to a denominator, both of which are linear in the counts.
+        ratio_terms: Sequence[tuple[NDArray[float], NDArray[float]]] = (
+            (array([1.0, 0.0, 0.0]), array([0.0, 1.0, 0.0])),
+            (array([1.0, 0.0, 0.0]), array([0.0, 0.0, 1.0])),
+            (array([1 + squared_beta, 0.0, 0.0]), array([0.0, 1.0, squared_beta]))
+        )
+        variances: NDArray[float] = zeros(3, dtype=float64)
+        for statistic_index, (numerator_weights, denominator_weights) in enumerate(ratio_terms):
+            denominator_total: float = float(estimated_totals @ denominator_weights)
+            for bin_size, bin_samples in zip(self.bin_sizes.tolist(), self.samples):
+                sample_count: int = len(bin_samples)
+                if sample_count == bin_size:
+                    continue
+                elif sample_count < 2:
+                    variances[statistic_index] = inf
+                    break
+
+                bin_counts: NDArray[float] = asarray(bin_samples, dtype=float64)
+                residuals: NDArray[float] = \
+                    bin_counts @ numerator_weights - estimates[statistic_index] * (bin_counts @ denominator_weights)
+                variances[statistic_index] += \
+                    bin_size ** 2 * (1 - sample_count / bin_size) * residuals.var(ddof=1) / sample_count
+            if denominator_total > 0:
+                variances[statistic_index] /= denominator_total ** 2
+            elif variances[statistic_index] > 0:
+                variances[statistic_index] = inf
+
+        margins: NDArray[float] = self.critical_value * sqrt(variances)
+        lower_bounds: NDArray[float] = (estimates - margins).clip(0.0, 1.0)
+        upper_bounds: NDArray[float] = (estimates + margins).clip(0.0, 1.0)
+        return estimates, lower_bounds, upper_bounds
+
+
+def get_sampling_order(pair_sizes: Sequence[float], bin_count: int = DEFAULT_BIN_COUNT, seed: int = 0) -> \
+        tuple[list[int], list[int]]:
+    """
+    Divides a corpus into strata of similarly-sized documents and orders its documents for sampling.
+    Documents are ranked by size and split into *bin_count* strata of (nearly) equal count.
+    Within each stratum, documents are shuffled; the strata are then interleaved so that any prefix of the order
+    is a stratified sample with (nearly) proportional allocation, except that the first two documents of
+    every stratum come first, so that every stratum's variance can be estimated as early as possible.
+    :param pair_sizes: a cheap measure of the size of each document pair, such as its length or file size.
+    :param bin_count: the number of strata to form; fewer are formed if there are fewer documents.
+    :param seed: an `int` seed for the random order, so that the same order can be reproduced.
+    :return: a 2-tuple of `list` objects containing: (1) the order in which the documents should be evaluated and
+    (2) the index of the stratum to which each document (in its original position) belongs.
+    """
+    if bin_count <= 0:
+        raise ValueError(f"The given bin count, <{bin_count}>, is not positive.")
+
+    pair_count: int = len(pair_sizes)
+    bin_count = min(bin_count, pair_count)
+    ranked_pairs: list[int] = argsort(asarray(pair_sizes, dtype=float64), kind="stable").tolist()
+    bin_indices: list[int] = [0] * pair_count
+    for rank, pair_index in enumerate(ranked_pairs):
+        bin_indices[pair_index] = rank * bin_count // pair_count
+
+    random_generator: Random = Random(seed)
+    bin_members: list[list[int]] = [[] for _ in range(0, bin_count)]
+    for pair_index in range(0, pair_count):
+        bin_members[bin_indices[pair_index]].append(pair_index)
+
+    sampling_keys: list[tuple[bool, float, int]] = []
+    for members in bin_members:
+        random_generator.shuffle(members)
+        offset: float = random_generator.random()
+        for position, pair_index in enumerate(members):
+            sampling_keys.append((position >= 2, (position + offset) / len(members), pair_index))
+
+    sampling_order: list[int] = [pair_index for _, _, pair_index in sorted(sampling_keys)]
+    return sampling_order, bin_indices
+
+
+def estimate_bipartite_parallelism_metric(pair_loaders: Sequence[Callable[[], DirectoryPair]],
+                                          pair_sizes: Sequence[float], metric: EvaluationMetric, beta: float = 1,
+                                          confidence_level: float = 0.95, target_width: Optional[float] = None,
+                                          time_budget: Optional[float] = None, batch_size: int = DEFAULT_BATCH_SIZE,
+                                          bin_count: int = DEFAULT_BIN_COUNT, seed: int = 0,
+                                          scoring_kwargs: Optional[dict[str, Any]] = None,
+                                          size_kwargs: Optional[dict[str, Any]] = None,
+                                          assigner: Type[LinearSumAssigner] = LinearSumAssigner) -> \
+        Iterator[SampledEstimate]:
+    """
+    A function which estimates a bipartite parallelism metric over a corpus at any time, refining its estimate
+    as more of the corpus is evaluated. Document pairs are evaluated in a seeded, stratified random order
+    (see `get_sampling_order`), and after each batch, the micro-averaged precision, recall, and F-score are estimated
+    with confidence intervals by a `StratifiedRatioEstimator`. Evaluation stops once every interval is
+    no wider than *target_width*, once *time_budget* is spent, or once the whole corpus is evaluated,
+    at which point the estimates equal the exact micro-averaged statistics.
+    :param pair_loaders: a collection of functions, one per document pair, which each load and return
+    the pair's hypothesis and reference `ParallelismDirectory` objects.
+    :param pair_sizes: a cheap measure of the size of each document pair by which pairs are stratified.
+    :param metric: an `EvaluationMetric` containing a coordinated combination of
+    a `ScoringFunction` class and a `SizeFunction` class.
+    :param beta: a positive `float` weight given to precision and recall when computing F-scores.
+    :param confidence_level: the probability, between 0 and 1, with which each interval should contain
+    the exact statistic.
+    :param target_width: the interval width at which evaluation stops, if any.
+    :param time_budget: the number of seconds after which evaluation stops, if any.
+    :param batch_size: the number of document pairs evaluated between estimates.
+    :param bin_count: the number of strata into which document pairs are divided by size.
+    :param seed: an `int` seed for the order of evaluation.
+    :param scoring_kwargs: a collection of keyword arguments meant to modify the scoring calculations.
+    :param size_kwargs: a collection of keyword arguments meant to modify the size calculations.
+    :param assigner: the `LinearSumAssigner` class (or subclass) used to compute the bipartite matching.
+    :return: an iterator over a `SampledEstimate` for each batch, the last of which is final.
+    """
+    if len(pair_loaders) != len(pair_sizes):
+        raise ValueError(f"{len(pair_loaders)} document pairs were given, but {len(pair_sizes)} sizes were given.")
+    elif batch_size <= 0:
+        raise ValueError(f"The given batch size, <{batch_size}>, is not positive.")
+    elif len(pair_loaders) == 0:
+        return
+
+    start_time: float = perf_counter()
+    sampling_order, bin_indices = get_sampling_order(pair_sizes, bin_count, seed)
+    bin_sizes: NDArray[int] = zeros(max(bin_indices) + 1, dtype=int64)
+    for bin_index in bin_indices:
+        bin_sizes[bin_index] += 1
+    estimator: StratifiedRatioEstimator = StratifiedRatioEstimator(bin_sizes, beta, confidence_level)
+
+    pair_count: int = 0
+    is_finished: bool = False
+    while is_finished is False:
+        for pair_index in sampling_order[pair_count:pair_count + batch_size]:
+            hypotheses, references = pair_loaders[pair_index]()
+            confusion_matrix, _ = evaluate_bipartite_parallelism_metric(
+                hypotheses, references, metric, scoring_kwargs, size_kwargs, assigner, keep_scoring_matrix=False
+            )
+            estimator.update(
+                bin_indices[pair_index],
+                (confusion_matrix.score, confusion_matrix.hypothesis_count, confusion_matrix.reference_count)
+            )
+            pair_count += 1
+            if time_budget is not None and perf_counter() - start_time >= time_budget:
+                break
+
+        estimate: SampledEstimate = \
+            SampledEstimate(pair_count, len(pair_loaders), perf_counter() - start_time, *estimator.estimate())
+        is_finished = estimate.is_exact or \
+            (target_width is not None and bool((estimate.get_widths() <= target_width).all())) or \
+            (time_budget is not None and estimate.elapsed_time >= time_budget)
+        yield estimate
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import Executor, Future
+from typing import Any, Iterable, Optional, Sequence, Type, TypeAlias, Union
+
+from numpy.typing import ArrayLike
+
+from .evaluator import evaluate_bipartite_parallelism_metric
+from .primitives.assignment.lsa import LinearSumAssigner
+from .primitives.evaluation_metric import EvaluationMetric
+from .primitives.loading.instantiations import ArrayLoader
+from .primitives.typing import ParallelismDirectory
+from .structures.confusion_matrix import ReducedConfusionMatrix
+from .structures.confusion_matrix_batch import ConfusionMatrixBatch
+
+DocumentInput: TypeAlias = Union[ParallelismDirectory, ArrayLike]
+CountTriple: TypeAlias = tuple[int, int, int]
+
+
+class StreamingEvaluator:
+    """
+    .. py:class:: StreamingEvaluator
+    Stateful class for computing a bipartite parallelism metric over documents as they become available,
+    such as the predictions made during a training loop, without writing them to files.
+    Each document is given either as a `ParallelismDirectory` or as an array of token labels of shape
+    `(tokens, strata, 2)` (or `(tokens, 2)` for a single stratum), where the last axis holds
+    each token's `parallelism_id` (with `-1` indicating no parallelism) and `branch_id`.
+    The evaluator keeps running totals of the metric's score and sizes, so its memory use does not grow
+    with the number of documents; per-document results are only kept if *keep_results* is set.
+    If an `Executor` is supplied, documents are evaluated on it, and `update` does not wait for them to finish.
+    """
+    def __init__(self, metric: EvaluationMetric, beta: float = 1,
+                 scoring_kwargs: Optional[dict[str, Any]] = None, size_kwargs: Optional[dict[str, Any]] = None,
+                 assigner: Type[LinearSumAssigner] = LinearSumAssigner, executor: Optional[Executor] = None,
+                 max_pending: int = 64, keep_results: bool = False):
+        """
+        :param metric: an `EvaluationMetric` containing a coordinated combination of
+        a `ScoringFunction` class and a `SizeFunction` class.
+        :param beta: a positive `float` weight given to precision and recall when computing F-scores.
+        :param scoring_kwargs: a collection of keyword arguments meant to modify the scoring calculations.
+        :param size_kwargs: a collection of keyword arguments meant to modify the size calculations.
+        :param assigner: the `LinearSumAssigner` class (or subclass) used to compute the bipartite matching.
+        :param executor: an optional `Executor` (such as a `ThreadPoolExecutor` or `ProcessPoolExecutor`)
+        on which documents are evaluated. If it is not given, documents are evaluated as soon as they are received.
+        :param max_pending: the largest number of documents which may await evaluation on *executor* at once;
+        further updates wait for the oldest document to finish, which bounds the evaluator's memory use.
+        :param keep_results: a `bool` indicating whether the result of each document should be kept.
+        """
+        if max_pending <= 0:
+            raise ValueError(f"The given value of max_pending, <{max_pending}>, is not positive.")
+
+        self.metric: EvaluationMetric = metric
+        self.beta: float = beta
+        self.scoring_kwargs: dict[str, Any] = {} if scoring_kwargs is None else scoring_kwargs
+        self.size_kwargs: dict[str, Any] = {} if size_kwargs is None else size_kwargs
+        self.assigner: Type[LinearSumAssigner] = assigner
+        self.executor: Optional[Executor] = executor
+        self.max_pending: int = max_pending
+        self.keep_results: bool = keep_results
+
+        self.total_matrix: ReducedConfusionMatrix = ReducedConfusionMatrix()
+        self.document_count: int = 0
+        self.results: list[CountTriple] = []
+        self.pending_results: deque[Future] = deque()
+
+    def update(self, hypotheses: DocumentInput, references: DocumentInput):
+        """
+        Adds one document to the evaluation.
+        :param hypotheses: the hypothesized parallelisms of the document,
+        as a `ParallelismDirectory` or as an array of token labels.
+        :param references: the ground truth parallelisms of the document, in either of the same forms.
+        """
+        evaluation_arguments: tuple = (
+            hypotheses, references, self.metric, self.scoring_kwargs, self.size_kwargs, self.assigner
+        )
+        if self.executor is None:
+            self._add_result(_evaluate_document(*evaluation_arguments))
+        else:
+            while len(self.pending_results) >= self.max_pending:
+                self._add_result(self.pending_results.popleft().result())
+            self.pending_results.append(self.executor.submit(_evaluate_document, *evaluation_arguments))
+            self._collect_results(wait=False)
+
+    def update_batch(self, hypotheses_batch: Iterable[DocumentInput], references_batch: Iterable[DocumentInput]):
+        """
+        Adds several documents to the evaluation, pairing hypotheses and references in order.
+        :param hypotheses_batch: a collection of hypothesized parallelisms, one entry per document.
+        :param references_batch: a collection of ground truth parallelisms, one entry per document.
+        """
+        hypotheses_batch, references_batch = list(hypotheses_batch), list(references_batch)
+        if len(hypotheses_batch) != len(references_batch):
+            raise ValueError(f"The batch contains {len(hypotheses_batch)} hypotheses, "
+                             f"but it contains {len(references_batch)} references.")
+
+        for hypotheses, references in zip(hypotheses_batch, references_batch):
+            self.update(hypotheses, references)
+
+    def update_padded(self, hypothesis_labels: ArrayLike, reference_labels: ArrayLike,
+                      lengths: Optional[ArrayLike] = None):
+        """
+        Adds a padded batch of documents to the evaluation, such as a batch of a tagger's predictions and targets.
+        Each side of the batch is converted in a single call to `ArrayLoader.load_parallelism_directories`.
+        :param hypothesis_labels: the hypothesized token labels of the batch,
+        of shape `(documents, tokens, strata, 2)` or `(documents, tokens, 2)`.
+        :param reference_labels: the ground truth token labels of the batch, of the same shape.
+        :param lengths: the number of tokens in each document; tokens past the end of a document are ignored.
+        If it is not given, every document spans all of its tokens, so padding must be labeled with `-1`.
+        """
+        hypotheses_batch: list[ParallelismDirectory] = \
+            ArrayLoader.load_parallelism_directories(hypothesis_labels, lengths)
+        references_batch: list[ParallelismDirectory] = \
+            ArrayLoader.load_parallelism_directories(reference_labels, lengths)
+        self.update_batch(hypotheses_batch, references_batch)
+
+    def compute(self, wait: bool = True) -> Sequence[float]:
+        """
+        Computes the micro-averaged precision, recall, and F-score of every document evaluated so far.
+        :param wait: a `bool` indicating whether documents still being evaluated should be waited for.
+        If `False`, only documents which have already finished are included.
+        :return: a 3-tuple containing the micro-averaged precision, recall, and F-score.
+        """
+        return self.get_confusion_matrix(wait).get_statistics(self.beta)
+
+    def get_confusion_matrix(self, wait: bool = True) -> ReducedConfusionMatrix:
+        """
+        Collects the summed score and sizes of every document evaluated so far.
+        :param wait: a `bool` indicating whether documents still being evaluated should be waited for.
+        :return: a new `ReducedConfusionMatrix` holding the running totals.
+        """
+        self._collect_results(wait)
+        return ReducedConfusionMatrix() + self.total_matrix
+
+    def get_results(self, wait: bool = True) -> ConfusionMatrixBatch:
+        """
+        Collects the result of each document evaluated so far, in the order in which they were received.
+        This is only available if the evaluator was created with *keep_results* set.
+        :param wait: a `bool` indicating whether documents still being evaluated should be waited for.
+        :return: a `ConfusionMatrixBatch` with one entry per document.
+        """
+        if self.keep_results is False:
+            raise ValueError("Per-document results are only kept if the evaluator is created with keep_results=True.")
+
+        self._collect_results(wait)
+        return ConfusionMatrixBatch(*zip(*self.results)) if len(self.results) > 0 else ConfusionMatrixBatch()
+
+    def reset(self):
+        """
+        Discards all results, waiting for any documents still being evaluated.
+        """
+        self._collect_results(wait=True)
+        self.total_matrix = ReducedConfusionMatrix()
+        self.document_count = 0
+        self.results = []
+
+    def _collect_results(self, wait: bool):
+        # Results are collected in submission order, so kept results line up with the documents received.
+        while len(self.pending_results) > 0 and (wait is True or self.pending_results[0].done()):
+            self._add_result(self.pending_results.popleft().result())
+
+    def _add_result(self, counts: CountTriple):
+        self.total_matrix.score += counts[0]
+        self.total_matrix.hypothesis_count += counts[1]
+        self.total_matrix.reference_count += counts[2]
+        self.document_count += 1
+        if self.keep_results is True:
+            self.results.append(counts)
+
+
+def _evaluate_document(hypotheses: DocumentInput, references: DocumentInput, metric: EvaluationMetric,
+                       scoring_kwargs: dict[str, Any], size_kwargs: dict[str, Any],
+                       assigner: Type[LinearSumAssigner]) -> CountTriple:
+    # This is defined at the module level so that process pools can pickle it;
+    # it returns only the three counts, which are all that must be sent back.
+    hypotheses = hypotheses if isinstance(hypotheses, dict) else ArrayLoader.load_parallelism_directory(hypotheses)
+    references = references if isinstance(references, dict) else ArrayLoader.load_parallelism_directory(references)
+    confusion_matrix, _ = evaluate_bipartite_parallelism_metric(
+        hypotheses, references, metric, scoring_kwargs, size_kwargs, assigner, keep_scoring_matrix=False
+    )
+    return confusion_matrix.score, confusion_matrix.hypothesis_count, confusion_matrix.reference_count
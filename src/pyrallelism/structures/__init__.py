@@ -1,2 +1,3 @@
+from .alignment import Alignment
 from .confusion_matrix import ReducedConfusionMatrix
-
+from .confusion_matrix_batch import ConfusionMatrixBatch
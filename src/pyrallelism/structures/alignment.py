@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from typing import Any, Iterator, Sequence
+
+from numpy import asarray, int64
+from numpy.typing import ArrayLike, NDArray
+
+from ..primitives.typing import ParallelismDirectory
+
+
+class Alignment:
+    """
+    .. py:class:: Alignment
+    Data structure class to record which hypothesis parallelisms were matched to which reference parallelisms.
+    Each match is stored as a position in three aligned one-dimensional `int64` arrays:
+    the hypothesis's key in its `ParallelismDirectory`, the reference's key in its `ParallelismDirectory`,
+    and the score of the pair. Only matches with nonzero scores are kept;
+    in particular, matches involving the padding rows or columns of a square scoring matrix are discarded.
+    """
+    __slots__ = ("hypothesis_ids", "reference_ids", "scores")
+
+    def __init__(self, hypothesis_ids: ArrayLike = (), reference_ids: ArrayLike = (), scores: ArrayLike = ()):
+        """
+        :param hypothesis_ids: a one-dimensional collection of `int` hypothesis parallelism identifiers.
+        :param reference_ids: a one-dimensional collection of `int` reference parallelism identifiers.
+        :param scores: a one-dimensional collection of `int` scores, one per matched pair.
+        All three collections must have the same length.
+        """
+        self.hypothesis_ids: NDArray[int] = asarray(hypothesis_ids, dtype=int64)
+        self.reference_ids: NDArray[int] = asarray(reference_ids, dtype=int64)
+        self.scores: NDArray[int] = asarray(scores, dtype=int64)
+
+        if not (self.hypothesis_ids.shape == self.reference_ids.shape == self.scores.shape == (len(self.scores),)):
+            raise ValueError("The identifiers and scores of an Alignment must be one-dimensional and of equal length.")
+
+    @classmethod
+    def from_entries(cls, hypotheses: ParallelismDirectory, references: ParallelismDirectory,
+                     entries: Sequence[tuple[int, int]], terms: Sequence[int]) -> Alignment:
+        """
+        Maps the entries of a matching over a scoring matrix back to the keys of the directories that produced it.
+        :param hypotheses: the `ParallelismDirectory` whose parallelisms index the rows of the scoring matrix.
+        :param references: the `ParallelismDirectory` whose parallelisms index the columns of the scoring matrix.
+        :param entries: a sequence of (row, column) indices to the scoring matrix which form the matching.
+        :param terms: the score of each entry, in the same order as *entries*.
+        :return: a new `Alignment` containing every matched pair with a nonzero score.
+        """
+        hypothesis_keys: list[int] = list(hypotheses.keys())
+        reference_keys: list[int] = list(references.keys())
+
+        hypothesis_ids: list[int] = []
+        reference_ids: list[int] = []
+        scores: list[int] = []
+        for (row_index, column_index), term in zip(entries, terms):
+            if term != 0 and row_index < len(hypothesis_keys) and column_index < len(reference_keys):
+                hypothesis_ids.append(hypothesis_keys[row_index])
+                reference_ids.append(reference_keys[column_index])
+                scores.append(int(term))
+        return cls(hypothesis_ids, reference_ids, scores)
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def __iter__(self) -> Iterator[tuple[int, int, int]]:
+        yield from zip(self.hypothesis_ids.tolist(), self.reference_ids.tolist(), self.scores.tolist())
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Converts the `Alignment` into a `dict` of `list` objects, suitable for serialization.
+        :return: a `dict` mapping `hypothesis_ids`, `reference_ids`, and `scores` to lists of `int` values.
+        """
+        return {attribute: getattr(self, attribute).tolist() for attribute in self.__slots__}
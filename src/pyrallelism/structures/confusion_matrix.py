@@ -11,6 +11,8 @@ class ReducedConfusionMatrix:
     This class is intended to compute and display precision, recall, and the F-\u03B2 scores.
     Moreover, it can aggregate such metrics across multiple individual matrices.
     """
+    __slots__ = ("score", "hypothesis_count", "reference_count")
+
     def __init__(self):
         super().__init__()
         self.score: int = 0
@@ -136,17 +138,14 @@ class ReducedConfusionMatrix:
         f_score: Optional[float] = self.calculate_f_score(beta)
         return precision, recall, f_score
 
-    def get_printable_statistics(self, output_format: str, beta: float = 1) -> str:
+    def get_statistics_mapping(self, beta: float = 1) -> dict[str, Optional[float]]:
         """
-        Collects and returns a string containing all available statistics from the `ReducedConfusionMatrix`,
-        outputting them in a provided form.
-        :param output_format: a `str` which corresponds to a desired format for the data.
-        All values are given by their names as indicated throughout the class,
-        so any custom format strings should use those names to insert those values into them.
+        Collects and returns all available statistics from the `ReducedConfusionMatrix`, keyed by name.
         :param beta: an optional positive `float` weight given to precision and recall.
         The default value is `1`, which weights precision and recall equally.
         Values higher than `1` favor recall, whereas values lower than `1` favor precision.
-        :return: a `float` indicating the F-score metric of the current `ReducedConfusionMatrix` object.
+        :return: a `dict` mapping the names `score`, `hypothesis_count`, `reference_count`, `precision`, `recall`,
+        `f_score`, and `beta` to their values for the current `ReducedConfusionMatrix` object.
         """
         precision: Optional[float] = self.calculate_precision()
         recall: Optional[float] = self.calculate_recall()
@@ -161,6 +160,20 @@ class ReducedConfusionMatrix:
             "f_score": f_score,
             "beta": beta
         }
+        return stats_display_kwargs
 
+    def get_printable_statistics(self, output_format: str, beta: float = 1) -> str:
+        """
+        Collects and returns a string containing all available statistics from the `ReducedConfusionMatrix`,
+        outputting them in a provided form.
+        :param output_format: a `str` which corresponds to a desired format for the data.
+        All values are given by their names as indicated throughout the class,
+        so any custom format strings should use those names to insert those values into them.
+        :param beta: an optional positive `float` weight given to precision and recall.
+        The default value is `1`, which weights precision and recall equally.
+        Values higher than `1` favor recall, whereas values lower than `1` favor precision.
+        :return: a `float` indicating the F-score metric of the current `ReducedConfusionMatrix` object.
+        """
+        stats_display_kwargs: dict[str, Optional[float]] = self.get_statistics_mapping(beta)
         stat_results: str = output_format.format(**stats_display_kwargs)
         return stat_results
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+from typing import Iterable, Iterator, Sequence, Union
+
+from numpy import asarray, concatenate, float64, int64, ndim, zeros
+from numpy.typing import ArrayLike, NDArray
+
+from .confusion_matrix import ReducedConfusionMatrix
+
+
+class ConfusionMatrixBatch:
+    """
+    .. py:class:: ConfusionMatrixBatch
+    Data structure class to hold many `ReducedConfusionMatrix` values at once, one per document (or other unit).
+    Each of the three counts is stored in its own one-dimensional `int64` array,
+    so precision, recall, and F-β scores are computed for all documents (and for one or many values of β)
+    with array operations rather than per-object method calls.
+    Zero and negative counts are handled exactly as in `ReducedConfusionMatrix`.
+    The batch also computes corpus-level statistics:
+    *micro*-averaged statistics are computed from the summed counts, whereas
+    *macro*-averaged statistics are the means of the per-document statistics.
+    """
+    __slots__ = ("scores", "hypothesis_counts", "reference_counts")
+
+    def __init__(self, scores: ArrayLike = (), hypothesis_counts: ArrayLike = (), reference_counts: ArrayLike = ()):
+        """
+        :param scores: a one-dimensional collection of `int` matching scores.
+        :param hypothesis_counts: a one-dimensional collection of `int` hypothesis sizes.
+        :param reference_counts: a one-dimensional collection of `int` reference sizes.
+        All three collections must have the same length.
+        """
+        self.scores: NDArray[int] = asarray(scores, dtype=int64)
+        self.hypothesis_counts: NDArray[int] = asarray(hypothesis_counts, dtype=int64)
+        self.reference_counts: NDArray[int] = asarray(reference_counts, dtype=int64)
+
+        if not (self.scores.ndim == self.hypothesis_counts.ndim == self.reference_counts.ndim == 1):
+            raise ValueError("The scores and counts of a ConfusionMatrixBatch must be one-dimensional.")
+        elif not (len(self.scores) == len(self.hypothesis_counts) == len(self.reference_counts)):
+            raise ValueError("The scores and counts of a ConfusionMatrixBatch must have the same length.")
+
+    @classmethod
+    def from_matrices(cls, matrices: Iterable[ReducedConfusionMatrix]) -> ConfusionMatrixBatch:
+        """
+        Gathers a collection of `ReducedConfusionMatrix` instances into a batch.
+        :param matrices: the `ReducedConfusionMatrix` instances to be gathered, in order.
+        :return: a new `ConfusionMatrixBatch` with one entry per matrix.
+        """
+        counts: NDArray[int] = asarray(
+            [(matrix.score, matrix.hypothesis_count, matrix.reference_count) for matrix in matrices], dtype=int64
+        ).reshape((-1, 3))
+        return cls(counts[:, 0], counts[:, 1], counts[:, 2])
+
+    @classmethod
+    def concatenate(cls, batches: Iterable[ConfusionMatrixBatch]) -> ConfusionMatrixBatch:
+        """
+        Joins a collection of batches end to end.
+        :param batches: the `ConfusionMatrixBatch` instances to be joined, in order.
+        :return: a new `ConfusionMatrixBatch` containing the entries of every batch.
+        """
+        batches = tuple(batches)
+        new_batch: ConfusionMatrixBatch = cls(*[
+            concatenate([getattr(batch, attribute) for batch in batches]) if len(batches) > 0 else ()
+            for attribute in cls.__slots__
+        ])
+        return new_batch
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def __getitem__(self, index: Union[int, slice, Sequence[int], NDArray]) -> \
+            Union[ReducedConfusionMatrix, ConfusionMatrixBatch]:
+        """
+        Selects one entry of the batch as a `ReducedConfusionMatrix` or several entries as a new batch.
+        :param index: an `int` index, a `slice`, or an array of indices or `bool` values.
+        :return: a `ReducedConfusionMatrix` if *index* is an `int`; otherwise, a `ConfusionMatrixBatch`.
+        """
+        if ndim(index) == 0 and not isinstance(index, slice):
+            matrix: ReducedConfusionMatrix = ReducedConfusionMatrix()
+            matrix.score = int(self.scores[index])
+            matrix.hypothesis_count = int(self.hypothesis_counts[index])
+            matrix.reference_count = int(self.reference_counts[index])
+            return matrix
+        else:
+            return ConfusionMatrixBatch(self.scores[index], self.hypothesis_counts[index], self.reference_counts[index])
+
+    def __iter__(self) -> Iterator[ReducedConfusionMatrix]:
+        for index in range(0, len(self)):
+            yield self[index]
+
+    def __add__(self, other: ConfusionMatrixBatch) -> ConfusionMatrixBatch:
+        """
+        Adds two `ConfusionMatrixBatch` instances of the same length together, entry by entry.
+        :param other: the second operand of the `ConfusionMatrixBatch` addition.
+        :return: a new `ConfusionMatrixBatch` with summed entries.
+        """
+        if isinstance(other, ConfusionMatrixBatch) and len(other) == len(self):
+            new_batch: ConfusionMatrixBatch = ConfusionMatrixBatch(
+                self.scores + other.scores,
+                self.hypothesis_counts + other.hypothesis_counts,
+                self.reference_counts + other.reference_counts
+            )
+        else:
+            raise TypeError(f"The value <{other}> is not a ConfusionMatrixBatch of length {len(self)}.")
+        return new_batch
+
+    def __iadd__(self, other: ConfusionMatrixBatch) -> ConfusionMatrixBatch:
+        """
+        Adds two `ConfusionMatrixBatch` instances of the same length together, entry by entry and in-place.
+        :param other: the second operand of the `ConfusionMatrixBatch` addition.
+        :return: the current `ConfusionMatrixBatch` object.
+        """
+        if isinstance(other, ConfusionMatrixBatch) and len(other) == len(self):
+            self.scores += other.scores
+            self.hypothesis_counts += other.hypothesis_counts
+            self.reference_counts += other.reference_counts
+        else:
+            raise TypeError(f"The value <{other}> is not a ConfusionMatrixBatch of length {len(self)}.")
+        return self
+
+    def sum(self) -> ReducedConfusionMatrix:
+        """
+        Sums every entry of the batch into a single `ReducedConfusionMatrix`.
+        :return: a new `ReducedConfusionMatrix` containing the summed score and counts.
+        """
+        total_matrix: ReducedConfusionMatrix = ReducedConfusionMatrix()
+        total_matrix.score = int(self.scores.sum())
+        total_matrix.hypothesis_count = int(self.hypothesis_counts.sum())
+        total_matrix.reference_count = int(self.reference_counts.sum())
+        return total_matrix
+
+    def calculate_precisions(self) -> NDArray[float]:
+        """
+        Calculates the precision of each entry, as `ReducedConfusionMatrix.calculate_precision` would.
+        :return: a one-dimensional `NDArray` of `float` precision values.
+        """
+        return self._calculate_ratios(self.hypothesis_counts, "hypotheses")
+
+    def calculate_recalls(self) -> NDArray[float]:
+        """
+        Calculates the recall of each entry, as `ReducedConfusionMatrix.calculate_recall` would.
+        :return: a one-dimensional `NDArray` of `float` recall values.
+        """
+        return self._calculate_ratios(self.reference_counts, "references")
+
+    def calculate_f_scores(self, beta: Union[float, Sequence[float]] = 1) -> NDArray[float]:
+        """
+        Calculates the F-score of each entry, as `ReducedConfusionMatrix.calculate_f_score` would.
+        :param beta: a positive `float` weight given to precision and recall, or a sequence of such weights.
+        :return: an `NDArray` of `float` F-scores. If *beta* is a single value, the array is one-dimensional;
+        otherwise, it has shape `(len(beta), len(self))`, with one row per value of β.
+        """
+        return self.combine_f_scores(self.calculate_precisions(), self.calculate_recalls(), beta)
+
+    def get_statistics(self, beta: Union[float, Sequence[float]] = 1) -> \
+            tuple[NDArray[float], NDArray[float], NDArray[float]]:
+        """
+        Collects the per-entry `precision`, `recall`, and `f_score` values of the batch.
+        :param beta: a positive `float` weight given to precision and recall, or a sequence of such weights.
+        :return: a 3-tuple of `NDArray` objects containing precision values, recall values, and
+        F-scores (shaped as described in `calculate_f_scores`).
+        """
+        precisions: NDArray[float] = self.calculate_precisions()
+        recalls: NDArray[float] = self.calculate_recalls()
+        f_scores: NDArray[float] = self.combine_f_scores(precisions, recalls, beta)
+        return precisions, recalls, f_scores
+
+    def get_micro_statistics(self, beta: Union[float, Sequence[float]] = 1) -> \
+            tuple[float, float, Union[float, NDArray[float]]]:
+        """
+        Computes micro-averaged statistics: the precision, recall, and F-score of the summed counts.
+        :param beta: a positive `float` weight given to precision and recall, or a sequence of such weights.
+        :return: a 3-tuple containing the micro-averaged precision, recall, and F-score;
+        the F-score is a one-dimensional `NDArray` (with one value per β) if *beta* is a sequence.
+        """
+        total_batch: ConfusionMatrixBatch = ConfusionMatrixBatch(
+            [self.scores.sum()], [self.hypothesis_counts.sum()], [self.reference_counts.sum()]
+        )
+        precisions, recalls, f_scores = total_batch.get_statistics(beta)
+        return float(precisions[0]), float(recalls[0]), f_scores[..., 0] if ndim(beta) > 0 else float(f_scores[0])
+
+    def get_macro_statistics(self, beta: Union[float, Sequence[float]] = 1) -> \
+            tuple[float, float, Union[float, NDArray[float]]]:
+        """
+        Computes macro-averaged statistics: the means of the per-entry precision values, recall values, and F-scores.
+        An empty batch has macro-averaged statistics of `0.0`, following the zero-denominator convention
+        of `ReducedConfusionMatrix`.
+        :param beta: a positive `float` weight given to precision and recall, or a sequence of such weights.
+        :return: a 3-tuple containing the macro-averaged precision, recall, and F-score;
+        the F-score is a one-dimensional `NDArray` (with one value per β) if *beta* is a sequence.
+        """
+        precisions, recalls, f_scores = self.get_statistics(beta)
+        if len(self) == 0:
+            return 0.0, 0.0, zeros(len(beta), dtype=float64) if ndim(beta) > 0 else 0.0
+
+        macro_f_scores: Union[float, NDArray[float]] = f_scores.mean(axis=-1) if ndim(beta) > 0 \
+            else float(f_scores.mean())
+        return float(precisions.mean()), float(recalls.mean()), macro_f_scores
+
+    def _calculate_ratios(self, counts: NDArray[int], count_name: str) -> NDArray[float]:
+        if (counts < 0).any():
+            raise ValueError(f"The sum of all {count_name} is negative, which should not be possible.")
+        elif (self.scores[counts > 0] < 0).any():
+            raise ValueError("The score is negative, which should not be possible.")
+
+        ratios: NDArray[float] = zeros(len(self), dtype=float64)
+        has_count: NDArray[bool] = counts > 0
+        ratios[has_count] = self.scores[has_count] / counts[has_count]
+        return ratios
+
+    @staticmethod
+    def combine_f_scores(precisions: NDArray[float], recalls: NDArray[float],
+                         beta: Union[float, Sequence[float]]) -> NDArray[float]:
+        """
+        Combines aligned precision and recall values into F-scores, with the zero-denominator convention
+        of `ReducedConfusionMatrix`.
+        :param precisions: a one-dimensional `NDArray` of `float` precision values.
+        :param recalls: a one-dimensional `NDArray` of `float` recall values, aligned with *precisions*.
+        :param beta: a positive `float` weight given to precision and recall, or a sequence of such weights.
+        :return: an `NDArray` of F-scores shaped as described in `calculate_f_scores`.
+        """
+        betas: NDArray[float] = asarray(beta, dtype=float64)
+        if (betas <= 0).any():
+            raise ValueError(f"The given value of beta, <{beta}> is not positive.")
+
+        squared_betas: NDArray[float] = betas.reshape((-1, 1)) ** 2
+        f_score_numerators: NDArray[float] = (1 + squared_betas) * (precisions * recalls)
+        f_score_denominators: NDArray[float] = (squared_betas * precisions) + recalls
+        f_scores: NDArray[float] = zeros(f_score_denominators.shape, dtype=float64)
+        # Since precision and recall are nonnegative, a zero denominator means that both are zero.
+        is_nonzero: NDArray[bool] = f_score_denominators > 0
+        f_scores[is_nonzero] = f_score_numerators[is_nonzero] / f_score_denominators[is_nonzero]
+        return f_scores if betas.ndim > 0 else f_scores[0]
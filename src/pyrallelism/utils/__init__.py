@@ -1 +1,3 @@
-from .output_format import DefinedFormat, get_output_type, OutputFormat
+from .alignment_writer import AlignmentWriter, get_alignment_writer
+from .output_format import DefinedFormat, OutputFormat
+from .result_sink import get_result_sink, ResultSink
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from json import dumps
+from types import TracebackType
+from typing import Optional, TextIO, Type
+
+from numpy import array, concatenate, cumsum, int64, savez
+from numpy.typing import NDArray
+
+from .output_format import DefinedFormat
+from ..structures.alignment import Alignment
+
+
+class AlignmentWriter:
+    """
+    .. py:class:: AlignmentWriter
+    Base class for writing the `Alignment` computed for each pair of hypothesis and reference data to a file,
+    so that which parallelisms were matched can be inspected without repeating the evaluation.
+    """
+    filetype: str = ""
+
+    def __init__(self, output_filepath: str):
+        """
+        :param output_filepath: a path (with no file extension) at which alignments will be written.
+        The writer's `filetype` is appended as the extension.
+        """
+        self.output_filepath: str = f"{output_filepath}.{self.filetype}"
+
+    def __enter__(self) -> AlignmentWriter:
+        return self
+
+    def __exit__(self, exception_type: Optional[Type[BaseException]], exception: Optional[BaseException],
+                 traceback: Optional[TracebackType]):
+        self.close()
+
+    def write_alignment(self, filenames: dict[str, str], alignment: Alignment):
+        """
+        Writes the alignment for one pair of hypothesis and reference data.
+        :param filenames: a `dict` naming the paired data with the keys *hypothesis_filename* and *reference_filename*.
+        :param alignment: the `Alignment` computed for the paired data.
+        """
+        raise NotImplementedError
+
+    def close(self):
+        raise NotImplementedError
+
+
+class JSONLinesAlignmentWriter(AlignmentWriter):
+    """
+    .. py:class:: JSONLinesAlignmentWriter
+    Subclass of `AlignmentWriter` which writes one JSON object per pair of data, flushing after every line.
+    Each object holds the pair's filenames alongside the lists `hypothesis_ids`, `reference_ids`, and `scores`.
+    """
+    filetype: str = DefinedFormat.JSON_LINES
+
+    def __init__(self, output_filepath: str):
+        super().__init__(output_filepath)
+        self.output_file: TextIO = open(self.output_filepath, encoding="utf-8", mode="w+")
+
+    def write_alignment(self, filenames: dict[str, str], alignment: Alignment):
+        self.output_file.write(f"{dumps({**filenames, **alignment.to_dict()})}\n")
+        self.output_file.flush()
+
+    def close(self):
+        self.output_file.close()
+
+
+class NPZAlignmentWriter(AlignmentWriter):
+    """
+    .. py:class:: NPZAlignmentWriter
+    Subclass of `AlignmentWriter` which writes every alignment into NumPy's `.npz` format.
+    The matches of all pairs are concatenated into the `int64` arrays `hypothesis_ids`, `reference_ids`, and `scores`;
+    the matches of pair `k` lie between `pair_offsets[k]` and `pair_offsets[k + 1]`,
+    and the pair is named by `hypothesis_filenames[k]` and `reference_filenames[k]`.
+    Because the format is columnar, the file is only written when the writer is closed.
+    """
+    filetype: str = DefinedFormat.NPZ
+
+    def __init__(self, output_filepath: str):
+        super().__init__(output_filepath)
+        self.filenames: list[dict[str, str]] = []
+        self.alignments: list[Alignment] = []
+
+    def write_alignment(self, filenames: dict[str, str], alignment: Alignment):
+        self.filenames.append(filenames)
+        self.alignments.append(alignment)
+
+    def close(self):
+        alignment_arrays: dict[str, NDArray] = {
+            attribute: concatenate(
+                [array((), dtype=int64)] + [getattr(alignment, attribute) for alignment in self.alignments]
+            )
+            for attribute in Alignment.__slots__
+        }
+        pair_offsets: NDArray[int] = concatenate(
+            ([0], cumsum([len(alignment) for alignment in self.alignments], dtype=int64))
+        ).astype(int64)
+        savez(
+            self.output_filepath, **alignment_arrays, pair_offsets=pair_offsets,
+            hypothesis_filenames=array([filenames["hypothesis_filename"] for filenames in self.filenames], dtype=str),
+            reference_filenames=array([filenames["reference_filename"] for filenames in self.filenames], dtype=str)
+        )
+
+
+ALIGNMENT_WRITER_TABLE: dict[str, Type[AlignmentWriter]] = {
+    DefinedFormat.JSON_LINES: JSONLinesAlignmentWriter,
+    DefinedFormat.NPZ: NPZAlignmentWriter
+}
+
+
+def get_alignment_writer(format_name: str) -> Type[AlignmentWriter]:
+    try:
+        writer: Type[AlignmentWriter] = ALIGNMENT_WRITER_TABLE[format_name]
+    except KeyError:
+        raise ValueError(f"The alignment format <{format_name}> is not recognized.")
+    return writer
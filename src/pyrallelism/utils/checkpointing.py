@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+from json import dumps, JSONDecodeError, loads
+from multiprocessing import get_all_start_methods, get_context
+from multiprocessing.connection import Connection
+from os import fsync, path
+from types import TracebackType
+from typing import Any, Callable, Optional, TextIO, Type
+
+JOURNAL_FORMAT_VERSION: int = 1
+COMPLETE_STATUS: str = "complete"
+QUARANTINED_STATUS: str = "quarantined"
+
+
+class PairQuarantinedError(Exception):
+    """
+    .. py:class:: PairQuarantinedError
+    Raised when the evaluation of a file pair exceeds its resource limits or fails in its separate process.
+    """
+    pass
+
+
+class CheckpointJournal:
+    """
+    .. py:class:: CheckpointJournal
+    Records the outcome of each evaluated file pair in an append-only JSON Lines file, so that an interrupted
+    evaluation can be resumed without repeating finished work. The journal begins with a *header* record
+    describing the evaluation; each later record holds one pair's position, filenames, content fingerprint,
+    and either its result or the reason it was quarantined. Every record is written with a single call,
+    flushed, and synced to disk before the evaluation continues, and an incomplete final record
+    (as left by an interruption mid-write) is discarded when the journal is reopened.
+    """
+    def __init__(self, journal_filepath: str, metadata: dict[str, Any], resume: bool = False):
+        """
+        :param journal_filepath: the path at which the journal is stored.
+        :param metadata: a `dict` describing the evaluation (its metric, inputs, and other settings).
+        A journal can only be resumed by an evaluation with identical metadata.
+        :param resume: a `bool` indicating whether an existing journal should be resumed.
+        If `False`, or if no journal exists, a new journal is started.
+        """
+        self.journal_filepath: str = journal_filepath
+        self.records: dict[int, dict[str, Any]] = {}
+        header: dict[str, Any] = {"record": "header", "version": JOURNAL_FORMAT_VERSION, **metadata}
+
+        if resume is True and path.exists(journal_filepath):
+            valid_length: int = self._read_journal(header)
+            self.journal_file: TextIO = open(journal_filepath, encoding="utf-8", mode="r+")
+            self.journal_file.seek(valid_length)
+            self.journal_file.truncate()
+        else:
+            self.journal_file = open(journal_filepath, encoding="utf-8", mode="w+")
+            self._write_record(header)
+
+    def __enter__(self) -> CheckpointJournal:
+        return self
+
+    def __exit__(self, exception_type: Optional[Type[BaseException]], exception: Optional[BaseException],
+                 traceback: Optional[TracebackType]):
+        self.journal_file.close()
+
+    def get_record(self, pair_index: int, filenames: dict[str, str], fingerprint: str) -> Optional[dict[str, Any]]:
+        """
+        Looks up a file pair which was already evaluated.
+        :param pair_index: the position of the file pair among all file pairs being evaluated.
+        :param filenames: a `dict` naming the paired data with the keys *hypothesis_filename* and *reference_filename*.
+        :param fingerprint: a digest of the pair's contents, as computed by `fingerprint_directories`.
+        :return: the journal's record for the pair, or `None` if the pair was not journaled with the same
+        filenames and contents.
+        """
+        record: Optional[dict[str, Any]] = self.records.get(pair_index)
+        if record is not None and record["fingerprint"] == fingerprint and \
+                all([record[key] == value for key, value in filenames.items()]):
+            return record
+        else:
+            return None
+
+    def write_record(self, record: dict[str, Any]):
+        """
+        Durably appends a pair record, as created by `create_pair_record` or `create_quarantine_record`.
+        :param record: the pair record to be appended.
+        """
+        self._write_record(record)
+        self.records[record["pair_index"]] = record
+
+    def _read_journal(self, header: dict[str, Any]) -> int:
+        valid_length: int = 0
+        with open(self.journal_filepath, encoding="utf-8", mode="r", newline="") as journal_file:
+            for line_index, line in enumerate(journal_file):
+                try:
+                    record: dict[str, Any] = loads(line) if line.endswith("\n") else None
+                except JSONDecodeError:
+                    record = None
+
+                if record is None:
+                    break
+                elif line_index == 0 and record != header:
+                    raise ValueError(f"The journal <{self.journal_filepath}> was produced by a different evaluation; "
+                                     f"it cannot be resumed.")
+                elif line_index > 0:
+                    self.records[record["pair_index"]] = record
+                valid_length += len(line.encode("utf-8"))
+
+        if valid_length == 0:
+            raise ValueError(f"The journal <{self.journal_filepath}> has no header; it cannot be resumed.")
+        return valid_length
+
+    def _write_record(self, record: dict[str, Any]):
+        self.journal_file.write(f"{dumps(record)}\n")
+        self.journal_file.flush()
+        fsync(self.journal_file.fileno())
+
+
+def create_pair_record(pair_index: int, filenames: dict[str, str], fingerprint: Optional[str],
+                       counts: tuple[int, int, int], annotations: dict[str, Any],
+                       alignment: Optional[dict[str, list[int]]] = None) -> dict[str, Any]:
+    """
+    :param pair_index: the position of the file pair among all file pairs being evaluated.
+    :param filenames: a `dict` naming the paired data with the keys *hypothesis_filename* and *reference_filename*.
+    :param fingerprint: a digest of the pair's contents, as computed by `fingerprint_directories`, if it is needed.
+    :param counts: the score, hypothesis count, and reference count computed for the pair.
+    :param annotations: a `dict` containing any supplementary values for the result.
+    :param alignment: the pair's `Alignment` in `dict` form, if it is to be kept.
+    :return: a journal record for a completed pair.
+    """
+    score, hypothesis_count, reference_count = counts
+    return {
+        "record": "pair", "status": COMPLETE_STATUS, "pair_index": pair_index, **filenames,
+        "fingerprint": fingerprint, "score": score, "hypothesis_count": hypothesis_count,
+        "reference_count": reference_count, "annotations": annotations, "alignment": alignment
+    }
+
+
+def create_quarantine_record(pair_index: int, filenames: dict[str, str], fingerprint: Optional[str],
+                             reason: str) -> dict[str, Any]:
+    """
+    :param pair_index: the position of the file pair among all file pairs being evaluated.
+    :param filenames: a `dict` naming the paired data with the keys *hypothesis_filename* and *reference_filename*.
+    :param fingerprint: a digest of the pair's contents, as computed by `fingerprint_directories`, if it is needed.
+    :param reason: a `str` explaining why the pair was quarantined.
+    :return: a journal record for a quarantined pair.
+    """
+    return {
+        "record": "pair", "status": QUARANTINED_STATUS, "pair_index": pair_index, **filenames,
+        "fingerprint": fingerprint, "reason": reason
+    }
+
+
+def run_with_limits(function: Callable[..., Any], arguments: tuple, time_limit: Optional[float] = None,
+                    memory_limit: Optional[int] = None) -> Any:
+    """
+    Runs a function in a separate process whose running time and memory are limited,
+    so that a pathological input cannot stall or crash the calling process.
+    :param function: the function to be run; it and its result must be picklable
+    if processes cannot be forked on the current platform.
+    :param arguments: the positional arguments given to *function*.
+    :param time_limit: the largest number of seconds for which *function* may run, if any.
+    :param memory_limit: the largest number of megabytes of address space *function* may add, if any.
+    The limit is measured from the separate process's size when it starts, which (as a fork) includes the caller's;
+    where that size cannot be read from `/proc`, the limit covers the whole separate process instead.
+    Memory limits rely on the `resource` module, so they are only available on Unix-like platforms.
+    :return: the value returned by *function*.
+    :raises PairQuarantinedError: if *function* runs out of time or memory or fails in any other way.
+    """
+    start_method: str = "fork" if "fork" in get_all_start_methods() else "spawn"
+    context = get_context(start_method)
+    receiving_connection, sending_connection = context.Pipe(duplex=False)
+    process = context.Process(
+        target=_run_limited_function, args=(sending_connection, function, arguments, memory_limit), daemon=True
+    )
+    process.start()
+    sending_connection.close()
+
+    try:
+        if receiving_connection.poll(time_limit) is False:
+            raise PairQuarantinedError(f"The time limit of {time_limit} seconds was exceeded.")
+
+        try:
+            is_successful, outcome = receiving_connection.recv()
+        except EOFError:
+            raise PairQuarantinedError(f"The evaluation process exited unexpectedly (exit code {process.exitcode}).")
+
+        if is_successful is False:
+            raise PairQuarantinedError(outcome)
+        return outcome
+    finally:
+        if process.is_alive():
+            process.kill()
+        process.join()
+        receiving_connection.close()
+
+
+def _run_limited_function(connection: Connection, function: Callable[..., Any], arguments: tuple,
+                          memory_limit: Optional[int]):
+    try:
+        if memory_limit is not None:
+            from resource import RLIMIT_AS, setrlimit
+            memory_limit_bytes: int = _get_address_space_size() + memory_limit * 2 ** 20
+            setrlimit(RLIMIT_AS, (memory_limit_bytes, memory_limit_bytes))
+        outcome: tuple[bool, Any] = (True, function(*arguments))
+    except MemoryError:
+        outcome = (False, f"The memory limit of {memory_limit} megabytes was exceeded.")
+    except Exception as exception:
+        outcome = (False, f"The evaluation failed with {type(exception).__name__}: {exception}")
+
+    connection.send(outcome)
+    connection.close()
+
+
+def _get_address_space_size() -> int:
+    try:
+        with open("/proc/self/status", encoding="utf-8", mode="r") as status_file:
+            for status_line in status_file:
+                if status_line.startswith("VmSize:"):
+                    return int(status_line.split()[1]) * 2 ** 10
+    except OSError:
+        pass
+    return 0
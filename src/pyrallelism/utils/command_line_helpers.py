@@ -1,5 +1,5 @@
 from os import listdir
-from typing import Sequence, Type
+from typing import Iterator, Optional, Sequence, Type
 
 from natsort import natsorted
 
@@ -18,3 +18,41 @@ def collect_directories(directory_filepath: str, loader: Type[BaseParallelismLoa
     parallelism_directories: Sequence[ParallelismDirectory] = tuple(parallelism_directories)
     return sorted_filenames, parallelism_directories
 
+
+def stream_directory_pairs(hypothesis_filepath: str, reference_filepath: str,
+                           hypothesis_loader: Type[BaseParallelismLoader],
+                           reference_loader: Type[BaseParallelismLoader], **kwargs) -> \
+        Iterator[tuple[dict[str, str], ParallelismDirectory, ParallelismDirectory]]:
+    """
+    Lazily pairs the documents of a hypothesis file with the documents of a reference file in order of appearance.
+    :param hypothesis_filepath: the path to a file containing one or more hypothesis documents.
+    :param reference_filepath: the path to a file containing one or more reference documents.
+    :param hypothesis_loader: the loader class used to read *hypothesis_filepath*.
+    :param reference_loader: the loader class used to read *reference_filepath*.
+    :param kwargs: a collection of keyword arguments meant to modify the creation of each `ParallelismDirectory`.
+    :return: an iterator over 3-tuples containing a `dict` naming the paired documents
+    (with the keys *hypothesis_filename* and *reference_filename*),
+    the hypothesis `ParallelismDirectory`, and the reference `ParallelismDirectory`.
+    """
+    hypothesis_stream: Iterator[tuple[str, ParallelismDirectory]] = \
+        hypothesis_loader.stream_parallelism_directories(hypothesis_filepath, **kwargs)
+    reference_stream: Iterator[tuple[str, ParallelismDirectory]] = \
+        reference_loader.stream_parallelism_directories(reference_filepath, **kwargs)
+
+    for hypothesis_document in hypothesis_stream:
+        reference_document: Optional[tuple[str, ParallelismDirectory]] = next(reference_stream, None)
+        if reference_document is None:
+            break
+
+        hypothesis_name, hypotheses = hypothesis_document
+        reference_name, references = reference_document
+        paired_filenames: dict[str, str] = \
+            {"hypothesis_filename": hypothesis_name, "reference_filename": reference_name}
+        yield paired_filenames, hypotheses, references
+    else:
+        if next(reference_stream, None) is None:
+            return
+
+    raise NotImplementedError(f"The files <{hypothesis_filepath}> and <{reference_filepath}> contain "
+                              f"an unequal number of documents. "
+                              f"Document matching behavior is currently not implemented under such conditions.")
@@ -8,6 +8,49 @@ LOADERS_HELP: str = "A collection of one or two loaders used to load relevant da
                     "if two are given, they are used for the hypothesis and reference in that order."
 METRICS_HELP: str = "A predefined metric to compute over the given hypothesis and reference data."
 OUTPUT_PATH_HELP: str = "A path to an output file used to store results of the metric's computations."
-OUTPUT_TYPE_HELP: str = "The type (and format) of output file that will be used to store metric results."
+OUTPUT_TYPE_HELP: str = "The type (and format) of output file that will be used to store metric results. " \
+                        "Results are written as each pair is evaluated, followed by micro- and macro-averaged totals."
 STRATUM_COUNT_HELP: str = "The number of strata to which the given bipartite parallelism metrics should attend. " \
                         "If no value is supplied, the stratum count is inferred from the data."
+MULTI_DOCUMENT_HELP: str = "A flag indicating that each input file may contain multiple documents. " \
+                          "Documents are streamed from each file one at a time and paired in order of appearance."
+CONVERSION_INPUT_HELP: str = "A valid file or directory path to data which will be converted into a binary bundle. " \
+                            "If a directory is given, every document of every file within it is included."
+CONVERSION_OUTPUT_HELP: str = "A path at which the resulting binary bundle (an .npz file) will be written."
+CONVERSION_LOADER_HELP: str = "The loader used to read the data being converted."
+MATCHING_HELP: str = "The bipartite matching procedure used to pair hypotheses with references. " \
+                     "The exact matching is optimal but cubic in the number of parallelisms; " \
+                     "the approximate matching is greedy, scores only overlapping parallelisms, and " \
+                     "reports an upper bound on the exact score (at most twice its own) alongside each result."
+SHARD_HELP: str = "A shard of the file pairs to evaluate, given as <i/N> with 0 <= i < N. " \
+                  "Pair k is evaluated by shard k mod N. Alongside the usual outputs, " \
+                  "partial results are written to <OUTPUT_FILEPATH>.partial.jsonl for the merge subcommand."
+PARTIAL_PATHS_HELP: str = "The partial result files (one per shard) produced by evaluations run with --shard."
+ALIGNMENT_PATH_HELP: str = "A path (with no file extension) at which to store the matched pairs of parallelisms " \
+                          "(by their identifiers, with their scores) for each evaluated pair of files. " \
+                          "If no value is supplied, alignments are not stored."
+ALIGNMENT_TYPE_HELP: str = "The type (and format) of file used to store alignments: either jsonl or npz."
+SCORE_CACHE_SIZE_HELP: str = "The number of recently scored pairs of parallelisms whose scores are remembered " \
+                             "and reused when the same pair (or, for predefined metrics, the same pair of shapes " \
+                             "at the same distance) recurs. If no positive value is supplied, scores are not cached."
+CHECKPOINT_HELP: str = "A flag indicating that the outcome of each evaluated pair of files should be " \
+                       "durably recorded in a journal at <OUTPUT_FILEPATH>.journal.jsonl as soon as it is computed."
+RESUME_HELP: str = "A flag indicating that an interrupted evaluation should be resumed from its journal (see " \
+                   "--checkpoint). Pairs recorded in the journal with the same names and contents are not evaluated " \
+                   "again; the journal must have been produced with the same metric and other settings."
+PAIR_TIME_LIMIT_HELP: str = "The largest number of seconds for which any pair of files may be evaluated. " \
+                            "Pairs which exceed the limit are quarantined: they are excluded from the results, " \
+                            "a warning is issued, and (with --checkpoint) they are not retried on resumption."
+PAIR_MEMORY_LIMIT_HELP: str = "The largest number of megabytes of address space which the evaluation of " \
+                              "any pair of files may use beyond the size of the process when the pair begins " \
+                              "(on Unix-like platforms only; without /proc, the limit covers the whole process). " \
+                              "Pairs which exceed the limit are quarantined, as with --pair-time-limit."
+ANYTIME_HELP: str = "A flag indicating that the micro-averaged statistics should be estimated from a growing, " \
+                    "stratified random sample of the file pairs in the given directories. After each batch of pairs, " \
+                    "the estimates and their confidence intervals are written to <OUTPUT_FILEPATH>.estimates.jsonl; " \
+                    "if allowed to finish, the estimates equal the exact results. No other outputs are written."
+CONFIDENCE_LEVEL_HELP: str = "The confidence level of the intervals reported by anytime evaluation (see --anytime)."
+SEED_HELP: str = "The seed for the random order in which anytime evaluation samples file pairs (see --anytime)."
+TARGET_WIDTH_HELP: str = "The confidence interval width at which anytime evaluation stops (see --anytime). " \
+                         "Evaluation stops once the intervals of precision, recall, and F-score are all this narrow."
+TIME_BUDGET_HELP: str = "The number of seconds after which anytime evaluation stops (see --anytime)."
@@ -7,27 +7,42 @@ class OutputFormat(NamedTuple):
     .. py:class:: OutputFormat
     Data-centric class for holding three general categories for filling out information pertaining to
     scoring with a bipartite parallelism metric.
+    An optional fourth category, `aggregate_header`, introduces corpus-level (micro- or macro-averaged) results.
+    Two further optional categories, `annotation_title` and `annotation`, extend the title and each line
+    with supplementary values (such as the upper bound of an approximate matching score); they are applied once
+    per supplementary value, using the keys `name` and `value`, just before the trailing newlines.
+    A final optional category, `macro_line`, replaces `line` for macro-averaged results, which have no counts;
+    if it is given, the (empty) annotations of macro-averaged results are not written.
     """
     filetype: str
     title: str
     header: str
     line: str
+    aggregate_header: str = ""
+    annotation_title: str = ""
+    annotation: str = ""
+    macro_line: str = ""
 
 
 class DefinedFormat(StrEnum):
     """
     .. py:class:: DefinedFormat
-    Enumeration class for the names and abbreviations of text formats predefined by the provided interface.
+    Enumeration class for the names and abbreviations of output formats predefined by the provided interface.
     """
     TEXT: str = "txt"
     CSV: str = "csv"
+    JSON_LINES: str = "jsonl"
+    NPZ: str = "npz"
 
 
 CSV_FORMAT: OutputFormat = OutputFormat(
     filetype=DefinedFormat.CSV,
     title="hypothesis_filename,reference_filename,score,hypothesis_count,reference_count,precision,recall,f_score\n",
     header="{hypothesis_filename},{reference_filename},",
-    line="{score},{hypothesis_count},{reference_count},{precision},{recall},{f_score}\n"
+    line="{score},{hypothesis_count},{reference_count},{precision},{recall},{f_score}\n",
+    aggregate_header="<{aggregate}>,<{aggregate}>,",
+    annotation_title=",{name}",
+    annotation=",{value}"
 )
 
 TEXT_FORMAT: OutputFormat = OutputFormat(
@@ -37,15 +52,11 @@ TEXT_FORMAT: OutputFormat = OutputFormat(
     line="\t* Precision: {precision} ({score} / {hypothesis_count})"
          "\n\t* Recall: {recall} ({score} / {reference_count})"
          "\n\t* F-{beta}: {f_score}"
-         "\n\n"
+         "\n\n",
+    aggregate_header="Corpus Results ({aggregate}-averaged):\n",
+    annotation="\n\t* {name}: {value}",
+    macro_line="\t* Precision: {precision}"
+               "\n\t* Recall: {recall}"
+               "\n\t* F-{beta}: {f_score}"
+               "\n\n"
 )
-
-FORMAT_TABLE: dict[str, OutputFormat] = {DefinedFormat.CSV: CSV_FORMAT, DefinedFormat.TEXT: TEXT_FORMAT}
-
-
-def get_output_type(format_name: str) -> OutputFormat:
-    try:
-        selected_format: OutputFormat = FORMAT_TABLE[format_name]
-    except KeyError:
-        raise ValueError(f"The format <{format_name}> is not recognized.")
-    return selected_format
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+from json import dumps
+from types import TracebackType
+from typing import Any, Optional, Sequence, TextIO, Type
+
+from numpy import array, float64, int64, nan, savez
+from numpy.typing import NDArray
+
+from .output_format import CSV_FORMAT, DefinedFormat, OutputFormat, TEXT_FORMAT
+from ..primitives.plugins import load_plugin, PluginGroup
+from ..structures.confusion_matrix import ReducedConfusionMatrix
+
+
+class ResultSink:
+    """
+    .. py:class:: ResultSink
+    Base class for writing bipartite parallelism metric results to a file as soon as each result is computed.
+    Alongside per-pair results, every sink accumulates corpus-level statistics and writes them when it is closed:
+    a *micro*-averaged row (computed from the summed `ReducedConfusionMatrix`) and
+    a *macro*-averaged row (whose precision, recall, and F-score are the means of the per-pair values).
+    The macro-averaged row has no counts, so its score and counts are `None`, as are its annotations.
+    Only running totals are kept, so a sink's memory does not grow with the number of results.
+    If a sink is closed because of an exception, the aggregate rows are omitted,
+    as they would not describe the whole corpus.
+    Results may also carry annotations: supplementary values, declared when the sink is created,
+    which are written alongside each row. Annotations are summed for the micro-averaged row and
+    left empty for the macro-averaged row.
+    """
+    filetype: str = ""
+
+    def __init__(self, output_filepath: str, beta: float = 1, annotation_names: Sequence[str] = ()):
+        """
+        :param output_filepath: a path (with no file extension) at which results will be written.
+        The sink's `filetype` is appended as the extension.
+        :param beta: a positive `float` weight given to precision and recall when computing F-scores.
+        :param annotation_names: the names of any annotations which will accompany each result.
+        """
+        self.output_filepath: str = f"{output_filepath}.{self.filetype}"
+        self.beta: float = beta
+        self.annotation_names: Sequence[str] = tuple(annotation_names)
+        self.annotation_totals: dict[str, Any] = {annotation_name: 0 for annotation_name in self.annotation_names}
+
+        self.total_matrix: ReducedConfusionMatrix = ReducedConfusionMatrix()
+        self.statistic_sums: list[float] = [0.0, 0.0, 0.0]
+        self.result_count: int = 0
+
+    def __enter__(self) -> ResultSink:
+        return self
+
+    def __exit__(self, exception_type: Optional[Type[BaseException]], exception: Optional[BaseException],
+                 traceback: Optional[TracebackType]):
+        self.close(write_aggregates=exception_type is None)
+
+    def write_result(self, filenames: dict[str, str], matrix: ReducedConfusionMatrix,
+                     annotations: Optional[dict[str, Any]] = None):
+        """
+        Writes the result for one pair of hypothesis and reference data and folds it into the corpus-level statistics.
+        :param filenames: a `dict` naming the paired data with the keys *hypothesis_filename* and *reference_filename*.
+        :param matrix: the `ReducedConfusionMatrix` computed for the paired data.
+        :param annotations: a `dict` containing a value for each of the sink's `annotation_names`.
+        """
+        annotations = {} if annotations is None else annotations
+        ordered_annotations: dict[str, Any] = \
+            {annotation_name: annotations[annotation_name] for annotation_name in self.annotation_names}
+        statistics: dict[str, Optional[float]] = matrix.get_statistics_mapping(self.beta)
+        self._write_row(filenames, statistics, ordered_annotations)
+
+        for annotation_name, annotation_value in ordered_annotations.items():
+            self.annotation_totals[annotation_name] += annotation_value
+
+        self.total_matrix += matrix
+        for statistic_index, statistic_name in enumerate(("precision", "recall", "f_score")):
+            self.statistic_sums[statistic_index] += statistics[statistic_name]
+        self.result_count += 1
+
+    def close(self, write_aggregates: bool = True):
+        """
+        Completes the output file.
+        :param write_aggregates: a `bool` indicating whether the corpus-level statistics should be written first.
+        """
+        if write_aggregates is True and self.result_count > 0:
+            micro_statistics: dict[str, Optional[float]] = self.total_matrix.get_statistics_mapping(self.beta)
+            self._write_aggregate("micro", micro_statistics, self.annotation_totals)
+
+            macro_statistics: dict[str, Optional[float]] = \
+                {**micro_statistics, "score": None, "hypothesis_count": None, "reference_count": None}
+            for statistic_index, statistic_name in enumerate(("precision", "recall", "f_score")):
+                macro_statistics[statistic_name] = self.statistic_sums[statistic_index] / self.result_count
+            empty_annotations: dict[str, Any] = {annotation_name: None for annotation_name in self.annotation_names}
+            self._write_aggregate("macro", macro_statistics, empty_annotations)
+
+        self._close()
+
+    def _write_row(self, filenames: dict[str, str], statistics: dict[str, Optional[float]],
+                   annotations: dict[str, Any]):
+        raise NotImplementedError
+
+    def _write_aggregate(self, aggregate: str, statistics: dict[str, Optional[float]], annotations: dict[str, Any]):
+        raise NotImplementedError
+
+    def _close(self):
+        raise NotImplementedError
+
+
+class FormattedResultSink(ResultSink):
+    """
+    .. py:class:: FormattedResultSink
+    Subclass of `ResultSink` which writes text according to an `OutputFormat`, flushing after every row.
+    Missing values in aggregate rows are left blank.
+    """
+    output_format: OutputFormat
+
+    def __init__(self, output_filepath: str, beta: float = 1, annotation_names: Sequence[str] = ()):
+        super().__init__(output_filepath, beta, annotation_names)
+        self.output_file: TextIO = open(self.output_filepath, encoding="utf-8", mode="w+")
+        title_annotations: list[str] = [
+            self.output_format.annotation_title.format(name=annotation_name)
+            for annotation_name in self.annotation_names
+        ]
+        self.output_file.write(self._insert_annotations(self.output_format.title, title_annotations))
+
+    def _write_row(self, filenames: dict[str, str], statistics: dict[str, Optional[float]],
+                   annotations: dict[str, Any]):
+        self.output_file.write(self.output_format.header.format(**filenames))
+        self.output_file.write(self._format_line(statistics, annotations))
+        self.output_file.flush()
+
+    def _write_aggregate(self, aggregate: str, statistics: dict[str, Optional[float]], annotations: dict[str, Any]):
+        statistics = {name: "" if value is None else value for name, value in statistics.items()}
+        annotations = {name: "" if value is None else value for name, value in annotations.items()}
+        self.output_file.write(self.output_format.aggregate_header.format(aggregate=aggregate))
+        if aggregate == "macro" and self.output_format.macro_line != "":
+            self.output_file.write(self.output_format.macro_line.format(**statistics))
+        else:
+            self.output_file.write(self._format_line(statistics, annotations))
+        self.output_file.flush()
+
+    def _format_line(self, statistics: dict[str, Any], annotations: dict[str, Any]) -> str:
+        line_annotations: list[str] = [
+            self.output_format.annotation.format(name=annotation_name, value=annotation_value)
+            for annotation_name, annotation_value in annotations.items()
+        ]
+        return self._insert_annotations(self.output_format.line.format(**statistics), line_annotations)
+
+    @staticmethod
+    def _insert_annotations(text: str, annotations: list[str]) -> str:
+        text_body: str = text.rstrip("\n")
+        return text_body + "".join(annotations) + text[len(text_body):]
+
+    def _close(self):
+        self.output_file.close()
+
+
+class CSVResultSink(FormattedResultSink):
+    filetype: str = CSV_FORMAT.filetype
+    output_format: OutputFormat = CSV_FORMAT
+
+
+class TextResultSink(FormattedResultSink):
+    filetype: str = TEXT_FORMAT.filetype
+    output_format: OutputFormat = TEXT_FORMAT
+
+
+class JSONLinesResultSink(ResultSink):
+    """
+    .. py:class:: JSONLinesResultSink
+    Subclass of `ResultSink` which writes one JSON object per line, flushing after every line.
+    Aggregate lines carry an *aggregate* key (`micro` or `macro`) in place of the filenames.
+    """
+    filetype: str = DefinedFormat.JSON_LINES
+
+    def __init__(self, output_filepath: str, beta: float = 1, annotation_names: Sequence[str] = ()):
+        super().__init__(output_filepath, beta, annotation_names)
+        self.output_file: TextIO = open(self.output_filepath, encoding="utf-8", mode="w+")
+
+    def _write_row(self, filenames: dict[str, str], statistics: dict[str, Optional[float]],
+                   annotations: dict[str, Any]):
+        self.output_file.write(f"{dumps({**filenames, **statistics, **annotations})}\n")
+        self.output_file.flush()
+
+    def _write_aggregate(self, aggregate: str, statistics: dict[str, Optional[float]], annotations: dict[str, Any]):
+        self.output_file.write(f"{dumps({'aggregate': aggregate, **statistics, **annotations})}\n")
+        self.output_file.flush()
+
+    def _close(self):
+        self.output_file.close()
+
+
+class NPZResultSink(ResultSink):
+    """
+    .. py:class:: NPZResultSink
+    Subclass of `ResultSink` which writes results column by column into NumPy's `.npz` format.
+    Each statistic becomes one array, with filenames stored as string arrays and missing values as `nan`;
+    aggregate rows are stored in arrays prefixed by `aggregate_`, with `aggregate_name` holding `micro` or `macro`.
+    As the macro-averaged row has no counts, the aggregate count arrays hold `float` values (`nan` for that row).
+    Because the format is columnar, the file is only written when the sink is closed.
+    """
+    filetype: str = DefinedFormat.NPZ
+
+    def __init__(self, output_filepath: str, beta: float = 1, annotation_names: Sequence[str] = ()):
+        super().__init__(output_filepath, beta, annotation_names)
+        self.columns: dict[str, list[Any]] = {}
+        self.aggregate_columns: dict[str, list[Any]] = {}
+
+    def _write_row(self, filenames: dict[str, str], statistics: dict[str, Optional[float]],
+                   annotations: dict[str, Any]):
+        for column_name, value in {**filenames, **statistics, **annotations}.items():
+            self.columns.setdefault(column_name, []).append(value)
+
+    def _write_aggregate(self, aggregate: str, statistics: dict[str, Optional[float]], annotations: dict[str, Any]):
+        for column_name, value in {"name": aggregate, **statistics, **annotations}.items():
+            self.aggregate_columns.setdefault(f"aggregate_{column_name}", []).append(value)
+
+    def _close(self):
+        columnar_arrays: dict[str, NDArray] = {}
+        for column_name, values in (self.columns | self.aggregate_columns).items():
+            statistic_name: str = column_name.removeprefix("aggregate_")
+            is_count: bool = statistic_name in ("score", "hypothesis_count", "reference_count")
+            if is_count is True and None not in values:
+                columnar_arrays[column_name] = array(values, dtype=int64)
+            elif is_count is True or statistic_name in ("precision", "recall", "f_score", "beta") or \
+                    statistic_name in self.annotation_names:
+                columnar_arrays[column_name] = array([nan if value is None else value for value in values],
+                                                     dtype=float64)
+            else:
+                columnar_arrays[column_name] = array(values, dtype=str)
+        savez(self.output_filepath, **columnar_arrays)
+
+
+SINK_TABLE: dict[str, Type[ResultSink]] = {
+    DefinedFormat.CSV: CSVResultSink,
+    DefinedFormat.TEXT: TextResultSink,
+    DefinedFormat.JSON_LINES: JSONLinesResultSink,
+    DefinedFormat.NPZ: NPZResultSink
+}
+
+
+def get_result_sink(format_name: str) -> Type[ResultSink]:
+    """
+    Selects a `ResultSink` by the name of its format. Besides the predefined formats,
+    plugins registered in the `pyrallelism.output_formats` entry point group may be selected;
+    a plugin may either be a subclass of `ResultSink` or an `OutputFormat`, which is written by a `FormattedResultSink`.
+    :param format_name: the name of the desired format.
+    :return: the `ResultSink` subclass which writes that format.
+    """
+    try:
+        sink: Type[ResultSink] = SINK_TABLE[format_name]
+    except KeyError:
+        plugin: Any = load_plugin(PluginGroup.OUTPUT_FORMATS, format_name)
+        if plugin is None:
+            raise ValueError(f"The format <{format_name}> is not recognized.")
+        elif isinstance(plugin, OutputFormat):
+            sink = type(f"{format_name.title()}ResultSink", (FormattedResultSink,),
+                        {"filetype": plugin.filetype, "output_format": plugin})
+        elif isinstance(plugin, type) and issubclass(plugin, ResultSink):
+            sink = plugin
+        else:
+            raise TypeError(f"The format plugin <{format_name}> is neither a ResultSink nor an OutputFormat.")
+    return sink
@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+from functools import partial
+from hashlib import sha256
+from json import dumps, loads
+from os import fsync, path
+from types import TracebackType
+from typing import Any, Iterable, Optional, Sequence, TextIO, Type
+from warnings import warn
+
+from ..primitives.evaluation_metric import EvaluationMetric
+from ..primitives.typing import ParallelismDirectory
+from ..structures.confusion_matrix import ReducedConfusionMatrix
+from ..structures.confusion_matrix_batch import ConfusionMatrixBatch
+from .checkpointing import COMPLETE_STATUS, QUARANTINED_STATUS
+
+PARTIAL_FORMAT_VERSION: int = 1
+CONTENT_BLOCK_SIZE: int = 2 ** 20
+
+
+def parse_shard(shard_specification: str) -> tuple[int, int]:
+    """
+    Parses a shard specification of the form `i/N`, where `N` is the number of shards and
+    `i` (with `0 <= i < N`) is the index of the selected shard.
+    :param shard_specification: a `str` of the form `i/N`.
+    :return: a 2-tuple containing the shard index and the shard count.
+    """
+    try:
+        shard_index, shard_count = [int(shard_item) for shard_item in shard_specification.split("/")]
+    except ValueError:
+        raise ValueError(f"The shard <{shard_specification}> is not of the form <i/N>.")
+
+    if shard_count <= 0 or not (0 <= shard_index < shard_count):
+        raise ValueError(f"The shard <{shard_specification}> must satisfy 0 <= i < N.")
+    return shard_index, shard_count
+
+
+def is_in_shard(pair_index: int, shard_index: int, shard_count: int) -> bool:
+    """
+    Determines whether a file pair belongs to a shard. Pairs are dealt to shards in turn by their position,
+    so every shard receives a deterministic subset of similar size, no matter how the pairs are ordered in size.
+    :param pair_index: the position of a file pair among all file pairs being evaluated.
+    :param shard_index: the index of the shard in question.
+    :param shard_count: the total number of shards.
+    :return: a `bool` indicating whether the pair belongs to the shard.
+    """
+    return pair_index % shard_count == shard_index
+
+
+def describe_metric(metric: EvaluationMetric) -> str:
+    """
+    Names a metric by the fully-qualified names of its scoring and size functions,
+    so that custom metrics can be distinguished as reliably as predefined ones.
+    Memoized scoring functions are named after the functions they memoize, as they produce the same scores.
+    :param metric: an `EvaluationMetric`.
+    :return: a `str` identifying *metric*.
+    """
+    functions: list[type] = [getattr(function, "memoized_function", function) for function in metric]
+    return "+".join([f"{function.__module__}.{function.__qualname__}" for function in functions])
+
+
+def fingerprint_directories(hypotheses: ParallelismDirectory, references: ParallelismDirectory) -> str:
+    """
+    Computes a digest of a pair of parallelism directories which is independent of the order of their contents.
+    :param hypotheses: a collection of hypothesized parallelisms in the form of a `ParallelismDirectory` object.
+    :param references: a collection of ground truth parallelisms in the form of a `ParallelismDirectory` object.
+    :return: a hexadecimal `str` digest of the pair.
+    """
+    digest = sha256()
+    for directory in (hypotheses, references):
+        canonical_directory: list[tuple[int, list[tuple[int, int]]]] = \
+            sorted([(parallelism_id, sorted(parallelism)) for parallelism_id, parallelism in directory.items()])
+        digest.update(repr(canonical_directory).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class CorpusFingerprint:
+    """
+    .. py:class:: CorpusFingerprint
+    Accumulates a digest over the raw contents of a corpus's input files and the names of its file pairs, in order.
+    Every shard reads the contents of every input file, not just those of its own pairs, without parsing them;
+    so, their digests agree if (and only if) they evaluated the same corpus, even if its files were changed in place.
+    """
+    def __init__(self):
+        self.digest = sha256()
+        self.pair_count: int = 0
+
+    def update(self, filenames: dict[str, str]):
+        self.digest.update(f"{filenames['hypothesis_filename']}\t{filenames['reference_filename']}\n".encode("utf-8"))
+        self.pair_count += 1
+
+    def update_contents(self, filepath: str):
+        """
+        Folds the raw contents of an input file into the digest, reading it in large blocks.
+        :param filepath: the path to an input file of the corpus.
+        """
+        # Each file's contents are preceded by their length, so that the boundaries between files are unambiguous.
+        self.digest.update(f"{path.getsize(filepath)}\n".encode("utf-8"))
+        with open(filepath, mode="rb") as input_file:
+            for block in iter(partial(input_file.read, CONTENT_BLOCK_SIZE), b""):
+                self.digest.update(block)
+
+    def hexdigest(self) -> str:
+        return self.digest.hexdigest()
+
+
+class PartialResultWriter:
+    """
+    .. py:class:: PartialResultWriter
+    Writes the results of one shard of an evaluation to a JSON Lines file that `merge_partial_results` can combine.
+    The file begins with a *header* record describing the evaluation, continues with one *pair* record per
+    evaluated file pair (including pairs which were quarantined), and ends with a *summary* record holding the
+    summed counts of the shard's completed pairs and a fingerprint of the whole corpus.
+    Each record is flushed as it is written, but a file without a summary record is treated as incomplete.
+    """
+    def __init__(self, output_filepath: str, metadata: dict[str, Any], annotation_names: Sequence[str] = ()):
+        """
+        :param output_filepath: the path at which the partial results will be written.
+        :param metadata: a `dict` describing the evaluation; it must contain *shard_index* and *shard_count*.
+        All other entries must agree between shards for them to be merged.
+        :param annotation_names: the names of any annotations which will accompany each result.
+        """
+        self.output_file: TextIO = open(output_filepath, encoding="utf-8", mode="w+")
+        self.total_matrix: ReducedConfusionMatrix = ReducedConfusionMatrix()
+        self._write_record({
+            "record": "header", "version": PARTIAL_FORMAT_VERSION, **metadata,
+            "annotation_names": list(annotation_names)
+        })
+
+    def __enter__(self) -> PartialResultWriter:
+        return self
+
+    def __exit__(self, exception_type: Optional[Type[BaseException]], exception: Optional[BaseException],
+                 traceback: Optional[TracebackType]):
+        self.output_file.close()
+
+    def write_result(self, pair_index: int, filenames: dict[str, str], fingerprint: str,
+                     matrix: ReducedConfusionMatrix, annotations: Optional[dict[str, Any]] = None):
+        """
+        Records the result for one file pair.
+        :param pair_index: the position of the file pair among all file pairs in the corpus.
+        :param filenames: a `dict` naming the paired data with the keys *hypothesis_filename* and *reference_filename*.
+        :param fingerprint: a digest of the pair's contents, as computed by `fingerprint_directories`.
+        :param matrix: the `ReducedConfusionMatrix` computed for the paired data.
+        :param annotations: a `dict` containing any supplementary values for the result.
+        """
+        self._write_record({
+            "record": "pair", "status": COMPLETE_STATUS, "pair_index": pair_index, **filenames,
+            "fingerprint": fingerprint, "score": matrix.score, "hypothesis_count": matrix.hypothesis_count,
+            "reference_count": matrix.reference_count, "annotations": {} if annotations is None else annotations
+        })
+        self.total_matrix += matrix
+
+    def write_quarantine(self, pair_index: int, filenames: dict[str, str], fingerprint: str, reason: str):
+        """
+        Records that one file pair was quarantined, so that it is accounted for when the shards are merged.
+        :param pair_index: the position of the file pair among all file pairs in the corpus.
+        :param filenames: a `dict` naming the paired data with the keys *hypothesis_filename* and *reference_filename*.
+        :param fingerprint: a digest of the pair's contents, as computed by `fingerprint_directories`.
+        :param reason: a `str` explaining why the pair was quarantined.
+        """
+        self._write_record({
+            "record": "pair", "status": QUARANTINED_STATUS, "pair_index": pair_index, **filenames,
+            "fingerprint": fingerprint, "reason": reason
+        })
+
+    def write_summary(self, corpus_fingerprint: CorpusFingerprint):
+        """
+        Completes the partial results with the shard's summed counts and the fingerprint of the whole corpus.
+        :param corpus_fingerprint: a `CorpusFingerprint` which has seen the contents of every input file and
+        the names of every file pair in the corpus.
+        """
+        self._write_record({
+            "record": "summary", "pair_count": corpus_fingerprint.pair_count,
+            "corpus_fingerprint": corpus_fingerprint.hexdigest(), "score": self.total_matrix.score,
+            "hypothesis_count": self.total_matrix.hypothesis_count,
+            "reference_count": self.total_matrix.reference_count
+        })
+        fsync(self.output_file.fileno())
+
+    def _write_record(self, record: dict[str, Any]):
+        self.output_file.write(f"{dumps(record)}\n")
+        self.output_file.flush()
+
+
+def merge_partial_results(partial_filepaths: Iterable[str]) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """
+    Combines the partial results of every shard of an evaluation, checking that they are consistent.
+    The shards must: describe the same evaluation (metric, inputs, and other settings); be complete;
+    together cover every shard exactly once; and agree on the fingerprint and size of the corpus.
+    Each shard's summary must also agree with the sum of its own completed pair records.
+    Quarantined pairs count toward the size of the corpus, but they are excluded from the returned records
+    (and so from any aggregate computed from them), with a `RuntimeWarning` for each.
+    :param partial_filepaths: the paths to the partial result files of every shard.
+    :return: a 2-tuple containing the shared header of the partial results (without its shard index) and
+    a `list` of all completed pair records, sorted by their position in the corpus.
+    """
+    shared_header: Optional[dict[str, Any]] = None
+    shared_summary: Optional[dict[str, Any]] = None
+    shard_indices: set[int] = set()
+    pair_records: dict[int, dict[str, Any]] = {}
+    for partial_filepath in partial_filepaths:
+        with open(partial_filepath, encoding="utf-8", mode="r") as partial_file:
+            records: list[dict[str, Any]] = [loads(line) for line in partial_file if line.strip() != ""]
+
+        if len(records) < 2 or records[0].get("record") != "header" or records[-1].get("record") != "summary":
+            raise ValueError(f"The file <{partial_filepath}> is not a complete set of partial results.")
+
+        header: dict[str, Any] = dict(records[0])
+        shard_index: int = header.pop("shard_index")
+        if shared_header is None:
+            shared_header = header
+        elif header != shared_header:
+            raise ValueError(f"The file <{partial_filepath}> was produced by a different evaluation than "
+                             f"the preceding partial results.")
+
+        if shard_index in shard_indices:
+            raise ValueError(f"The shard <{shard_index}> was supplied more than once.")
+        shard_indices.add(shard_index)
+
+        summary: dict[str, Any] = records[-1]
+        shard_matrices: list[ReducedConfusionMatrix] = []
+        for pair_record in records[1:-1]:
+            pair_index: int = pair_record["pair_index"]
+            if not is_in_shard(pair_index, shard_index, header["shard_count"]) or pair_index in pair_records:
+                raise ValueError(f"The pair <{pair_index}> in <{partial_filepath}> does not belong to its shard.")
+            pair_records[pair_index] = pair_record
+            if pair_record.get("status", COMPLETE_STATUS) == QUARANTINED_STATUS:
+                warn(f"The pair <{pair_record['hypothesis_filename']}, {pair_record['reference_filename']}> "
+                     f"was quarantined and excluded from the results: {pair_record['reason']}", RuntimeWarning)
+            else:
+                shard_matrices.append(get_record_matrix(pair_record))
+
+        shard_total: ReducedConfusionMatrix = ConfusionMatrixBatch.from_matrices(shard_matrices).sum()
+
+        if (shard_total.score, shard_total.hypothesis_count, shard_total.reference_count) != \
+                (summary["score"], summary["hypothesis_count"], summary["reference_count"]):
+            raise ValueError(f"The summary of <{partial_filepath}> does not match its pair results.")
+
+        corpus_summary: dict[str, Any] = {key: summary[key] for key in ("pair_count", "corpus_fingerprint")}
+        if shared_summary is None:
+            shared_summary = corpus_summary
+        elif corpus_summary != shared_summary:
+            raise ValueError(f"The file <{partial_filepath}> was produced from a different corpus than "
+                             f"the preceding partial results.")
+
+    if shared_header is None:
+        raise ValueError("No partial results were supplied.")
+    elif shard_indices != set(range(0, shared_header["shard_count"])):
+        missing_shards: list[int] = sorted(set(range(0, shared_header["shard_count"])) - shard_indices)
+        raise ValueError(f"The partial results of the shards <{missing_shards}> are missing.")
+    elif len(pair_records) != shared_summary["pair_count"]:
+        raise ValueError(f"The partial results contain {len(pair_records)} pairs, "
+                         f"but the corpus contains {shared_summary['pair_count']} pairs.")
+
+    sorted_records: list[dict[str, Any]] = [
+        pair_records[pair_index] for pair_index in sorted(pair_records)
+        if pair_records[pair_index].get("status", COMPLETE_STATUS) != QUARANTINED_STATUS
+    ]
+    return shared_header, sorted_records
+
+
+def get_record_matrix(pair_record: dict[str, Any]) -> ReducedConfusionMatrix:
+    """
+    Reconstructs the `ReducedConfusionMatrix` stored in a pair record of a partial result file.
+    :param pair_record: a `dict` containing *score*, *hypothesis_count*, and *reference_count* entries.
+    :return: a `ReducedConfusionMatrix` containing the recorded counts.
+    """
+    matrix: ReducedConfusionMatrix = ReducedConfusionMatrix()
+    matrix.score = pair_record["score"]
+    matrix.hypothesis_count = pair_record["hypothesis_count"]
+    matrix.reference_count = pair_record["reference_count"]
+    return matrix
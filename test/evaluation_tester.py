@@ -1,14 +1,47 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from importlib.metadata import EntryPoint
+from json import loads
+from os import makedirs, path
+from random import Random
+from shutil import copyfile
+from tempfile import TemporaryDirectory
+from time import sleep
 from typing import Sequence, TypeAlias
 from unittest import TestCase
+from unittest.mock import patch
+from warnings import catch_warnings, simplefilter
 
-from src.pyrallelism.evaluator import evaluate_bipartite_parallelism_metric
+from numpy import array
+from numpy.typing import NDArray
+
+from src.pyrallelism.evaluator import evaluate_bipartite_parallelism_metric, sweep_bipartite_parallelism_metric
+from src.pyrallelism.primitives.assignment import GreedyAssigner
 from src.pyrallelism.primitives.evaluation_metric import DefinedMetric, DEFINED_METRICS, EvaluationMetric, get_metric
+from src.pyrallelism.primitives.interning import ParallelismInterner
 from src.pyrallelism.primitives.loading import XMLLoader, TSVLoader
-from src.pyrallelism.primitives.typing import ParallelismDirectory
+from src.pyrallelism.primitives.plugins import PluginGroup
+from src.pyrallelism.primitives.score import memoize_scoring_function
+from src.pyrallelism.primitives.typing import Parallelism, ParallelismDirectory
+from src.pyrallelism.pyrallelism import _evaluate_directory_pair, _use_evaluation_cli, _use_merging_cli
+from src.pyrallelism.sampling import estimate_bipartite_parallelism_metric, get_sampling_order, SampledEstimate
+from src.pyrallelism.streaming import StreamingEvaluator
+from src.pyrallelism.structures import Alignment, ReducedConfusionMatrix
+from src.pyrallelism.utils.checkpointing import CheckpointJournal, create_pair_record, create_quarantine_record, \
+    PairQuarantinedError, run_with_limits
+from src.pyrallelism.utils.sharding import CorpusFingerprint, is_in_shard, merge_partial_results, parse_shard, \
+    PartialResultWriter
 
 AnswerDict: TypeAlias = dict[str, tuple[int, int, int]]
 
 
+def _evaluate_perfect_pair(hypotheses: ParallelismDirectory, references: ParallelismDirectory, *arguments) -> tuple:
+    # Failing on every imperfect pair lets tests quarantine a known set of pairs.
+    if hypotheses != references:
+        raise ValueError("The hypotheses are not perfect.")
+    return _evaluate_directory_pair(hypotheses, references, *arguments)
+
+
 class EvaluationTester(TestCase):
     """
     .. py:class:: EvaluationTester
@@ -61,3 +94,485 @@ class EvaluationTester(TestCase):
             self.assertEqual(expected_score, confusion_matrix.score)
             self.assertEqual(expected_hypotheses, confusion_matrix.hypothesis_count)
             self.assertEqual(expected_references, confusion_matrix.reference_count)
+
+    def test_approximate_evaluations(self):
+        for hypothesis_filepath, evaluation_answers in self.evaluation_answers:
+            hypothesis_directory: ParallelismDirectory = \
+                TSVLoader.load_parallelism_directory(hypothesis_filepath, **self.loading_kwargs)
+
+            for defined_metric in DEFINED_METRICS:
+                metric: EvaluationMetric = get_metric(defined_metric)
+                confusion_matrix, components = evaluate_bipartite_parallelism_metric(
+                    hypothesis_directory, self.reference_directory, metric, assigner=GreedyAssigner
+                )
+                expected_score, expected_hypotheses, expected_references = evaluation_answers[defined_metric]
+                self.assertLessEqual(confusion_matrix.score, expected_score)
+                self.assertGreaterEqual(2 * confusion_matrix.score, expected_score)
+                self.assertGreaterEqual(components["score_upper_bound"], expected_score)
+                self.assertEqual(expected_hypotheses, confusion_matrix.hypothesis_count)
+                self.assertEqual(expected_references, confusion_matrix.reference_count)
+
+    def test_alignments(self):
+        for hypothesis_filepath, evaluation_answers in self.evaluation_answers:
+            hypothesis_directory: ParallelismDirectory = \
+                TSVLoader.load_parallelism_directory(hypothesis_filepath, **self.loading_kwargs)
+
+            for defined_metric in DEFINED_METRICS:
+                metric: EvaluationMetric = get_metric(defined_metric)
+                confusion_matrix, components = evaluate_bipartite_parallelism_metric(
+                    hypothesis_directory, self.reference_directory, metric, keep_scoring_matrix=False
+                )
+                self.assertNotIn("scoring_matrix", components)
+
+                # The entries form a matching; those which pair real parallelisms with nonzero scores are aligned.
+                entries: list[tuple[int, int]] = components["entries"]
+                self.assertEqual(len({row for row, _ in entries}), len(entries))
+                self.assertEqual(len({column for _, column in entries}), len(entries))
+                hypothesis_parallelisms: list[Parallelism] = list(hypothesis_directory.values())
+                reference_parallelisms: list[Parallelism] = list(self.reference_directory.values())
+                entry_scores: list[int] = [
+                    metric.score.score_pair(hypothesis_parallelisms[row], reference_parallelisms[column])
+                    for row, column in entries
+                    if row < len(hypothesis_parallelisms) and column < len(reference_parallelisms)
+                ]
+                self.assertEqual(sum(entry_scores), confusion_matrix.score)
+                self.assertEqual(len([entry_score for entry_score in entry_scores if entry_score > 0]),
+                                 len(components["alignment"]))
+
+                alignment: Alignment = components["alignment"]
+                self.assertEqual(int(alignment.scores.sum()), confusion_matrix.score)
+                self.assertTrue(all(alignment.scores > 0))
+                for hypothesis_id, reference_id, pair_score in alignment:
+                    self.assertEqual(pair_score, metric.score.score_pair(
+                        hypothesis_directory[hypothesis_id], self.reference_directory[reference_id]
+                    ))
+
+    def test_streaming_evaluation(self):
+        hypothesis_labels: list[NDArray[int]] = []
+        expected_matrix: ReducedConfusionMatrix = ReducedConfusionMatrix()
+        metric: EvaluationMetric = get_metric(DefinedMetric.MAXIMUM_BRANCH_AWARE_WORD_OVERLAP)
+        for hypothesis_filepath, evaluation_answers in self.evaluation_answers:
+            stratum_rows = TSVLoader._read_file(hypothesis_filepath, **self.loading_kwargs)
+            hypothesis_labels.append(array(stratum_rows).transpose((1, 0, 2)))
+            expected_score, expected_hypotheses, expected_references = \
+                evaluation_answers[DefinedMetric.MAXIMUM_BRANCH_AWARE_WORD_OVERLAP]
+            expected_matrix.score += expected_score
+            expected_matrix.hypothesis_count += expected_hypotheses
+            expected_matrix.reference_count += expected_references
+
+        for executor in (None, ThreadPoolExecutor(max_workers=2), ProcessPoolExecutor(max_workers=2)):
+            if executor is not None:
+                self.addCleanup(executor.shutdown)
+            with self.subTest(executor=executor):
+                evaluator: StreamingEvaluator = StreamingEvaluator(metric, executor=executor, keep_results=True)
+                evaluator.update(hypothesis_labels[0], self.reference_directory)
+                evaluator.update_batch(hypothesis_labels[1:], [self.reference_directory] * (len(hypothesis_labels) - 1))
+
+                self.assertEqual(evaluator.compute(), expected_matrix.get_statistics())
+                self.assertEqual(len(evaluator.get_results()), len(hypothesis_labels))
+                self.assertEqual(evaluator.document_count, len(hypothesis_labels))
+
+                evaluator.reset()
+                evaluator.update_padded(array(hypothesis_labels), array(hypothesis_labels))
+                self.assertEqual(evaluator.compute(), (1.0, 1.0, 1.0))
+
+    def test_memoized_evaluations(self):
+        interner: ParallelismInterner = ParallelismInterner()
+        reference_directory: ParallelismDirectory = interner.intern_directory(self.reference_directory)
+        self.assertEqual(reference_directory, self.reference_directory)
+
+        for hypothesis_filepath, evaluation_answers in self.evaluation_answers:
+            hypothesis_directory: ParallelismDirectory = \
+                TSVLoader.load_parallelism_directory(hypothesis_filepath, **self.loading_kwargs)
+            # Shifting both directories by the same amount should leave every score unchanged.
+            shifted_hypotheses, shifted_references = [
+                {parallelism_id: {(start + 1000, end + 1000) for start, end in parallelism}
+                 for parallelism_id, parallelism in directory.items()}
+                for directory in (hypothesis_directory, reference_directory)
+            ]
+
+            for defined_metric in DEFINED_METRICS:
+                metric: EvaluationMetric = get_metric(defined_metric)
+                memoized_scorer = memoize_scoring_function(metric.score, cache_size=1024)
+                memoized_metric: EvaluationMetric = EvaluationMetric(memoized_scorer, metric.size)
+                for hypotheses, references in ((hypothesis_directory, reference_directory),
+                                               (shifted_hypotheses, shifted_references)):
+                    confusion_matrix, _ = evaluate_bipartite_parallelism_metric(hypotheses, references, memoized_metric)
+                    expected_score, expected_hypotheses, expected_references = evaluation_answers[defined_metric]
+                    self.assertEqual(expected_score, confusion_matrix.score)
+                    self.assertEqual(expected_hypotheses, confusion_matrix.hypothesis_count)
+                    self.assertEqual(expected_references, confusion_matrix.reference_count)
+
+                cache_info = memoized_scorer.cache_info()
+                self.assertGreater(cache_info.misses, 0)
+                self.assertEqual(cache_info.hits, cache_info.misses)
+
+                # The interner is shared between score matrices, so a repeated parallelism is stored as one object.
+                self.assertGreater(len(memoized_scorer.interner), 0)
+                first_directory, second_directory = \
+                    [memoized_scorer.intern_directory(dict(hypothesis_directory)) for _ in range(0, 2)]
+                self.assertTrue(all([first_directory[parallelism_id] is second_directory[parallelism_id]
+                                     for parallelism_id in hypothesis_directory]))
+                memoized_scorer.cache_clear()
+                self.assertEqual(len(memoized_scorer.interner), 0)
+
+    def test_batch_scoring(self):
+        random_generator: Random = Random(35)
+        directories: list[ParallelismDirectory] = []
+        for _ in range(0, 2):
+            directory: ParallelismDirectory = {}
+            for parallelism_id in range(1, 30):
+                # Branches are drawn from a small region so that many parallelisms overlap or coincide.
+                branch_starts: list[int] = sorted(random_generator.sample(range(0, 60), random_generator.randint(1, 4)))
+                directory[parallelism_id] = \
+                    {(branch_start, branch_start + random_generator.randint(1, 5)) for branch_start in branch_starts}
+            directories.append(directory)
+        directories[1][30] = set(directories[0][1])
+        hypotheses, references = directories
+
+        for defined_metric in DEFINED_METRICS:
+            metric: EvaluationMetric = get_metric(defined_metric)
+            with self.subTest(metric=defined_metric):
+                expected_matrix: NDArray[int] = array([
+                    [metric.score.score_pair(hypothesis, reference) for reference in references.values()]
+                    for hypothesis in hypotheses.values()
+                ])
+                score_matrix: NDArray[int] = metric.score.create_score_matrix(hypotheses, references)
+                self.assertTrue((score_matrix[:len(hypotheses), :len(references)] == expected_matrix).all())
+                sparse_matrix = metric.score.create_sparse_score_matrix(hypotheses, references)
+                self.assertTrue((sparse_matrix.toarray() == expected_matrix).all())
+
+                # Memoized scorers bypass the batch protocol, as it would never consult their cache.
+                memoized_scorer = memoize_scoring_function(metric.score, cache_size=1024)
+                self.assertFalse(memoized_scorer.has_batch_scoring())
+                self.assertTrue((memoized_scorer.create_score_matrix(hypotheses, references) == score_matrix).all())
+                self.assertGreater(memoized_scorer.cache_info().misses, 0)
+
+                for directory in directories:
+                    self.assertEqual(
+                        metric.size.compute_directory_size(directory),
+                        sum([metric.size.size_parallelism(parallelism) for parallelism in directory.values()])
+                    )
+
+    def test_metric_plugins(self):
+        plugin_entry_point: EntryPoint = EntryPoint(
+            name="plugin-mwo", value="src.pyrallelism.primitives.evaluation_metric:MWO_METRIC",
+            group=PluginGroup.METRICS
+        )
+        with patch("src.pyrallelism.primitives.plugins.entry_points",
+                   lambda group, name: [plugin_entry_point] if (group, name) == (PluginGroup.METRICS, "plugin-mwo")
+                   else []):
+            self.assertEqual(get_metric("plugin-mwo"), get_metric(DefinedMetric.MAXIMUM_WORD_OVERLAP))
+            with self.assertRaises(ValueError):
+                get_metric("missing-metric")
+
+    def test_threshold_sweep(self):
+        random_generator: Random = Random(36)
+        for hypothesis_filepath, _ in self.evaluation_answers:
+            hypothesis_directory: ParallelismDirectory = \
+                TSVLoader.load_parallelism_directory(hypothesis_filepath, **self.loading_kwargs)
+            # Combining the flawed or perfect hypotheses with the references gives a mixture of good and bad guesses.
+            hypotheses: ParallelismDirectory = dict(hypothesis_directory)
+            for parallelism_id, parallelism in self.reference_directory.items():
+                hypotheses[100 + parallelism_id] = parallelism
+            confidences: dict[int, float] = \
+                {parallelism_id: random_generator.choice([0.1, 0.3, 0.5, 0.7, 0.9]) for parallelism_id in hypotheses}
+            thresholds: list[float] = [0.0, 0.2, 0.3, 0.6, 0.8, 1.0]
+
+            for defined_metric in DEFINED_METRICS:
+                metric: EvaluationMetric = get_metric(defined_metric)
+                sorted_thresholds, sweep_results = sweep_bipartite_parallelism_metric(
+                    hypotheses, self.reference_directory, metric, confidences, thresholds
+                )
+                self.assertEqual(sorted_thresholds.tolist(), sorted(thresholds))
+                for threshold, threshold_matrix in zip(sorted_thresholds, sweep_results):
+                    with self.subTest(metric=defined_metric, threshold=threshold):
+                        thresholded_hypotheses: ParallelismDirectory = {
+                            parallelism_id: parallelism for parallelism_id, parallelism in hypotheses.items()
+                            if confidences[parallelism_id] >= threshold
+                        }
+                        expected_matrix, _ = evaluate_bipartite_parallelism_metric(
+                            thresholded_hypotheses, self.reference_directory, metric
+                        )
+                        self.assertEqual(threshold_matrix.score, expected_matrix.score)
+                        self.assertEqual(threshold_matrix.hypothesis_count, expected_matrix.hypothesis_count)
+                        self.assertEqual(threshold_matrix.reference_count, expected_matrix.reference_count)
+
+    def test_sharded_evaluation(self):
+        self.assertEqual(parse_shard("1/3"), (1, 3))
+        for shard_specification in ("0/0", "3/2", "-1/2", "a/b", "1", "1/2/3"):
+            with self.assertRaises(ValueError):
+                parse_shard(shard_specification)
+
+        for shard_count in (1, 2, 3):
+            shard_members: list[list[int]] = [
+                [pair_index for pair_index in range(0, 10) if is_in_shard(pair_index, shard_index, shard_count)]
+                for shard_index in range(0, shard_count)
+            ]
+            self.assertEqual(sorted(sum(shard_members, [])), list(range(0, 10)))
+            self.assertLessEqual(max(map(len, shard_members)) - min(map(len, shard_members)), 1)
+
+        metric: EvaluationMetric = get_metric(DefinedMetric.MAXIMUM_BRANCH_AWARE_WORD_OVERLAP)
+        pair_results: list[tuple[dict[str, str], ReducedConfusionMatrix]] = []
+        corpus_fingerprint: CorpusFingerprint = CorpusFingerprint()
+        for pair_index in range(0, 7):
+            hypothesis_filepath, _ = self.evaluation_answers[pair_index % 2]
+            hypothesis_directory: ParallelismDirectory = \
+                TSVLoader.load_parallelism_directory(hypothesis_filepath, **self.loading_kwargs)
+            confusion_matrix, _ = evaluate_bipartite_parallelism_metric(
+                hypothesis_directory, self.reference_directory, metric
+            )
+            filenames: dict[str, str] = \
+                {"hypothesis_filename": f"{pair_index}.tsv", "reference_filename": f"{pair_index}.xml"}
+            pair_results.append((filenames, confusion_matrix))
+            corpus_fingerprint.update(filenames)
+
+        metadata: dict[str, str] = {"metric": DefinedMetric.MAXIMUM_BRANCH_AWARE_WORD_OVERLAP}
+        with TemporaryDirectory() as temporary_directory:
+            partial_filepaths: list[str] = [
+                self._write_partial_results(path.join(temporary_directory, f"{shard_index}.partial.jsonl"),
+                                            shard_index, 3, metadata, pair_results, corpus_fingerprint)
+                for shard_index in range(0, 3)
+            ]
+            header, pair_records = merge_partial_results(reversed(partial_filepaths))
+            self.assertEqual(header["shard_count"], 3)
+            self.assertNotIn("shard_index", header)
+            self.assertEqual(
+                [(pair_record["hypothesis_filename"], pair_record["score"], pair_record["hypothesis_count"],
+                  pair_record["reference_count"]) for pair_record in pair_records],
+                [(filenames["hypothesis_filename"], matrix.score, matrix.hypothesis_count, matrix.reference_count)
+                 for filenames, matrix in pair_results]
+            )
+
+            other_fingerprint: CorpusFingerprint = CorpusFingerprint()
+            other_fingerprint.update_contents(self.evaluation_answers[0][0])
+            for filenames, _ in pair_results:
+                other_fingerprint.update(filenames)
+            flawed_filepaths: Sequence[str] = (
+                self._write_partial_results(path.join(temporary_directory, "metric.partial.jsonl"), 2, 3,
+                                            {"metric": DefinedMetric.MAXIMUM_WORD_OVERLAP}, pair_results,
+                                            corpus_fingerprint),
+                self._write_partial_results(path.join(temporary_directory, "corpus.partial.jsonl"), 2, 3,
+                                            metadata, pair_results, other_fingerprint)
+            )
+            rejected_merges: list[list[str]] = [partial_filepaths[:2], [*partial_filepaths, partial_filepaths[0]]]
+            rejected_merges.extend([[*partial_filepaths[:2], flawed_filepath] for flawed_filepath in flawed_filepaths])
+            for merged_filepaths in rejected_merges:
+                with self.subTest(partial_filepaths=merged_filepaths):
+                    with self.assertRaises(ValueError):
+                        merge_partial_results(merged_filepaths)
+
+    def test_sharded_cli(self):
+        with TemporaryDirectory() as temporary_directory:
+            hypothesis_path, reference_path = self._create_corpus(temporary_directory, 5)
+            arguments: list[str] = [hypothesis_path, reference_path, "--loaders", "tsv", "xml",
+                                    "--stratum-count", str(self.stratum_count)]
+            output_filepath: str = path.join(temporary_directory, "results")
+            _use_evaluation_cli([*arguments, "--output-filepath", output_filepath])
+
+            partial_filepaths: list[str] = []
+            for shard_index in range(0, 3):
+                shard_filepath: str = path.join(temporary_directory, f"shard_{shard_index}")
+                _use_evaluation_cli([*arguments, "--output-filepath", shard_filepath, "--shard", f"{shard_index}/3"])
+                partial_filepaths.append(f"{shard_filepath}.partial.jsonl")
+            merged_filepath: str = path.join(temporary_directory, "merged")
+            _use_merging_cli([*partial_filepaths, "--output-filepath", merged_filepath])
+            with open(f"{output_filepath}.csv", encoding="utf-8", mode="r") as output_file, \
+                    open(f"{merged_filepath}.csv", encoding="utf-8", mode="r") as merged_file:
+                self.assertEqual(output_file.read(), merged_file.read())
+
+            # Shards of a corpus whose files were changed in place under the same names must not be merged.
+            copyfile(self.evaluation_answers[1][0], path.join(hypothesis_path, "0.tsv"))
+            _use_evaluation_cli([*arguments, "--output-filepath", partial_filepaths[-1][:-len(".partial.jsonl")],
+                                 "--shard", "2/3"])
+            with self.assertRaises(ValueError):
+                _use_merging_cli([*partial_filepaths, "--output-filepath", merged_filepath])
+
+    def test_sharded_quarantine_cli(self):
+        with TemporaryDirectory() as temporary_directory:
+            hypothesis_path, reference_path = self._create_corpus(temporary_directory, 5)
+            arguments: list[str] = [hypothesis_path, reference_path, "--loaders", "tsv", "xml",
+                                    "--stratum-count", str(self.stratum_count), "--pair-time-limit", "60"]
+            output_filepath: str = path.join(temporary_directory, "results")
+            partial_filepaths: list[str] = []
+            with patch("src.pyrallelism.pyrallelism._evaluate_directory_pair", _evaluate_perfect_pair):
+                with self.assertWarns(RuntimeWarning):
+                    _use_evaluation_cli([*arguments, "--output-filepath", output_filepath])
+                # The imperfect pairs (the second and fourth) fall into the second shard and the first, in turn.
+                for shard_index, quarantine_count in enumerate((1, 1, 0)):
+                    shard_filepath: str = path.join(temporary_directory, f"shard_{shard_index}")
+                    with catch_warnings(record=True) as shard_warnings:
+                        simplefilter("always")
+                        _use_evaluation_cli([*arguments, "--output-filepath", shard_filepath,
+                                             "--shard", f"{shard_index}/3"])
+                    self.assertEqual(len(shard_warnings), quarantine_count)
+                    partial_filepaths.append(f"{shard_filepath}.partial.jsonl")
+
+            merged_filepath: str = path.join(temporary_directory, "merged")
+            with self.assertWarns(RuntimeWarning) as warning_context:
+                _use_merging_cli([*partial_filepaths, "--output-filepath", merged_filepath])
+            self.assertEqual(len(warning_context.warnings), 2)
+            with open(f"{output_filepath}.csv", encoding="utf-8", mode="r") as output_file, \
+                    open(f"{merged_filepath}.csv", encoding="utf-8", mode="r") as merged_file:
+                self.assertEqual(output_file.read(), merged_file.read())
+
+    def test_checkpointed_cli(self):
+        with TemporaryDirectory() as temporary_directory:
+            hypothesis_path, reference_path = self._create_corpus(temporary_directory, 5)
+            output_filepath: str = path.join(temporary_directory, "results")
+            arguments: list[str] = [hypothesis_path, reference_path, "--loaders", "tsv", "xml",
+                                    "--stratum-count", str(self.stratum_count), "--output-filepath", output_filepath]
+            _use_evaluation_cli(arguments)
+            with open(f"{output_filepath}.csv", encoding="utf-8", mode="r") as output_file:
+                expected_results: str = output_file.read()
+
+            _use_evaluation_cli([*arguments, "--checkpoint"])
+            journal_filepath: str = f"{output_filepath}.journal.jsonl"
+            with open(journal_filepath, encoding="utf-8", mode="r") as journal_file:
+                journal_lines: list[str] = journal_file.readlines()
+            self.assertEqual(len(journal_lines), 6)
+
+            # An interruption leaves the header, two finished pairs, and part of a third.
+            with open(journal_filepath, encoding="utf-8", mode="w+") as journal_file:
+                journal_file.write("".join(journal_lines[:3]) + journal_lines[3][:len(journal_lines[3]) // 2])
+            with patch("src.pyrallelism.pyrallelism._evaluate_directory_pair", wraps=_evaluate_directory_pair) as \
+                    evaluation_function:
+                _use_evaluation_cli([*arguments, "--resume"])
+            self.assertEqual(evaluation_function.call_count, 3)
+            with open(f"{output_filepath}.csv", encoding="utf-8", mode="r") as output_file:
+                self.assertEqual(output_file.read(), expected_results)
+            with open(journal_filepath, encoding="utf-8", mode="r") as journal_file:
+                self.assertEqual(journal_file.readlines(), journal_lines)
+
+            # Imperfect pairs fail in their separate processes; they are journaled as quarantined and skipped,
+            # both when they are first evaluated and when they are replayed.
+            limited_arguments: list[str] = [*arguments, "--pair-time-limit", "60"]
+            for resume_flag in ("--checkpoint", "--resume"):
+                with self.subTest(flag=resume_flag):
+                    with patch("src.pyrallelism.pyrallelism._evaluate_directory_pair", _evaluate_perfect_pair):
+                        with self.assertWarns(RuntimeWarning) as warning_context:
+                            _use_evaluation_cli([*limited_arguments, resume_flag])
+                    self.assertEqual(len(warning_context.warnings), 2)
+                    with open(f"{output_filepath}.csv", encoding="utf-8", mode="r") as output_file:
+                        evaluated_filenames: list[str] = [line.split(",")[0] for line in output_file.readlines()[1:]]
+                    self.assertEqual(evaluated_filenames, ["0.tsv", "2.tsv", "4.tsv", "<micro>", "<macro>"])
+                    with open(journal_filepath, encoding="utf-8", mode="r") as journal_file:
+                        statuses: list[str] = [loads(line)["status"] for line in journal_file.readlines()[1:]]
+                    self.assertEqual(statuses, ["complete", "quarantined"] * 2 + ["complete"])
+
+    def test_anytime_cli(self):
+        with TemporaryDirectory() as temporary_directory:
+            hypothesis_path, reference_path = self._create_corpus(temporary_directory, 4)
+            output_filepath: str = path.join(temporary_directory, "results")
+            arguments: list[str] = [hypothesis_path, reference_path, "--anytime", "--loaders", "tsv", "xml",
+                                    "--stratum-count", str(self.stratum_count), "--output-filepath", output_filepath]
+            _use_evaluation_cli(arguments)
+            with open(f"{output_filepath}.estimates.jsonl", encoding="utf-8", mode="r") as estimate_file:
+                final_estimate: dict[str, object] = [loads(line) for line in estimate_file][-1]
+            self.assertEqual(final_estimate["pair_count"], 4)
+
+            for option_arguments in (["--alignment-filepath", output_filepath], ["--output-type", "jsonl"],
+                                     ["--pair-time-limit", "60"], ["--pair-memory-limit", "1024"], ["--checkpoint"]):
+                with self.subTest(option=option_arguments[0]):
+                    with self.assertRaises(ValueError):
+                        _use_evaluation_cli([*arguments, *option_arguments])
+
+    def _create_corpus(self, temporary_directory: str, pair_count: int) -> tuple[str, str]:
+        hypothesis_path: str = path.join(temporary_directory, "hypotheses")
+        reference_path: str = path.join(temporary_directory, "references")
+        for corpus_path in (hypothesis_path, reference_path):
+            makedirs(corpus_path)
+        for pair_index in range(0, pair_count):
+            copyfile(self.evaluation_answers[pair_index % 2][0], path.join(hypothesis_path, f"{pair_index}.tsv"))
+            copyfile(f"{self.base_directory}/{self.ground_truth_xml}", path.join(reference_path, f"{pair_index}.xml"))
+        return hypothesis_path, reference_path
+
+    @staticmethod
+    def _write_partial_results(partial_filepath: str, shard_index: int, shard_count: int, metadata: dict[str, str],
+                               pair_results: Sequence[tuple[dict[str, str], ReducedConfusionMatrix]],
+                               corpus_fingerprint: CorpusFingerprint) -> str:
+        shard_metadata: dict[str, object] = {"shard_index": shard_index, "shard_count": shard_count, **metadata}
+        with PartialResultWriter(partial_filepath, shard_metadata) as partial_writer:
+            for pair_index, (filenames, matrix) in enumerate(pair_results):
+                if is_in_shard(pair_index, shard_index, shard_count):
+                    partial_writer.write_result(pair_index, filenames, "", matrix)
+            partial_writer.write_summary(corpus_fingerprint)
+        return partial_filepath
+
+    def test_checkpoint_journal(self):
+        metadata: dict[str, str] = {"metric": DefinedMetric.MAXIMUM_BRANCH_AWARE_WORD_OVERLAP}
+        filenames: dict[str, str] = {"hypothesis_filename": "hypothesis.tsv", "reference_filename": "reference.xml"}
+        with TemporaryDirectory() as temporary_directory:
+            journal_filepath: str = path.join(temporary_directory, "results.journal.jsonl")
+            with CheckpointJournal(journal_filepath, metadata) as journal:
+                journal.write_record(create_pair_record(0, filenames, "abc", (29, 44, 82), {}))
+                journal.write_record(create_quarantine_record(1, filenames, "def", "The time limit was exceeded."))
+            with open(journal_filepath, encoding="utf-8", mode="a") as journal_file:
+                journal_file.write('{"record": "pair", "pair_index": 2, "stat')
+
+            with CheckpointJournal(journal_filepath, metadata, resume=True) as journal:
+                self.assertEqual(journal.get_record(0, filenames, "abc")["score"], 29)
+                self.assertEqual(journal.get_record(1, filenames, "def")["status"], "quarantined")
+                self.assertIsNone(journal.get_record(0, filenames, "def"))
+                self.assertIsNone(journal.get_record(2, filenames, "ghi"))
+                journal.write_record(create_pair_record(2, filenames, "ghi", (1, 4, 4), {}))
+
+            with CheckpointJournal(journal_filepath, metadata, resume=True) as journal:
+                self.assertEqual(sorted(journal.records), [0, 1, 2])
+            with self.assertRaises(ValueError):
+                CheckpointJournal(journal_filepath, {"metric": DefinedMetric.MAXIMUM_WORD_OVERLAP}, resume=True)
+
+        self.assertEqual(run_with_limits(sum, ([1, 2, 3],), time_limit=10), 6)
+        with self.assertRaises(PairQuarantinedError):
+            run_with_limits(sleep, (10,), time_limit=0.1)
+        with self.assertRaises(PairQuarantinedError):
+            run_with_limits(bytearray, (2 ** 34,), memory_limit=2 ** 12)
+
+    def test_relative_memory_limit(self):
+        held_memory: bytearray = bytearray(2 ** 28)
+        self.assertEqual(run_with_limits(sum, ([len(held_memory)],), memory_limit=2 ** 6), 2 ** 28)
+        self.assertEqual(len(run_with_limits(bytearray, (2 ** 24,), memory_limit=2 ** 6)), 2 ** 24)
+        with self.assertRaises(PairQuarantinedError) as quarantine_context:
+            run_with_limits(bytearray, (2 ** 28,), memory_limit=2 ** 6)
+        self.assertIn("memory limit", str(quarantine_context.exception))
+
+    def test_anytime_estimation(self):
+        random_generator: Random = Random(39)
+        hypothesis_directories: list[ParallelismDirectory] = [
+            TSVLoader.load_parallelism_directory(hypothesis_filepath, **self.loading_kwargs)
+            for hypothesis_filepath, _ in self.evaluation_answers
+        ]
+        pair_hypotheses: list[ParallelismDirectory] = \
+            [random_generator.choice(hypothesis_directories) for _ in range(0, 40)]
+        pair_loaders: list = [partial(tuple, (hypotheses, self.reference_directory)) for hypotheses in pair_hypotheses]
+        pair_sizes: list[float] = [random_generator.random() for _ in pair_hypotheses]
+
+        sampling_order, bin_indices = get_sampling_order(pair_sizes, bin_count=4, seed=39)
+        self.assertEqual(sorted(sampling_order), list(range(0, len(pair_sizes))))
+        self.assertEqual(sampling_order, get_sampling_order(pair_sizes, bin_count=4, seed=39)[0])
+        leading_bins: list[int] = sorted([bin_indices[pair_index] for pair_index in sampling_order[:8]])
+        self.assertEqual(leading_bins, [0, 0, 1, 1, 2, 2, 3, 3])
+
+        for defined_metric in DEFINED_METRICS:
+            with self.subTest(metric=defined_metric):
+                metric: EvaluationMetric = get_metric(defined_metric)
+                exact_matrix: ReducedConfusionMatrix = ReducedConfusionMatrix()
+                for hypotheses in pair_hypotheses:
+                    pair_matrix, _ = evaluate_bipartite_parallelism_metric(hypotheses, self.reference_directory, metric)
+                    exact_matrix += pair_matrix
+
+                estimates: list[SampledEstimate] = list(estimate_bipartite_parallelism_metric(
+                    pair_loaders, pair_sizes, metric, batch_size=8, bin_count=4, seed=39
+                ))
+                self.assertEqual([estimate.pair_count for estimate in estimates], [8, 16, 24, 32, 40])
+                self.assertTrue(estimates[-1].is_exact)
+                self.assertEqual(estimates[-1].estimates.tolist(), list(exact_matrix.get_statistics()))
+                self.assertEqual(estimates[-1].get_widths().tolist(), [0.0, 0.0, 0.0])
+                for estimate in estimates:
+                    self.assertTrue((estimate.lower_bounds <= estimate.estimates).all())
+                    self.assertTrue((estimate.estimates <= estimate.upper_bounds).all())
+
+                truncated_estimates: list[SampledEstimate] = list(estimate_bipartite_parallelism_metric(
+                    pair_loaders, pair_sizes, metric, target_width=1.0, batch_size=8, bin_count=4, seed=39
+                ))
+                self.assertEqual(len(truncated_estimates), 1)
@@ -1,8 +1,20 @@
+from bz2 import BZ2File
+from gzip import GzipFile
+from lzma import LZMAFile
+from os import path
+from shutil import copyfileobj
+from tempfile import TemporaryDirectory
 from typing import Sequence, Type
 from unittest import TestCase
+from zipfile import ZipFile, ZIP_STORED
+
+from numpy import array, full, int32
+from numpy.lib import format as npy_format
+from numpy.typing import NDArray
 
 from src.pyrallelism.primitives.loading import BaseParallelismLoader
-from src.pyrallelism.primitives.loading import TSVLoader, XMLLoader
+from src.pyrallelism.primitives.loading import ArrayLoader, CompressionFormat, detect_compression, NPZLoader, \
+    TSVLoader, XMLLoader
 from src.pyrallelism.primitives.typing import ParallelismDirectory, Parallelism
 
 
@@ -38,3 +50,133 @@ class LoadingTester(TestCase):
             self.assertEqual(len(loaded_directory), len(self.gold_parallelisms))
             for parallelism_id, parallelism in loaded_directory.items():
                 self.assertSetEqual(self.gold_parallelisms[int(parallelism_id) - 1], parallelism)
+
+    def test_multi_document_tsv(self):
+        with open(f"{self.filepath_base}/wikipedia_perfect_hyp.tsv", encoding="utf-8", mode="r") as input_file:
+            header_row, *table_rows = input_file.readlines()
+
+        with TemporaryDirectory() as temporary_directory:
+            blank_filepath: str = path.join(temporary_directory, "blank_separated.tsv")
+            with open(blank_filepath, encoding="utf-8", mode="w+") as output_file:
+                output_file.write(header_row + "".join(table_rows) + "\n\n" + "".join(table_rows) + "\n")
+
+            identified_filepath: str = path.join(temporary_directory, "identified.tsv")
+            with open(identified_filepath, encoding="utf-8", mode="w+") as output_file:
+                output_file.write(f"Document ID\t{header_row}")
+                for document_id in ("first", "second", "third"):
+                    output_file.write("".join([f"{document_id}\t{row}" for row in table_rows]))
+
+            for filepath, expected_names in (
+                (blank_filepath, ["blank_separated.tsv:1", "blank_separated.tsv:2"]),
+                (identified_filepath, ["first", "second", "third"])
+            ):
+                documents: list[tuple[str, ParallelismDirectory]] = \
+                    list(TSVLoader.stream_parallelism_directories(filepath, **self.loading_kwargs))
+                self.assertListEqual(expected_names, [document_name for document_name, _ in documents])
+                for _, loaded_directory in documents:
+                    self.assertEqual(len(loaded_directory), len(self.gold_parallelisms))
+                    for parallelism_id, parallelism in loaded_directory.items():
+                        self.assertSetEqual(self.gold_parallelisms[int(parallelism_id) - 1], parallelism)
+
+                with self.assertRaises(ValueError):
+                    TSVLoader.load_parallelism_directory(filepath, **self.loading_kwargs)
+
+    def test_npz_loader(self):
+        with TemporaryDirectory() as temporary_directory:
+            bundle_filepath: str = path.join(temporary_directory, "corpus.npz")
+            tsv_filepath: str = f"{self.filepath_base}/wikipedia_perfect_hyp.tsv"
+            NPZLoader.write_bundle(bundle_filepath, (tsv_filepath, tsv_filepath), TSVLoader, **self.loading_kwargs)
+            documents: list[tuple[str, ParallelismDirectory]] = \
+                list(NPZLoader.stream_parallelism_directories(bundle_filepath, **self.loading_kwargs))
+            self.assertEqual(2, len(documents))
+            with self.assertRaises(ValueError):
+                NPZLoader.load_parallelism_directory(bundle_filepath, **self.loading_kwargs)
+
+            for loader_class, loader_filepath in self.loaders:
+                NPZLoader.write_bundle(bundle_filepath, (loader_filepath,), loader_class, **self.loading_kwargs)
+                expected_directory: ParallelismDirectory = \
+                    loader_class.load_parallelism_directory(loader_filepath, **self.loading_kwargs)
+                loaded_directory: ParallelismDirectory = \
+                    NPZLoader.load_parallelism_directory(bundle_filepath, **self.loading_kwargs)
+                self.assertDictEqual(expected_directory, loaded_directory)
+
+            # Members written with format version 3.0 are read in full instead of memory-mapped.
+            version_filepath: str = path.join(temporary_directory, "corpus_v3.npz")
+            with ZipFile(bundle_filepath, mode="r") as input_archive, \
+                    ZipFile(version_filepath, mode="w", compression=ZIP_STORED) as output_archive:
+                for member_name in input_archive.namelist():
+                    with input_archive.open(member_name, mode="r") as member_file:
+                        member_array: NDArray = npy_format.read_array(member_file, allow_pickle=False)
+                    with output_archive.open(member_name, mode="w") as member_file:
+                        npy_format.write_array(member_file, member_array, version=(3, 0))
+            self.assertDictEqual(loaded_directory,
+                                 NPZLoader.load_parallelism_directory(version_filepath, **self.loading_kwargs))
+
+    def test_compressed_loaders(self):
+        compressors: Sequence[tuple[str, Type[GzipFile | BZ2File | LZMAFile]]] = (
+            (CompressionFormat.GZIP, GzipFile), (CompressionFormat.BZIP2, BZ2File), (CompressionFormat.XZ, LZMAFile)
+        )
+        with TemporaryDirectory() as temporary_directory:
+            bundle_filepath: str = path.join(temporary_directory, "corpus.npz")
+            NPZLoader.write_bundle(bundle_filepath, (self.loaders[0][1],), TSVLoader, **self.loading_kwargs)
+            loaders: list[tuple[Type[BaseParallelismLoader], str]] = [*self.loaders, (NPZLoader, bundle_filepath)]
+
+            for loader_class, loader_filepath in loaders:
+                expected_directory: ParallelismDirectory = \
+                    loader_class.load_parallelism_directory(loader_filepath, **self.loading_kwargs)
+                self.assertIsNone(detect_compression(loader_filepath))
+                for compression_format, compressor in compressors:
+                    with self.subTest(loader=loader_class.__name__, compression=compression_format):
+                        # The extension is omitted, as compression should be detected from the contents alone.
+                        compressed_filepath: str = path.join(temporary_directory, "compressed")
+                        with open(loader_filepath, mode="rb") as input_file, \
+                                compressor(compressed_filepath, mode="wb") as output_file:
+                            copyfileobj(input_file, output_file)
+                        self.assertEqual(detect_compression(compressed_filepath), compression_format)
+
+                        loaded_directory: ParallelismDirectory = \
+                            loader_class.load_parallelism_directory(compressed_filepath, **self.loading_kwargs)
+                        self.assertDictEqual(expected_directory, loaded_directory)
+
+            # Files whose contents are unrecognized (here, an empty file) are identified by their extension instead.
+            empty_filepath: str = path.join(temporary_directory, "empty.tsv.xz")
+            open(empty_filepath, mode="wb").close()
+            self.assertEqual(detect_compression(empty_filepath), CompressionFormat.XZ)
+
+    def test_array_loader(self):
+        document_labels: list[NDArray[int]] = []
+        expected_directories: list[ParallelismDirectory] = []
+        for loader_class, loader_filepath in self.loaders:
+            stratum_rows: list = loader_class._read_file(loader_filepath, **self.loading_kwargs)
+            document_labels.append(array(stratum_rows, dtype=int32).transpose((1, 0, 2)))
+            expected_directories.append(loader_class.load_parallelism_directory(loader_filepath, **self.loading_kwargs))
+
+        for labels, expected_directory in zip(document_labels, expected_directories):
+            self.assertDictEqual(expected_directory, ArrayLoader.load_parallelism_directory(labels))
+            self.assertDictEqual(expected_directory, ArrayLoader.load_parallelism_directory(memoryview(labels)))
+            self.assertDictEqual(
+                TSVLoader._build_directory(ArrayLoader._read_file(labels[:, :1])),
+                ArrayLoader.load_parallelism_directory(labels[:, 0])
+            )
+
+        # Padding is given nonsensical labels, which must be ignored past each document's length.
+        lengths: list[int] = [len(labels) for labels in document_labels]
+        padded_labels: NDArray[int] = full((len(document_labels), max(lengths) + 5, self.stratum_count, 2), 7)
+        for document_index, labels in enumerate(document_labels):
+            padded_labels[document_index, :len(labels)] = labels
+        self.assertEqual(expected_directories, ArrayLoader.load_parallelism_directories(padded_labels, lengths))
+        self.assertEqual(
+            [{}, {}], ArrayLoader.load_parallelism_directories(padded_labels[:, :0], [0, 0])
+        )
+
+        single_stratum_directories: list[ParallelismDirectory] = \
+            ArrayLoader.load_parallelism_directories(padded_labels, lengths, stratum_count=1)
+        for labels, single_stratum_directory in zip(document_labels, single_stratum_directories):
+            self.assertDictEqual(ArrayLoader.load_parallelism_directory(labels[:, 0]), single_stratum_directory)
+
+        with self.assertRaises(ValueError):
+            ArrayLoader.load_parallelism_directories(padded_labels, [lengths[0]])
+        with self.assertRaises(ValueError):
+            ArrayLoader.load_parallelism_directory(document_labels[0][..., :1])
+        with self.assertRaises(ValueError):
+            ArrayLoader.load_parallelism_directory(document_labels[0].astype(float))
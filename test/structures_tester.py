@@ -0,0 +1,142 @@
+from json import loads
+from os import path
+from random import Random
+from tempfile import TemporaryDirectory
+from typing import Any
+from unittest import TestCase
+
+from src.pyrallelism.structures import ConfusionMatrixBatch, ReducedConfusionMatrix
+from src.pyrallelism.utils.result_sink import CSVResultSink, JSONLinesResultSink, TextResultSink
+
+
+class StructuresTester(TestCase):
+    """
+    .. py:class:: StructuresTester
+    Class to test that *ConfusionMatrixBatch* agrees with the *ReducedConfusionMatrix* instances it holds.
+    """
+    def setUp(self):
+        random_generator: Random = Random(31)
+        self.matrices: list[ReducedConfusionMatrix] = []
+        for _ in range(0, 50):
+            matrix: ReducedConfusionMatrix = ReducedConfusionMatrix()
+            matrix.hypothesis_count = random_generator.randint(0, 10)
+            matrix.reference_count = random_generator.randint(0, 10)
+            matrix.score = random_generator.randint(0, min(matrix.hypothesis_count, matrix.reference_count))
+            self.matrices.append(matrix)
+
+        # This includes both of the zero-denominator cases: no hypotheses and no references.
+        self.matrices[0].score, self.matrices[0].hypothesis_count, self.matrices[0].reference_count = 0, 0, 0
+        self.matrices[1].score, self.matrices[1].hypothesis_count, self.matrices[1].reference_count = 0, 3, 0
+        self.betas: list[float] = [0.5, 1, 2]
+
+    def test_batch_statistics(self):
+        batch: ConfusionMatrixBatch = ConfusionMatrixBatch.from_matrices(self.matrices)
+        self.assertEqual(len(batch), len(self.matrices))
+
+        for beta_index, beta in enumerate(self.betas):
+            precisions, recalls, f_scores = batch.get_statistics(beta)
+            all_f_scores = batch.calculate_f_scores(self.betas)
+            for matrix_index, matrix in enumerate(self.matrices):
+                with self.subTest(beta=beta, matrix_index=matrix_index):
+                    expected_statistics = matrix.get_statistics(beta)
+                    self.assertAlmostEqual(precisions[matrix_index], expected_statistics[0])
+                    self.assertAlmostEqual(recalls[matrix_index], expected_statistics[1])
+                    self.assertAlmostEqual(f_scores[matrix_index], expected_statistics[2])
+                    self.assertAlmostEqual(all_f_scores[beta_index, matrix_index], expected_statistics[2])
+
+    def test_batch_aggregation(self):
+        batch: ConfusionMatrixBatch = ConfusionMatrixBatch.from_matrices(self.matrices)
+        total_matrix: ReducedConfusionMatrix = ReducedConfusionMatrix()
+        for matrix in self.matrices:
+            total_matrix += matrix
+
+        batch_total: ReducedConfusionMatrix = batch.sum()
+        self.assertEqual(
+            (batch_total.score, batch_total.hypothesis_count, batch_total.reference_count),
+            (total_matrix.score, total_matrix.hypothesis_count, total_matrix.reference_count)
+        )
+
+        micro_precision, micro_recall, micro_f_scores = batch.get_micro_statistics(self.betas)
+        macro_precision, macro_recall, macro_f_scores = batch.get_macro_statistics(self.betas)
+        for beta_index, beta in enumerate(self.betas):
+            with self.subTest(beta=beta):
+                self.assertAlmostEqual(micro_precision, total_matrix.calculate_precision())
+                self.assertAlmostEqual(micro_recall, total_matrix.calculate_recall())
+                self.assertAlmostEqual(micro_f_scores[beta_index], total_matrix.calculate_f_score(beta))
+                self.assertAlmostEqual(
+                    macro_f_scores[beta_index],
+                    sum([matrix.calculate_f_score(beta) for matrix in self.matrices]) / len(self.matrices)
+                )
+        self.assertAlmostEqual(
+            macro_precision, sum([matrix.calculate_precision() for matrix in self.matrices]) / len(self.matrices)
+        )
+        self.assertAlmostEqual(
+            macro_recall, sum([matrix.calculate_recall() for matrix in self.matrices]) / len(self.matrices)
+        )
+
+        doubled_batch: ConfusionMatrixBatch = batch + batch
+        self.assertEqual(doubled_batch[2].score, 2 * self.matrices[2].score)
+        self.assertEqual(len(ConfusionMatrixBatch.concatenate([batch, batch[:10]])), len(self.matrices) + 10)
+        self.assertEqual(ConfusionMatrixBatch().get_macro_statistics(), (0.0, 0.0, 0.0))
+
+        with self.assertRaises(ValueError):
+            ConfusionMatrixBatch([-1], [2], [2]).calculate_precisions()
+        with self.assertRaises(ValueError):
+            batch.calculate_f_scores(0)
+
+    def test_sink_aggregation(self):
+        batch: ConfusionMatrixBatch = ConfusionMatrixBatch.from_matrices(self.matrices)
+        with TemporaryDirectory() as temporary_directory:
+            output_filepath: str = path.join(temporary_directory, "results")
+            with JSONLinesResultSink(output_filepath, beta=2) as result_sink:
+                for matrix_index, matrix in enumerate(self.matrices):
+                    filenames: dict[str, str] = \
+                        {"hypothesis_filename": f"{matrix_index}.tsv", "reference_filename": f"{matrix_index}.xml"}
+                    result_sink.write_result(filenames, matrix)
+            with open(f"{output_filepath}.jsonl", encoding="utf-8", mode="r") as output_file:
+                *_, micro_row, macro_row = [loads(line) for line in output_file]
+
+        aggregate_rows: list[tuple[dict[str, Any], tuple[float, float, float]]] = [
+            (micro_row, batch.get_micro_statistics(2)), (macro_row, batch.get_macro_statistics(2))
+        ]
+        for aggregate_row, expected_statistics in aggregate_rows:
+            with self.subTest(aggregate=aggregate_row["aggregate"]):
+                for statistic_name, expected_statistic in zip(("precision", "recall", "f_score"), expected_statistics):
+                    self.assertAlmostEqual(aggregate_row[statistic_name], expected_statistic)
+
+        self.assertEqual(micro_row["score"], batch.sum().score)
+        for count_name in ("score", "hypothesis_count", "reference_count"):
+            self.assertIsNone(macro_row[count_name])
+
+    def test_formatted_sink_aggregation(self):
+        with TemporaryDirectory() as temporary_directory:
+            output_filepath: str = path.join(temporary_directory, "results")
+            with CSVResultSink(output_filepath, annotation_names=("score_upper_bound",)) as csv_sink, \
+                    TextResultSink(output_filepath, annotation_names=("score_upper_bound",)) as text_sink:
+                for matrix_index, matrix in enumerate(self.matrices):
+                    filenames: dict[str, str] = \
+                        {"hypothesis_filename": f"{matrix_index}.tsv", "reference_filename": f"{matrix_index}.xml"}
+                    for result_sink in (csv_sink, text_sink):
+                        result_sink.write_result(filenames, matrix, {"score_upper_bound": matrix.score})
+            with open(f"{output_filepath}.csv", encoding="utf-8", mode="r") as csv_file:
+                *_, micro_line, macro_line = csv_file.read().splitlines()
+            with open(f"{output_filepath}.txt", encoding="utf-8", mode="r") as text_file:
+                text_output: str = text_file.read()
+
+        micro_fields: list[str] = micro_line.split(",")
+        macro_fields: list[str] = macro_line.split(",")
+        self.assertEqual(micro_fields[:2], ["<micro>", "<micro>"])
+        self.assertEqual(macro_fields[:2], ["<macro>", "<macro>"])
+        total_score: int = sum(matrix.score for matrix in self.matrices)
+        self.assertEqual(micro_fields[2], str(total_score))
+        self.assertEqual(micro_fields[-1], str(total_score))
+        self.assertEqual(macro_fields[2:5], ["", "", ""])
+        self.assertEqual(macro_fields[-1], "")
+        self.assertTrue(all(field != "" for field in macro_fields[5:8]))
+
+        micro_block: str = text_output[text_output.index("Corpus Results (micro-averaged)"):]
+        macro_block: str = text_output[text_output.index("Corpus Results (macro-averaged)"):]
+        self.assertIn(f"({total_score} / ", micro_block)
+        self.assertIn(f"score_upper_bound: {total_score}", micro_block)
+        self.assertNotIn("/", macro_block)
+        self.assertNotIn("score_upper_bound", macro_block)